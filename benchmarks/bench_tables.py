@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""Table decoding: `decode_table` against the per-line namedtuple loop.
+
+Writes an IR spectrum and a population section of the requested size and
+times both decoders on the same bytes.
+
+Example:
+    $ python benchmarks/bench_tables.py --modes 3000 --atoms 1000 --steps 20
+"""
+
+import argparse
+import re
+import tempfile
+import timeit
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from wailord.io._outfile import (
+    OutBuffer,
+    SectionIndex,
+    decode_table,
+    table_bounds,
+)
+
+MARKERS = {"irSpectrum": r"IR SPECTRUM", "Mulliken": r"MULLIKEN ATOMIC CHARGES"}
+IR_COLUMNS = {
+    "Mode": np.int64,
+    "freq": np.float64,
+    "T2": np.float64,
+    "TX": np.float64,
+    "TY": np.float64,
+    "TZ": np.float64,
+}
+POP_COLUMNS = {"anum": str, "atype": str, "pcharge": np.float64}
+POP_END = re.compile(rb"^(?:[ \t\r]*$|[^\n]*Sum)", re.M)
+
+
+def write_output(path, modes, atoms, steps, seed=0):
+    rng = np.random.default_rng(seed)
+    out = ["IR SPECTRUM\n-----------\n\n"]
+    out.append(" Mode    freq (cm**-1)   T**2         TX         TY         TZ\n")
+    out.append("-" * 66 + "\n")
+    for mode, (freq, t2, tx, ty, tz) in enumerate(rng.random((modes, 5)) * 4000, 6):
+        out.append(
+            f"{mode:4d}:   {freq:10.2f}   {t2:9.6f}  "
+            f"({tx:10.6f} {ty:10.6f} {tz:10.6f})\n"
+        )
+    out.append("\n")
+    for _ in range(steps):
+        out.append("MULLIKEN ATOMIC CHARGES\n-----------------------\n")
+        for atom, charge in enumerate(rng.standard_normal(atoms)):
+            out.append(f"{atom:4d} C :   {charge:10.6f}\n")
+        out.append("Sum of atomic charges:   -0.0000000\n\n")
+    path.write_text("".join(out))
+    return path
+
+
+def ir_loop(buf, index):
+    """The per-line parse which `decode_table` replaced"""
+    vline = namedtuple("vline", "Mode freq T2 TX TY TZ")
+    accumulate = []
+    for _, flines in index.lines("irSpectrum", skip=4):
+        for line in flines:
+            if line == "\n":
+                break
+            raw = line.split()
+            raw = [i for i in raw if i != ":" if i != "(" if i != ")"]
+            accumulate.append(
+                vline(
+                    Mode=int(raw[0].replace(":", "")),
+                    freq=float(raw[1]),
+                    T2=float(raw[2]),
+                    TX=float(raw[3].replace("(", "")),
+                    TY=float(raw[4]),
+                    TZ=float(raw[5].replace(")", "")),
+                )
+            )
+    return pd.DataFrame(accumulate)
+
+
+def ir_decode(buf, index):
+    pos = index.offsets["irSpectrum"][0]
+    return pd.DataFrame(
+        decode_table(
+            buf.data, *table_bounds(buf, pos, skip=4), IR_COLUMNS, delete=b":()"
+        )
+    )
+
+
+def pop_loop(buf, index):
+    chargeline = namedtuple("chargeline", "anum atype pcharge")
+    accumulate = []
+    for _, flines in index.lines("Mulliken", skip=1):
+        line = next(flines)
+        for nextline in flines:
+            if "Sum" in line or "--" in nextline:
+                break
+            raw = line.split()
+            accumulate.append(
+                chargeline(anum=raw[0], atype=raw[1], pcharge=float(raw[-1]))
+            )
+            line = nextline
+    return pd.DataFrame(accumulate)
+
+
+def pop_decode(buf, index):
+    parts = [
+        decode_table(
+            buf.data,
+            *table_bounds(buf, pos, skip=1, stop=POP_END),
+            POP_COLUMNS,
+            delete=b":",
+        )
+        for pos in index.offsets["Mulliken"]
+    ]
+    return pd.DataFrame(
+        {name: np.concatenate([part[name] for part in parts]) for name in POP_COLUMNS}
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modes", type=int, default=3000)
+    parser.add_argument("--atoms", type=int, default=1000)
+    parser.add_argument("--steps", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        ofile = write_output(Path(tmp) / "orca.out", args.modes, args.atoms, args.steps)
+        with OutBuffer(ofile) as buf:
+            index = SectionIndex(buf, MARKERS)
+            for name, loop, decode in (
+                ("ir", ir_loop, ir_decode),
+                ("pop", pop_loop, pop_decode),
+            ):
+                pd.testing.assert_frame_equal(
+                    loop(buf, index), decode(buf, index), check_dtype=False
+                )
+                times = []
+                for func in (loop, decode):
+                    runs = timeit.repeat(
+                        lambda: func(buf, index), number=1, repeat=args.repeat
+                    )
+                    times.append(min(runs))
+                print(
+                    f"{name:4s} loop {times[0] * 1e3:9.2f} ms  "
+                    f"decode_table {times[1] * 1e3:9.2f} ms  "
+                    f"x{times[0] / times[1]:.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks of the output readers and experiment tables.
+
+The suites follow the asv layout (``setup``, ``time_*`` and ``peakmem_*``
+methods, ``params``), so they run under ``asv run`` as well as with the
+stand-alone ``python -m benchmarks.run``. All inputs are written by
+`wailord.testing`.
+
+Experiment sizes come from ``WAILORD_BENCH_RUNS`` (comma separated, defaults
+to ``1000,10000,100000``) and the table collectors run with
+``WAILORD_BENCH_WORKERS`` workers (serial when unset).
+"""
+
+import os
+from pathlib import Path
+
+from wailord.io import orca
+from wailord.io.backend import GRAMMARS, grammar_parser
+from wailord.io.discover import GENERATION_MANIFEST
+from wailord.testing import THEORIES, write_experiment, write_output
+
+RUNS = tuple(
+    int(runs)
+    for runs in os.environ.get("WAILORD_BENCH_RUNS", "1000,10000,100000").split(",")
+)
+WORKERS = os.environ.get("WAILORD_BENCH_WORKERS")
+WORKERS = int(WORKERS) if WORKERS else None
+
+#: Output shapes for the per-file suites
+SIZES = {
+    "small": dict(atoms=5, steps=5, scan_points=0, modes=9, populations=1),
+    "scan": dict(atoms=12, steps=4, scan_points=40, modes=30, populations=1),
+    "large": dict(atoms=200, steps=50, scan_points=0, modes=594, populations=10),
+}
+
+#: Extractors which need a relaxed surface scan
+SCAN_EXTRACTORS = (
+    "scan_grid",
+    "mult_energy_surface",
+    "single_energy_surface",
+    "surface_arrays",
+)
+
+#: Every `_OrcaRun` extractor, with its arguments
+EXTRACTORS = {
+    "final_sp_e": (),
+    "trajectory": (),
+    "scan_grid": (),
+    "mult_energy_surface": (),
+    "single_energy_surface": (),
+    "surface_arrays": (),
+    "vib_freq": (),
+    "ir_spec": (),
+    "vpt2_transitions": (),
+    "single_population_analysis": (),
+    "mult_population_analysis": (),
+    "population_arrays": (),
+}
+
+#: Every `orcaExp` table method, with its arguments
+TABLES = {
+    "get_final_sp_energy": (),
+    "final_energies": (),
+    "get_ir_spec": (),
+    "get_vib_freq": (),
+    "get_vpt2_transitions": (),
+    "get_energy_surface": (),
+    "get_population": (),
+    "get_population_arrays": (),
+}
+
+#: Long outputs for the grammar parsers: an optimisation with many geometries
+#: followed by its frequencies, and a relaxed scan with its MDCI surfaces
+GRAMMAR_SIZES = {
+    "opt": dict(atoms=100, steps=500, scan_points=0, modes=294, populations=10),
+    "mdci": dict(atoms=6, steps=5, scan_points=400, modes=0, populations=1),
+}
+
+#: Experiment trees: small outputs with a short scan, so every table has rows
+TREE = dict(atoms=6, steps=3, scan_points=5, modes=12, populations=1)
+
+
+def _job_path(root, name):
+    """An output in a job directory, so the run metadata can be read"""
+    jobdir = Path(root) / name / "synth" / "HF" / "spin_01" / "OPT" / "STO-3G"
+    return jobdir / "orca.out"
+
+
+def _trees(runs):
+    """Experiment roots by size, written below the working directory unless
+    they are already there"""
+    trees = {}
+    for num in runs:
+        root = Path.cwd() / "experiments" / str(num)
+        if not (root / GENERATION_MANIFEST).exists():
+            write_experiment(root, runs=num, **TREE)
+        trees[num] = str(root)
+    return trees
+
+
+class ParseOut:
+    """`_parse_out`, the row used by `genEBASet`"""
+
+    params = ((5, 50, 200), (1, 10, 100))
+    param_names = ("atoms", "steps")
+    timeout = 300
+
+    def setup(self, atoms, steps):
+        self.path = str(_job_path(Path.cwd() / "parse_out", f"{atoms}_{steps}"))
+        write_output(self.path, atoms=atoms, steps=steps, modes=0)
+
+    def time_parse_out(self, atoms, steps):
+        orca._parse_out(self.path)
+
+    def peakmem_parse_out(self, atoms, steps):
+        orca._parse_out(self.path)
+
+
+class Extractors:
+    """Every `_OrcaRun` extractor on a fresh run, so the read and the section
+    index are included"""
+
+    params = (tuple(SIZES), tuple(EXTRACTORS))
+    param_names = ("size", "extractor")
+    timeout = 300
+
+    def setup(self, size, extractor):
+        if extractor in SCAN_EXTRACTORS and not SIZES[size]["scan_points"]:
+            # asv skips parameter combinations whose setup raises this
+            raise NotImplementedError("No scan in this output")
+        self.path = _job_path(Path.cwd() / "extractors", size)
+        if not self.path.exists():
+            write_output(self.path, **SIZES[size])
+
+    def _extract(self, extractor):
+        run = orca._OrcaRun(self.path)
+        try:
+            return getattr(run, extractor)(*EXTRACTORS[extractor])
+        finally:
+            run.close()
+
+    def time_extractor(self, size, extractor):
+        self._extract(extractor)
+
+    def peakmem_extractor(self, size, extractor):
+        self._extract(extractor)
+
+
+class Experiment:
+    """Every `orcaExp` table collector over whole trees"""
+
+    params = (RUNS, tuple(TABLES))
+    param_names = ("runs", "table")
+    timeout = 3600
+    number = 1
+    repeat = 1
+
+    def setup_cache(self):
+        return _trees(RUNS)
+
+    def setup(self, trees, runs, table):
+        self.expt = orca.orcaExp(
+            Path(trees[runs]), order_theory=list(THEORIES), workers=WORKERS
+        )
+
+    def _collect(self, table):
+        # Start from scratch: nothing ingested, nothing memoised
+        self.expt.invalidate_cache()
+        return getattr(self.expt, table)(*TABLES[table])
+
+    def time_table(self, trees, runs, table):
+        self._collect(table)
+
+    def peakmem_table(self, trees, runs, table):
+        self._collect(table)
+
+
+class Discover:
+    """Listing the outputs of whole trees (building an `orcaExp`), walking
+    the tree or reading the generation manifest"""
+
+    params = (RUNS, ("walk", "manifest"))
+    param_names = ("runs", "listing")
+    timeout = 3600
+
+    def setup_cache(self):
+        return _trees(RUNS)
+
+    def time_discover(self, trees, runs, listing):
+        orca.orcaExp(
+            Path(trees[runs]),
+            order_theory=list(THEORIES),
+            manifest=None if listing == "manifest" else False,
+        )
+
+
+class GenEBASet:
+    """`genEBASet` over the smallest experiment tree"""
+
+    params = (RUNS[:1],)
+    param_names = ("runs",)
+    timeout = 3600
+    number = 1
+    repeat = 1
+
+    def setup_cache(self):
+        return _trees(RUNS[:1])
+
+    def time_genebaset(self, trees, runs):
+        orca.genEBASet(Path(trees[runs]), order_theory=list(THEORIES))
+
+    def peakmem_genebaset(self, trees, runs):
+        orca.genEBASet(Path(trees[runs]), order_theory=list(THEORIES))
+
+
+class GrammarScope:
+    """chemparseplot grammar parsers over whole outputs, against the section
+    slices `_OrcaRun` hands them"""
+
+    params = (tuple(GRAMMAR_SIZES), ("document", "sections"))
+    param_names = ("output", "scope")
+    timeout = 600
+
+    def setup(self, output, scope):
+        self.parsers = {section: grammar_parser(section) for section in GRAMMARS}
+        if self.parsers["final_energy"] is None:
+            raise NotImplementedError("No chemparseplot grammar")
+        self.path = _job_path(Path.cwd() / "grammar", output)
+        if not self.path.exists():
+            write_output(self.path, **GRAMMAR_SIZES[output])
+        self.etype = "MDCI" if GRAMMAR_SIZES[output]["scan_points"] else None
+        self.modes = GRAMMAR_SIZES[output]["modes"]
+
+    def _sections(self, scope, section, convert, extractor, *args):
+        """A grammar table of the whole output or, through `_OrcaRun`, of
+        its section slices; sections without an installed parser are skipped
+        """
+        parse = self.parsers[section]
+        if parse is None:
+            return
+        if scope == "document":
+            convert(parse, self.path, *args)
+            return
+        run = orca._OrcaRun(self.path, backends={section: "grammar"})
+        try:
+            getattr(run, extractor)(*args)
+        finally:
+            run.close()
+
+    def time_final_energy(self, output, scope):
+        if scope == "document":
+            self.parsers["final_energy"](self.path.read_text())
+        else:
+            orca.final_energy(self.path)
+
+    def peakmem_final_energy(self, output, scope):
+        self.time_final_energy(output, scope)
+
+    def time_surface(self, output, scope):
+        if self.etype is None or self.parsers["surface"] is None:
+            # An optimisation has no surfaces, nor a chemparseplot without
+            # the geomscan parser
+            return
+        if scope == "document":
+            self.parsers["surface"](self.path.read_text(), energy_type=self.etype)
+            return
+        run = orca._OrcaRun(self.path, backends={"surface": "grammar"})
+        try:
+            run.surface_arrays(self.etype)
+        finally:
+            run.close()
+
+    def time_vib(self, output, scope):
+        if self.modes:
+            self._sections(scope, "vib", orca._vib_via_chemparseplot, "vib_freq")
+
+    def time_ir(self, output, scope):
+        if self.modes:
+            self._sections(scope, "ir", orca._ir_via_chemparseplot, "ir_spec")
+
+    def time_vpt2(self, output, scope):
+        if self.modes:
+            self._sections(
+                scope, "vpt2", orca._vpt2_via_chemparseplot, "vpt2_transitions"
+            )
+
+    def time_populations(self, output, scope):
+        self._sections(
+            scope,
+            "pop",
+            orca._pop_via_chemparseplot,
+            "single_population_analysis",
+            "Mulliken",
+        )
+
+    def peakmem_populations(self, output, scope):
+        self.time_populations(output, scope)
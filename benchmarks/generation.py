@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks of input generation, `wailord.io.inp.inpGenerator.parse_yml`.
+
+Generation expands ``xyz * styles * spins * calculations * basis_sets`` job
+directories, each with an ``orca.inp`` and a copied job script, and rewrites
+``harness.sh`` after every geometry. Besides the wall time, every run counts
+its file system work through Python audit events (``open``, ``os.mkdir``,
+``shutil.copyfile``), so a change in the number of operations shows up even
+where the disk hides it in the timings.
+
+One axis of the matrix grows at a time from `BASE`, through the sizes in
+``WAILORD_BENCH_GEN_SIZES`` (comma separated, defaults to ``1,4,16,64``).
+
+Example:
+    $ python -m benchmarks.run --bench "Generation.*xyz"
+"""
+
+import functools
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from wailord.testing import run_generation, write_generation_config
+
+SIZES = tuple(
+    int(size)
+    for size in os.environ.get("WAILORD_BENCH_GEN_SIZES", "1,4,16,64").split(",")
+)
+
+#: The matrix every axis grows from
+BASE = dict(xyz=2, styles=2, spins=1, calculations=2, basis_sets=2)
+
+
+def _matrix(axis, size):
+    return {**BASE, axis: size}
+
+
+@functools.lru_cache(maxsize=None)
+def _report(conf, axis, size):
+    """One instrumented run per matrix, shared by the ``track_*`` methods"""
+    with tempfile.TemporaryDirectory() as workdir:
+        return run_generation(conf, workdir)
+
+
+class Generation:
+    """`inpGenerator.parse_yml` as one axis of the matrix grows"""
+
+    params = (tuple(BASE), SIZES)
+    param_names = ("axis", "size")
+    timeout = 600
+    number = 1
+
+    def setup(self, axis, size):
+        self.root = Path.cwd() / "generation" / f"{axis}_{size}"
+        self.conf = self.root / "config" / "orca.yml"
+        if not self.conf.exists():
+            write_generation_config(self.conf.parent, **_matrix(axis, size))
+        self.runs = self.root / "runs"
+        self.runs.mkdir(parents=True, exist_ok=True)
+
+    def teardown(self, axis, size):
+        shutil.rmtree(self.runs, ignore_errors=True)
+
+    def time_parse_yml(self, axis, size):
+        # A fresh tree every call, so nothing is overwritten in place
+        run_generation(self.conf, tempfile.mkdtemp(dir=self.runs))
+
+    def peakmem_parse_yml(self, axis, size):
+        run_generation(self.conf, tempfile.mkdtemp(dir=self.runs))
+
+    def track_files(self, axis, size):
+        return _report(self.conf, axis, size)["files"]
+
+    track_files.unit = "files"
+
+    def track_bytes(self, axis, size):
+        return _report(self.conf, axis, size)["bytes"]
+
+    track_bytes.unit = "bytes"
+
+    def track_writes(self, axis, size):
+        return _report(self.conf, axis, size)["writes"]
+
+    track_writes.unit = "opens"
+
+    def track_open(self, axis, size):
+        return _report(self.conf, axis, size)["open"]
+
+    track_open.unit = "opens"
+
+    def track_mkdir(self, axis, size):
+        return _report(self.conf, axis, size)["mkdir"]
+
+    track_mkdir.unit = "calls"
+
+    def track_copy(self, axis, size):
+        return _report(self.conf, axis, size)["copy"]
+
+    track_copy.unit = "calls"
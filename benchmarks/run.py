@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""Stand-alone runner for the asv style suites in `benchmarks.benchmarks` and
+`benchmarks.generation`.
+
+Times every ``time_*`` method (best of ``--repeat`` calls), reports the peak
+traced allocation of every ``peakmem_*`` method and the value of every
+``track_*`` method, without needing asv.
+Inputs are written to a temporary directory, or to ``--workdir`` so they can
+be reused.
+
+Example:
+    $ WAILORD_BENCH_RUNS=1000 python -m benchmarks.run --bench Extractors
+    $ python -m benchmarks.run --bench "Experiment.*get_ir" --json out.json
+"""
+
+import argparse
+import contextlib
+import gc
+import importlib
+import inspect
+import itertools
+import json
+import os
+import re
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+#: Modules holding suites, imported once the arguments are parsed
+MODULES = ("benchmarks.benchmarks", "benchmarks.generation")
+
+
+@contextlib.contextmanager
+def _chdir(path):
+    prev = Path.cwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(prev)
+
+
+def _timed(func, args, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _peak(func, args):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_suite(suite, pattern, repeat):
+    """Runs the matching benchmarks of one suite class
+
+    Args:
+        suite (type): asv style benchmark class
+        pattern (:obj:`re.Pattern`): Matched against ``Suite.method`` and the
+            parameters
+        repeat (int): Calls of every ``time_*`` method, the best is kept
+
+    Yields:
+        dict: One record per benchmark and parameter combination
+    """
+    methods = [
+        name
+        for name, _ in inspect.getmembers(suite, inspect.isfunction)
+        if name.startswith(("time_", "peakmem_", "track_"))
+    ]
+    params = getattr(suite, "params", [])
+    if params and not isinstance(params[0], (list, tuple)):
+        params = [params]
+    combos = list(itertools.product(*params))
+    selected = [
+        (name, combo)
+        for name in methods
+        for combo in combos
+        if pattern.search(f"{suite.__name__}.{name} {combo}")
+    ]
+    if not selected:
+        return
+    bench = suite()
+    cache = []
+    if hasattr(bench, "setup_cache"):
+        cache = [bench.setup_cache()]
+    for name, combo in selected:
+        args = cache + list(combo)
+        if hasattr(bench, "setup"):
+            try:
+                bench.setup(*args)
+            except NotImplementedError:
+                continue
+        func = getattr(bench, name)
+        record = {"benchmark": f"{suite.__name__}.{name}", "params": list(combo)}
+        if name.startswith("time_"):
+            record["seconds"] = _timed(
+                func, args, min(repeat, getattr(bench, "repeat", repeat))
+            )
+        elif name.startswith("track_"):
+            record["value"] = func(*args)
+            record["unit"] = getattr(func, "unit", "unit")
+        else:
+            record["peak_bytes"] = _peak(func, args)
+        if hasattr(bench, "teardown"):
+            bench.teardown(*args)
+        yield record
+
+
+def _format(record):
+    params = ", ".join(str(val) for val in record["params"])
+    if "seconds" in record:
+        value = f"{record['seconds'] * 1e3:12.2f} ms"
+    elif "value" in record:
+        value = f"{record['value']:12} {record['unit']}"
+    else:
+        value = f"{record['peak_bytes'] / 2**20:12.2f} MiB"
+    return f"{record['benchmark']:36s} {value}  [{params}]"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bench", default="", help="Regex of benchmarks to run")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workdir", type=Path, help="Keep the inputs here")
+    parser.add_argument("--json", type=Path, help="Write the records here")
+    args = parser.parse_args()
+    # Sizes are read from the environment when the suites are imported
+    suites = [
+        obj
+        for module in map(importlib.import_module, MODULES)
+        for _, obj in inspect.getmembers(module, inspect.isclass)
+        if obj.__module__ == module.__name__ and hasattr(obj, "params")
+    ]
+    pattern = re.compile(args.bench)
+    records = []
+    with contextlib.ExitStack() as stack:
+        workdir = args.workdir
+        if workdir is None:
+            workdir = Path(stack.enter_context(tempfile.TemporaryDirectory()))
+        workdir.mkdir(parents=True, exist_ok=True)
+        stack.enter_context(_chdir(workdir))
+        for suite in suites:
+            for record in run_suite(suite, pattern, args.repeat):
+                print(_format(record), flush=True)
+                records.append(record)
+    if args.json is not None:
+        args.json.write_text(json.dumps(records, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -267,6 +267,31 @@ def test_orca_nstep_pop(datadir):
     pass
 
 
+def test_population_arrays_match_frame(datadir):
+    for name in ("ch3f_3ang_b3lyp.out", "orca_uhf.out", "orca_qcisdt.out"):
+        spop = waio.orca._OrcaRun(ofile=datadir / name)
+        arrays = spop.population_arrays()
+        for poptype, pops in arrays.items():
+            read = waio.orca.read_populations(datadir / name, poptype)[poptype]
+            np.testing.assert_array_equal(read.charges, pops.charges)
+            frame = spop.single_population_analysis(poptype)
+            nsteps, natoms = pops.charges.shape
+            assert nsteps == frame.step.max()
+            assert list(pops.symbols) == list(frame.atype[:natoms])
+            np.testing.assert_array_equal(pops.charges.ravel(), frame.pcharge)
+            if "pspin" in frame:
+                np.testing.assert_array_equal(pops.spins.ravel(), frame.pspin)
+            else:
+                assert pops.spins is None
+
+
+def test_population_arrays_absent(datadir):
+    pops = waio.orca.read_populations(datadir / "b3lyp_6311g88_h2o.out", "Mulliken")
+    assert pops["Mulliken"].charges.shape == (0, 0)
+    with pytest.raises(NotImplementedError):
+        waio.orca.read_populations(datadir / "orca_uhf.out", ["Hirshfeld"])
+
+
 ################################
 # Multiple Population Analysis #
 ################################
@@ -280,6 +305,14 @@ def test_orca_mult_chargepop(datadir):
     pass
 
 
+def test_orca_mult_single_type(datadir):
+    spop = waio.orca._OrcaRun(ofile=datadir / "orca_uhf.out")
+    sdat = spop.mult_population_analysis("Loewdin")
+    assert sdat.shape == (2, 11)
+    assert list(sdat.population.unique()) == ["Loewdin"]
+    pd.testing.assert_frame_equal(sdat, spop.mult_population_analysis(["Loewdin"]))
+
+
 def test_orca_mult_fullpop(datadir):
     spop = waio.orca._OrcaRun(ofile=datadir / "orca_uhf.out")
     sdat = spop.mult_population_analysis()
@@ -357,3 +390,17 @@ def test_calc_htst(datadir):
     np.testing.assert_almost_equal(kf.m, 2.80583587e-07)
     np.testing.assert_almost_equal(kb.m, 3.31522447e-29)
     pass
+
+
+def test_calc_htst_units_light(datadir):
+    names = ("orcaProduct.out", "orcaReactant.out", "orcaTS.out")
+    heavy = [waio.orca._OrcaRun(ofile=datadir / name) for name in names]
+    light = [waio.orca._OrcaRun(ofile=datadir / name, units=False) for name in names]
+    assert isinstance(light[0].fin_sp_e, float)
+    assert light[0].final_sp_e()["unit"] == "hartree"
+    assert heavy[0].final_sp_e()["unit"] == waio.orca.ureg.hartree
+    assert light[2].vib_freq().attrs["units"] == {"freq": "reciprocal_centimeter"}
+    kf, kb = waio.orca.calc_htst(*heavy, temperature=298.15)
+    lkf, lkb = waio.orca.calc_htst(*light, temperature=298.15)
+    assert lkf.u == kf.u
+    np.testing.assert_allclose([lkf.m, lkb.m], [kf.m, kb.m], rtol=1e-12)
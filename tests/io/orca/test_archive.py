@@ -0,0 +1,127 @@
+import gzip
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+
+import wailord.io as waio
+from wailord.cli import main
+from wailord.io._outfile import last_line, open_output
+from wailord.io.archive import Archive, archive_member, pack_experiment
+from wailord.io.cache import ParseCache
+from wailord.io.discover import Discovery
+
+TEST_IO = Path(__file__).parent / "test_io"
+OTH = ["HF", "MP2", "B3LYP"]
+
+
+@pytest.fixture
+def ir_tree(tmp_path):
+    root = tmp_path / "ir_spec"
+    shutil.copytree(TEST_IO / "ir_spec", root)
+    return root
+
+
+def _relative(paths, root):
+    return [Path(path).relative_to(root) for path in paths]
+
+
+def test_experiment_from_archive(ir_tree):
+    arch = pack_experiment(ir_tree)
+    assert arch == ir_tree.with_name("ir_spec.wailord")
+    plain = waio.orca.orcaExp(ir_tree, order_theory=OTH)
+    packed = waio.orca.orcaExp(arch, order_theory=OTH)
+    assert packed.inpconf == plain.inpconf
+    assert _relative(packed.orclist, arch) == _relative(plain.orclist, ir_tree)
+    pd.testing.assert_frame_equal(
+        packed.get_final_sp_energy(), plain.get_final_sp_energy()
+    )
+    pd.testing.assert_frame_equal(packed.get_ir_spec(), plain.get_ir_spec())
+    pd.testing.assert_frame_equal(packed.final_energies(), plain.final_energies())
+    # The job index replaces the member listing
+    indexed = waio.orca.orcaExp(arch, order_theory=OTH, manifest=True)
+    assert indexed.orclist == packed.orclist
+
+
+def test_archive_parallel_and_cached(ir_tree, tmp_path):
+    arch = pack_experiment(ir_tree, tmp_path / "packed.wailord")
+    serial = waio.orca.orcaExp(arch, order_theory=OTH).get_vib_freq()
+    cache = ParseCache(tmp_path / "cache")
+    expt = waio.orca.orcaExp(arch, order_theory=OTH, workers=2, cache=cache)
+    pd.testing.assert_frame_equal(expt.get_vib_freq(), serial)
+    again = waio.orca.orcaExp(arch, order_theory=OTH, cache=cache)
+    pd.testing.assert_frame_equal(again.get_vib_freq(), serial)
+    assert cache.hits == len(expt.orclist)
+    assert again.refresh() == []
+
+
+def test_archive_index_and_extract(ir_tree, tmp_path):
+    arch = pack_experiment(ir_tree)
+    files = sorted(
+        path.relative_to(ir_tree).as_posix()
+        for path in ir_tree.rglob("*")
+        if path.is_file()
+    )
+    with Archive(arch) as store:
+        assert store.names() == files
+        assert "orca.yml" in store
+        jobs = store.jobs()
+        outputs = list(Discovery().iter_outputs(ir_tree))
+        assert list(jobs.output) == [
+            path.relative_to(ir_tree).as_posix() for path in outputs
+        ]
+        assert list(jobs.theory) == [
+            waio.orca.getRunInfo(path.parent)["theory"] for path in outputs
+        ]
+        written = store.extract(tmp_path / "out")
+    assert len(written) == len(files)
+    for name in files:
+        src, dst = ir_tree / name, tmp_path / "out" / name
+        assert dst.read_bytes() == src.read_bytes()
+        assert os.stat(dst).st_mtime_ns == os.stat(src).st_mtime_ns
+
+
+def test_member_readers(tmp_path):
+    src = next(Discovery().iter_outputs(TEST_IO / "h2"))
+    root = tmp_path / "h2"
+    shutil.copytree(TEST_IO / "h2", root)
+    rel = src.relative_to(TEST_IO / "h2")
+    with open(src, "rb") as fh, gzip.open(root / f"{rel}.gz", "wb") as out:
+        shutil.copyfileobj(fh, out)
+    arch = pack_experiment(root)
+    member, packed = arch / rel, arch / f"{rel}.gz"
+    assert archive_member(member) == (arch, rel.as_posix())
+    assert archive_member(src) is None
+    marker = waio.orca.SECTION_MARKERS["final_single_point_e"]
+    assert last_line(member, marker, blocksize=97) == last_line(src, marker)
+    for path in (member, packed):
+        want = waio.orca.read_trajectory(src)
+        got = waio.orca.read_trajectory(path)
+        np.testing.assert_array_equal(got.coords.magnitude, want.coords.magnitude)
+        assert waio.orca.final_energy(path) == waio.orca.final_energy(src)
+        assert waio.orca.output_state(path).terminated
+    with open_output(packed) as fh:
+        assert fh.read(64) == src.read_bytes()[:64]
+        assert fh.read() == src.read_bytes()[64:]
+    with pytest.raises(FileNotFoundError):
+        open_output(arch / "missing.out")
+    with pytest.raises(ValueError):
+        open_output(member, "wb")
+    with pytest.raises(ValueError):
+        waio.compress.compress_experiment(arch)
+
+
+def test_archive_cli(ir_tree, tmp_path):
+    target = tmp_path / "exp.wailord"
+    result = CliRunner().invoke(
+        main, ["archive", str(ir_tree), "--output", str(target)]
+    )
+    assert result.exit_code == 0, result.output
+    assert "jobs into" in result.output
+    assert len(waio.orca.orcaExp(target).orclist) == len(
+        list(Discovery().iter_outputs(ir_tree))
+    )
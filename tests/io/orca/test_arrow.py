@@ -0,0 +1,36 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import wailord.io as waio
+
+pytest.importorskip("pyarrow")
+
+TEST_IO = Path(__file__).parent / "test_io"
+OTH = ["HF", "MP2", "B3LYP"]
+
+
+def test_arrow_round_trip_keeps_units_and_order():
+    expt = waio.orca.orcaExp(TEST_IO / "ir_spec", order_theory=OTH)
+    ir = expt.get_ir_spec()
+    table = expt.to_arrow("ir")
+    assert table.schema.field("freq").metadata[b"unit"] == b"reciprocal_centimeter"
+    assert table.schema.field("theory").type.ordered
+    pd.testing.assert_frame_equal(waio.arrow.from_arrow(table), ir)
+
+
+def test_parquet_partitions(tmp_path):
+    expt = waio.orca.orcaExp(TEST_IO / "vpt2_h2o", order_theory=OTH)
+    paths = expt.to_parquet(tmp_path, tables=["energy", "vpt2"])
+    assert sorted(p.name for p in paths["energy"].iterdir()) == [
+        f"theory={name}" for name in sorted(OTH)
+    ]
+    energy = waio.arrow.read_parquet(paths["energy"])
+    expected = expt.get_final_sp_energy()
+    restored = energy.sort_values(["theory", "basis", "final_sp_energy"])
+    pd.testing.assert_frame_equal(restored.reset_index(drop=True), expected)
+    mp2 = waio.arrow.read_parquet(paths["vpt2"], filters=[("theory", "=", "MP2")])
+    assert list(mp2.theory.unique()) == ["MP2"]
+    assert list(mp2.theory.cat.categories) == OTH
+    assert str(mp2.vpt2_freq.pint.units) == "reciprocal_centimeter"
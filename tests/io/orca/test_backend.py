@@ -0,0 +1,168 @@
+from collections import namedtuple
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import wailord.io as waio
+from wailord.io.backend import (
+    BackendPolicy,
+    BackendTrial,
+    grammar_parser,
+    parse_modes,
+)
+from wailord.testing import write_output
+
+TEST_IO = Path(__file__).parent / "test_io"
+OTH = ["HF", "MP2", "B3LYP"]
+
+
+def test_parse_modes():
+    assert set(parse_modes("regex").values()) == {"regex"}
+    modes = parse_modes("vib=regex, ir=grammar")
+    assert (modes["vib"], modes["ir"], modes["pop"]) == ("regex", "grammar", "grammar")
+    with pytest.raises(ValueError):
+        parse_modes("vib=fast")
+    with pytest.raises(ValueError):
+        parse_modes({"nmr": "regex"})
+
+
+def test_policy_decides_after_samples(monkeypatch):
+    monkeypatch.setattr(waio.backend, "grammar_parser", lambda section: print)
+    policy = BackendPolicy("auto", samples=2)
+    assert policy.undecided("ir_spec") == "ir"
+    policy.record(BackendTrial("ir", "a", 0.1, 0.2, True))
+    assert policy.resolve("ir") == "auto"
+    policy.record(BackendTrial("ir", "b", 0.1, 0.2, True))
+    assert policy.resolve("ir") == "grammar"
+    assert policy.undecided("ir_spec") is None
+    # A single disagreement keeps the regex decoders, however fast
+    policy.record(BackendTrial("vib", "a", 0.1, 0.2, True))
+    policy.record(BackendTrial("vib", "b", 0.1, 0.2, False))
+    assert policy.resolve("vib") == "regex"
+    assert policy.undecided("trajectory") is None
+
+
+def test_policy_roundtrip(tmp_path):
+    policy = BackendPolicy("pop=regex", samples=1)
+    policy.record(BackendTrial("final_energy", "a", 0.3, 0.1, True))
+    policy.to_json(tmp_path / "backend.json")
+    loaded = BackendPolicy.load(tmp_path / "backend.json")
+    assert loaded.modes == policy.modes
+    assert loaded.choices == {"final_energy": "regex"}
+    pd.testing.assert_frame_equal(loaded.report(), policy.report())
+
+
+@pytest.mark.skipif(
+    grammar_parser("final_energy") is None, reason="needs the chemparseplot grammar"
+)
+def test_experiment_chooses_once():
+    policy = BackendPolicy("auto", samples=2)
+    expt = waio.orca.orcaExp(TEST_IO / "ir_spec", order_theory=OTH, backend=policy)
+    want = expt.get_final_sp_energy()
+    trials = policy.report()
+    assert len(trials) == 2
+    assert trials.agree.all()
+    assert policy.resolve("final_energy") in ("grammar", "regex")
+    # Decided: another experiment sharing the policy compares nothing
+    again = waio.orca.orcaExp(TEST_IO / "ir_spec", order_theory=OTH, backend=policy)
+    pd.testing.assert_frame_equal(again.get_final_sp_energy(), want)
+    assert len(policy.trials) == 2
+
+
+def test_regex_backend_matches_default():
+    regex = waio.orca.orcaExp(TEST_IO / "h2", backend="regex")
+    assert set(regex.backend.resolved().values()) == {"regex"}
+    default = waio.orca.orcaExp(TEST_IO / "h2", backend="grammar")
+    pd.testing.assert_frame_equal(
+        regex.get_final_sp_energy(), default.get_final_sp_energy()
+    )
+    surface = regex.get_energy_surface()
+    assert not surface.empty
+    assert regex.backend.trials == []
+
+
+def test_policy_per_experiment(monkeypatch):
+    monkeypatch.delenv(waio.backend.ENV, raising=False)
+    first = waio.orca.orcaExp(TEST_IO / "h2")
+    second = waio.orca.orcaExp(TEST_IO / "h2")
+    assert first.backend is not second.backend
+    assert set(first.backend.modes.values()) == {"grammar"}
+    first.backend.choices["final_energy"] = "regex"
+    assert second.backend.choices == {}
+    monkeypatch.setenv(waio.backend.ENV, "auto")
+    assert set(waio.orca.orcaExp(TEST_IO / "h2").backend.modes.values()) == {"auto"}
+
+
+def test_same_result_needs_same_columns():
+    frame = pd.DataFrame({"freq": [1.0, 2.0], "mode": [0, 1]})
+    assert waio.orca._same_result(frame, frame.copy())
+    assert not waio.orca._same_result(frame, frame[["freq"]])
+    assert not waio.orca._same_result(frame, frame.astype({"mode": float}))
+    assert not waio.orca._same_result(frame, frame.assign(extra="x"))
+
+
+def _population_parser(frame):
+    """Stand-in chemparseplot parser answering with the rows of *frame*"""
+    Row = namedtuple("Row", "atom_index symbol charge spin")
+
+    def parse(path, kind):
+        return [
+            Row(int(row.anum), row.atype, row.pcharge, None)
+            for row in frame.itertuples()
+        ]
+
+    return parse
+
+
+def test_missing_grammar_is_not_tried(monkeypatch):
+    monkeypatch.setattr(waio.orca, "grammar_parser", lambda section: None)
+
+    def fail(*args):
+        raise AssertionError("grammar tried")
+
+    monkeypatch.setattr(waio.orca, "_vib_via_chemparseplot", fail)
+    run = waio.orca._OrcaRun(next(TEST_IO.glob("ir_spec/**/orca.out")))
+    assert not run._use_grammar("vib")
+    _, record = run.call("vib_freq")
+    assert record.backend == "regex"
+
+
+def test_grammar_population_matches_regex(monkeypatch):
+    ofile = next(TEST_IO.glob("singlet/**/OPT/*/orca.out"))
+    regex = waio.orca._OrcaRun(ofile, backends={"pop": "regex"})
+    want = regex.single_population_analysis()
+    assert want.step.max() > 1
+    parse = _population_parser(want)
+    monkeypatch.setattr(waio.orca, "grammar_parser", lambda section: parse)
+    run = waio.orca._OrcaRun(ofile, backends={"pop": "grammar"})
+    got, record = run.call("single_population_analysis", "Mulliken")
+    assert record.backend == "grammar"
+    assert waio.orca._same_result(got, want)
+
+
+@pytest.mark.parametrize(
+    ("extractor", "args", "header"),
+    [
+        ("vib_freq", (), "VIBRATIONAL FREQUENCIES"),
+        ("ir_spec", (), "IR SPECTRUM"),
+        ("vpt2_transitions", (), "Fundamental transition"),
+        ("single_population_analysis", ("Loewdin",), "LOEWDIN ATOMIC CHARGES"),
+    ],
+)
+def test_grammar_sees_sections(monkeypatch, tmp_path, extractor, args, header):
+    ofile = write_output(tmp_path / "orca.out", atoms=8, steps=20, modes=18)
+    seen = []
+
+    def parse(path, **kwargs):
+        seen.append(Path(path).read_text())
+        return []
+
+    monkeypatch.setattr(waio.orca, "grammar_parser", lambda section: parse)
+    backends = dict.fromkeys(waio.backend.GRAMMARS, "grammar")
+    run = waio.orca._OrcaRun(ofile, backends=backends, runinfo={"theory": "HF"})
+    run.call(extractor, *args)
+    (text,) = seen
+    assert text.lstrip().startswith(header)
+    assert len(text) < ofile.stat().st_size / 4
+    assert "CARTESIAN COORDINATES" not in text
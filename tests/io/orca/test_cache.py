@@ -0,0 +1,90 @@
+import os
+import shutil
+from pathlib import Path
+
+import pandas as pd
+
+import wailord.io as waio
+from wailord.io.cache import ParseCache
+
+TEST_IO = Path(__file__).parent / "test_io"
+SP_DIR = Path(__file__).parent / "singles" / "test_sp"
+
+
+def test_warm_tables_match_cold(tmp_path):
+    oth = ["HF", "MP2", "B3LYP"]
+    cache = ParseCache(tmp_path)
+    cold = waio.orca.orcaExp(TEST_IO / "ir_spec", order_theory=oth, cache=cache)
+    vcold = cold.get_ir_spec()
+    assert cache.misses == len(cold.orclist) and cache.hits == 0
+    warm = waio.orca.orcaExp(TEST_IO / "ir_spec", order_theory=oth, cache=cache)
+    vwarm = warm.get_ir_spec()
+    assert cache.hits == len(warm.orclist)
+    pd.testing.assert_frame_equal(vcold, vwarm)
+
+
+def test_warm_collect_reads_no_outputs(tmp_path, monkeypatch):
+    oth = ["HF", "MP2", "B3LYP"]
+    cache = ParseCache(tmp_path)
+    cold = waio.orca.orcaExp(TEST_IO / "ir_spec", order_theory=oth, cache=cache)
+    want = cold.get_vib_freq()
+
+    def no_reads(*args, **kwargs):
+        raise AssertionError("read an output")
+
+    monkeypatch.setattr(waio.orca, "output_state", no_reads)
+    monkeypatch.setattr(waio.orca, "_terminated", no_reads)
+    monkeypatch.setattr(waio.orca, "_OrcaRun", no_reads)
+    warm = waio.orca.orcaExp(TEST_IO / "ir_spec", order_theory=oth, cache=cache)
+    pd.testing.assert_frame_equal(warm.get_vib_freq(), want)
+    assert {runf: state[:2] for runf, state in warm.ingested.items()} == {
+        runf: state[:2] for runf, state in cold.ingested.items()
+    }
+    # Termination is only read from parsed outputs
+    assert {state.terminated for state in warm.ingested.values()} == {None}
+    assert warm.refresh() == []
+
+
+def test_final_energy_rows_round_trip(tmp_path):
+    expt = waio.orca.orcaExp(TEST_IO / "h2", cache=tmp_path / "c.sqlite")
+    cold = expt.get_final_sp_energy()
+    warm = expt.get_final_sp_energy()
+    pd.testing.assert_frame_equal(cold, warm)
+    assert expt.invalidate_cache() == len(expt.orclist)
+    assert len(expt.cache) == 0
+
+
+def test_stale_entries_are_reparsed(tmp_path):
+    ofile = tmp_path / "b3lyp_6311g88_h2o.out"
+    shutil.copy(SP_DIR / ofile.name, ofile)
+    with ParseCache(tmp_path) as cache:
+        run = lambda: waio.orca._OrcaRun(ofile).ir_spec()
+        cache.fetch(ofile, "ir_spec", (), run)
+        stat = ofile.stat()
+        os.utime(ofile, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert cache.get(ofile, "ir_spec") is None
+        cache.fetch(ofile, "ir_spec", (), run)
+        assert cache.get(ofile, "ir_spec") is not None
+
+
+def test_eviction_bounds_size(tmp_path):
+    with ParseCache(tmp_path, max_bytes=0) as cache:
+        ofile = SP_DIR / "orcaVPT2.out"
+        run = waio.orca._OrcaRun(ofile)
+        cache.fetch(ofile, "vpt2_transitions", (), run.vpt2_transitions)
+        assert len(cache) == 0
+
+
+def test_backend_policy_is_part_of_the_key(tmp_path, monkeypatch):
+    # Every section has a grammar parser, so the policy alone decides
+    monkeypatch.setattr(waio.backend, "grammar_parser", lambda section: print)
+    cache = ParseCache(tmp_path)
+    grammar = waio.orca.orcaExp(TEST_IO / "h2", cache=cache, backend="grammar")
+    want = grammar.get_final_sp_energy()
+    nout = len(grammar.orclist)
+    regex = waio.orca.orcaExp(TEST_IO / "h2", cache=cache, backend="regex")
+    pd.testing.assert_frame_equal(regex.get_final_sp_energy(), want)
+    assert (cache.hits, cache.misses) == (0, 2 * nout)
+    again = waio.orca.orcaExp(TEST_IO / "h2", cache=cache, backend="regex")
+    again.get_final_sp_energy()
+    assert cache.hits == nout
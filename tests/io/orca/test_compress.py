@@ -0,0 +1,110 @@
+import gzip
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+
+import wailord.io as waio
+from wailord.cli import main
+from wailord.io._outfile import open_output
+from wailord.io.archive import pack_experiment
+from wailord.io.compress import compress_experiment, compress_output
+from wailord.io.discover import Discovery
+
+TEST_IO = Path(__file__).parent / "test_io"
+OTH = ["HF", "MP2", "B3LYP"]
+
+
+@pytest.fixture
+def ir_tree(tmp_path):
+    root = tmp_path / "ir_spec"
+    shutil.copytree(TEST_IO / "ir_spec", root)
+    return root
+
+
+@pytest.mark.parametrize("fmt", ["gz", "xz"])
+def test_compressed_experiment_tables(ir_tree, fmt):
+    plain = waio.orca.orcaExp(ir_tree, order_theory=OTH)
+    energy, spec = plain.get_final_sp_energy(), plain.get_ir_spec()
+    results = compress_experiment(ir_tree, fmt=fmt)
+    status = {res.status for res in results}
+    assert status <= {"compressed", "skipped"}
+    done = [res for res in results if res.status == "compressed"]
+    assert done and all(res.packed < res.size for res in done)
+    # The CO2 jobs did not terminate normally, so they stay plain
+    skipped = [res for res in results if res.status == "skipped"]
+    assert all("C1O2" in str(res.path) for res in skipped)
+    packed = waio.orca.orcaExp(ir_tree, order_theory=OTH)
+    assert len(packed.orclist) == len(plain.orclist)
+    assert sum(path.name.endswith(f".{fmt}") for path in packed.orclist) == len(done)
+    pd.testing.assert_frame_equal(
+        packed.get_final_sp_energy().drop(columns="unit"),
+        energy.drop(columns="unit"),
+    )
+    pd.testing.assert_frame_equal(packed.get_ir_spec(), spec)
+
+
+def test_compressed_readers(tmp_path):
+    src = next(Discovery().iter_outputs(TEST_IO / "h2"))
+    jobdir = tmp_path / src.relative_to(TEST_IO).parent
+    jobdir.mkdir(parents=True)
+    ofile = jobdir / "orca.out.gz"
+    with open(src, "rb") as fh, gzip.open(ofile, "wb") as out:
+        shutil.copyfileobj(fh, out)
+    want = waio.orca.read_trajectory(src)
+    got = waio.orca.read_trajectory(ofile)
+    np.testing.assert_array_equal(got.coords.magnitude, want.coords.magnitude)
+    assert waio.orca.final_energy(ofile) == waio.orca.final_energy(src)
+    assert waio.orca.output_state(ofile).terminated
+    parsed = waio.orca._parse_out(ofile)
+    assert parsed.final_energy == waio.orca._parse_out(src).final_energy
+
+
+def test_zstd_outputs(tmp_path):
+    pytest.importorskip("zstandard")
+    src = next(Discovery().iter_outputs(TEST_IO / "h2"))
+    root = tmp_path / "h2"
+    shutil.copytree(TEST_IO / "h2", root)
+    res = compress_output(root / src.relative_to(TEST_IO / "h2"), fmt="zst")
+    assert res.status == "compressed" and res.target.suffix == ".zst"
+    arch = pack_experiment(root)
+    for path in (res.target, arch / res.target.relative_to(root)):
+        with open_output(path) as fh:
+            assert fh.read() == src.read_bytes()
+        assert waio.orca.final_energy(path) == waio.orca.final_energy(src)
+        assert waio.orca.output_state(path).terminated
+
+
+def test_discovery_prefers_plain(tmp_path):
+    (tmp_path / "orca.out").write_text("ORCA\n")
+    (tmp_path / "orca.out.gz").write_bytes(gzip.compress(b"ORCA\n"))
+    (tmp_path / "orca.out.part.gz").write_bytes(b"")
+    assert [path.name for path in Discovery().iter_outputs(tmp_path)] == ["orca.out"]
+    (tmp_path / "orca.out").unlink()
+    assert [path.name for path in Discovery().iter_outputs(tmp_path)] == [
+        "orca.out.gz"
+    ]
+
+
+def test_compress_keeps_unfinished(tmp_path):
+    ofile = tmp_path / "orca.out"
+    ofile.write_text("FINAL SINGLE POINT ENERGY      -1.0\n")
+    res = compress_output(ofile)
+    assert (res.status, res.reason) == ("skipped", "not terminated")
+    assert ofile.exists()
+    res = compress_output(ofile, fmt="bz2", force=True)
+    assert res.status == "compressed"
+    assert not ofile.exists() and res.target.name == "orca.out.bz2"
+    assert waio.orca.final_energy(res.target) == -1.0
+    with pytest.raises(ValueError):
+        compress_output(res.target, fmt="rar")
+
+
+def test_compress_cli(ir_tree):
+    result = CliRunner().invoke(main, ["compress", str(ir_tree), "--format", "xz"])
+    assert result.exit_code == 0, result.output
+    assert "not terminated" in result.output
+    assert list(ir_tree.rglob("*.out.xz"))
@@ -0,0 +1,197 @@
+import gzip
+import hashlib
+import os
+import re
+import shutil
+from pathlib import Path
+
+import pytest
+import yaml
+
+import wailord.io as waio
+from wailord.io.discover import (
+    Discovery,
+    read_job_records,
+    read_manifest,
+    write_manifest,
+)
+from wailord.testing import (
+    run_generation,
+    write_generation_config,
+    write_output,
+)
+
+TEST_IO = Path(__file__).parent / "test_io"
+
+
+def _legacy_walk(root):
+    found = []
+    for dirpath, _, files in os.walk(root.resolve()):
+        for filename in files:
+            if "out" in filename and "slurm" not in filename:
+                found.append(Path(dirpath) / filename)
+    return sorted(found)
+
+
+def test_matches_legacy_walk():
+    root = TEST_IO / "multxyz_pop"
+    assert sorted(Discovery().iter_outputs(root)) == _legacy_walk(root)
+
+
+def test_patterns_and_pruning(tmp_path):
+    root = tmp_path / "h2"
+    shutil.copytree(TEST_IO / "h2", root)
+    outputs = list(Discovery().iter_outputs(root))
+    (outputs[0].parent / "orca.out.bak").write_text("stale")
+    (root / ".snapshot").mkdir()
+    (root / ".snapshot" / "orca.out").write_text("old")
+    assert list(Discovery().iter_outputs(root)) == outputs
+    only_mp2 = Discovery(include=[re.compile(r"MP2/.*\.out$")])
+    assert all("MP2" in str(ofile) for ofile in only_mp2.iter_outputs(root))
+    assert list(Discovery(maxdepth=0).iter_outputs(root)) == []
+
+
+def test_manifest_skips_walk(tmp_path):
+    root = tmp_path / "h2"
+    shutil.copytree(TEST_IO / "h2", root)
+    expt = waio.orca.orcaExp(root)
+    write_manifest(root, expt.orclist[:2])
+    assert len(read_manifest(root)) == 2
+    listed = waio.orca.orcaExp(root, manifest=True)
+    assert listed.orclist == expt.orclist[:2]
+
+
+@pytest.mark.parametrize("use_inotify", [False, True])
+def test_refresh_and_watch(tmp_path, use_inotify):
+    root = tmp_path / "h2"
+    shutil.copytree(TEST_IO / "h2", root)
+    late = sorted(root.rglob("orca.out"))[-1]
+    held = late.read_bytes()
+    late.unlink()
+    expt = waio.orca.orcaExp(root)
+    before = expt.get_final_sp_energy()
+    assert expt.refresh() == []
+    assert all(state.terminated for state in expt.ingested.values())
+    late.write_bytes(held)
+    assert expt.refresh() == [late.resolve()]
+    assert len(expt.get_final_sp_energy()) == len(before) + 1
+    watcher = expt.watch(interval=0.2, use_inotify=use_inotify)
+    with late.open("ab") as fh:
+        fh.write(b"\n")
+    assert next(watcher) == [late.resolve()]
+    watcher.close()
+
+
+def test_refresh_reparses_unterminated(tmp_path):
+    root = tmp_path / "h2"
+    shutil.copytree(TEST_IO / "h2", root)
+    late = sorted(root.rglob("orca.out"))[-1]
+    done = late.read_bytes()
+    banner = b"ORCA TERMINATED NORMALLY"
+    # Still running: same size and time as the finished output, no banner
+    late.write_bytes(done.replace(banner, b" " * len(banner)))
+    stat = late.stat()
+    os.utime(late, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    expt = waio.orca.orcaExp(root)
+    expt.get_final_sp_energy()
+    assert expt.ingested[late.resolve()].terminated is False
+    late.write_bytes(done)
+    os.utime(late, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert expt.refresh() == [late.resolve()]
+    assert expt.ingested[late.resolve()].terminated
+    assert expt.refresh() == []
+
+
+@pytest.fixture
+def generated(tmp_path):
+    conf = write_generation_config(
+        tmp_path / "config", xyz=2, styles=2, spins=2, calculations=1, basis_sets=2
+    )
+    root = tmp_path / "exp"
+    run_generation(conf, root)
+    shutil.copy(conf, root / "orca.yml")
+    return root
+
+
+def test_generation_manifest(generated):
+    records = read_job_records(generated)
+    assert len(records) == 2 * 2 * 2 * 1 * 2
+    for rec in records:
+        inp = generated / rec.jobdir / "orca.inp"
+        assert rec.input_hash == hashlib.sha256(inp.read_bytes()).hexdigest()
+        assert f"*xyz {rec.spin}" in inp.read_text()
+        assert (generated / rec.xyz).is_file()
+        assert rec.output == f"{rec.jobdir}/orca.out"
+        assert rec.jobdir.startswith("wailordFold/")
+    assert (generated / "wailordFold" / "jobs.jsonl").is_file()
+    # Only the jobs which wrote an output are listed
+    for num, rec in enumerate(records[::2]):
+        write_output(generated / rec.output, basis=rec.basis, seed=num)
+    expt = waio.orca.orcaExp(generated)
+    walked = waio.orca.orcaExp(generated, manifest=False)
+    assert sorted(expt.orclist) == walked.orclist
+    assert len(expt.orclist) == len(records[::2])
+    by_path = dict(zip(walked.orclist, walked.run_info()))
+    assert [by_path[runf] for runf in expt.orclist] == expt.run_info()
+    assert expt._jobs and not walked._jobs
+
+
+def test_manifest_skips_listing(generated, monkeypatch):
+    rec = read_job_records(generated)[-1]
+    write_output(generated / rec.output, basis=rec.basis)
+    ofile = generated / rec.output
+    with gzip.open(ofile.with_name("orca.out.gz"), "wb") as out:
+        out.write(ofile.read_bytes())
+    ofile.unlink()
+
+    scandir = os.scandir
+
+    def root_only(path="."):
+        # Finding the project folder's manifest lists the root, nothing else
+        if Path(path) != generated:
+            raise AssertionError(f"listed {path}")
+        return scandir(path)
+
+    def no_listing(*args):
+        raise AssertionError("listed a directory")
+
+    monkeypatch.setattr(os, "scandir", root_only)
+    monkeypatch.setattr(os, "walk", no_listing)
+    expt = waio.orca.orcaExp(generated, order_theory=[rec.style])
+    assert expt.orclist == [ofile.with_name("orca.out.gz").resolve()]
+    run = expt.runs.iloc[0]
+    assert (run.theory, run.basis, run.slug) == (rec.style, rec.basis, rec.slug)
+    assert run.spin == "spin_" + rec.spin.replace(" ", "")
+    assert expt.final_energies().final_sp_energy.notna().all()
+
+
+def test_generation_output_name(tmp_path):
+    conf = write_generation_config(
+        tmp_path / "config", xyz=1, styles=1, calculations=1, basis_sets=1
+    )
+    script = conf.parent / "basejob.sh"
+    script.write_text(script.read_text().replace("> orca.out", ">job.log 2>&1"))
+    run_generation(conf, tmp_path / "script")
+    (rec,) = read_job_records(tmp_path / "script")
+    assert rec.output == f"{rec.jobdir}/job.log"
+    config = yaml.safe_load(conf.read_text())
+    conf.write_text(yaml.safe_dump({**config, "output": "named.out"}))
+    run_generation(conf, tmp_path / "config_key")
+    (rec,) = read_job_records(tmp_path / "config_key")
+    assert rec.output == f"{rec.jobdir}/named.out"
+    script.write_text(script.read_text().replace(">job.log", "| tee log"))
+    conf.write_text(yaml.safe_dump(config))
+    with pytest.warns(UserWarning, match="No output redirect"):
+        run_generation(conf, tmp_path / "unknown")
+    (rec,) = read_job_records(tmp_path / "unknown")
+    assert rec.output == f"{rec.jobdir}/orca.out"
+
+
+def test_manifest_falls_back_to_walk(generated):
+    rec = read_job_records(generated)[0]
+    ofile = generated / rec.jobdir / "renamed.out"
+    write_output(ofile, basis=rec.basis)
+    with pytest.warns(UserWarning, match="walking the tree"):
+        expt = waio.orca.orcaExp(generated)
+    assert expt.orclist == [ofile.resolve()]
+    assert not expt._jobs
@@ -0,0 +1,53 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import wailord.io as waio
+from wailord.io._executor import chunked, run_chunks
+
+TEST_IO = Path(__file__).parent / "test_io"
+
+
+def _square(chunk, offset):
+    return [item * item + offset for item in chunk]
+
+
+@pytest.mark.parametrize("executor", ["serial", "thread", "process"])
+def test_run_chunks_keeps_order(executor):
+    items = list(range(37))
+    got = run_chunks(_square, items, (1,), workers=3, executor=executor, chunksize=4)
+    assert got == [item * item + 1 for item in items]
+    assert [len(chunk) for chunk in chunked(items, 10)] == [10, 10, 10, 7]
+
+
+def test_unknown_executor():
+    with pytest.raises(ValueError):
+        run_chunks(_square, [1, 2], (0,), workers=2, executor="cluster")
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_parallel_tables_match_serial(executor):
+    oth = ["HF", "MP2", "B3LYP"]
+    serial = waio.orca.orcaExp(TEST_IO / "ir_spec", order_theory=oth)
+    para = waio.orca.orcaExp(
+        TEST_IO / "ir_spec", order_theory=oth, workers=2, executor=executor
+    )
+    pd.testing.assert_frame_equal(serial.get_ir_spec(), para.get_ir_spec())
+    pd.testing.assert_frame_equal(
+        serial.get_final_sp_energy(), para.get_final_sp_energy()
+    )
+
+
+def test_collect_matches_getters():
+    oth = ["HF", "MP2", "B3LYP"]
+    expt = waio.orca.orcaExp(TEST_IO / "vpt2_h2o", order_theory=oth)
+    tabs = expt.collect(["energy", "vpt2"])
+    pd.testing.assert_frame_equal(tabs["energy"], expt.get_final_sp_energy())
+    pd.testing.assert_frame_equal(tabs["vpt2"], expt.get_vpt2_transitions())
+    oth = ["UHF", "UKS BLYP", "UKS B3LYP"]
+    expt = waio.orca.orcaExp(TEST_IO / "multxyz_pop", order_theory=oth)
+    tabs = expt.collect(["pop"])
+    pd.testing.assert_frame_equal(tabs["pop"], expt.get_population())
+    with pytest.raises(ValueError):
+        expt.collect(["nmr"])
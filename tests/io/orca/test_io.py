@@ -5,6 +5,8 @@ import pytest
 
 from pint import UnitRegistry
 
+from wailord.units import attach_units
+
 ureg = UnitRegistry()
 Q_ = ureg.Quantity
 
@@ -165,6 +167,28 @@ def test_get_energy_surface_shape_more(datadir):
 #######################
 
 
+def test_get_population_arrays(datadir):
+    oth = ["UHF", "UKS BLYP", "UKS B3LYP"]
+    expt = waio.orca.orcaExp(expfolder=datadir / "multxyz_pop", order_theory=oth)
+    runs, arrays = expt.get_population_arrays()
+    popdat = expt.get_population()
+    assert list(runs.theory.unique()) == oth
+    assert sorted(runs.run_id) == list(range(len(expt.orclist)))
+    for poptype, pops in arrays.items():
+        assert pops.charges.shape[0] == len(runs)
+        assert pops.symbols.shape == pops.charges.shape[::2]
+        for row, run in enumerate(runs.itertuples()):
+            sel = popdat[
+                (popdat.population == poptype)
+                & (popdat.slug == run.slug)
+                & (popdat.theory == run.theory)
+            ]
+            charges = pops.charges[row]
+            np.testing.assert_array_equal(charges[~np.isnan(charges)], sel.pcharge)
+            spins = pops.spins[row]
+            np.testing.assert_array_equal(spins[~np.isnan(spins)], sel.pspin)
+
+
 def test_get_pop(datadir):
     oth = ["UHF", "UKS BLYP", "UKS B3LYP"]
     expt = waio.orca.orcaExp(expfolder=datadir / "multxyz_pop", order_theory=oth)
@@ -208,6 +232,26 @@ def test_get_ir_freq(datadir):
     pass
 
 
+def test_facts_join_to_wide(datadir):
+    oth = ["HF", "MP2", "B3LYP"]
+    expt = waio.orca.orcaExp(expfolder=datadir / "ir_spec", order_theory=oth)
+    runs = expt.runs
+    assert list(runs.run_id) == list(range(len(expt.orclist)))
+    assert all(runs[col].dtype == "category" for col in waio.orca.RUN_COLUMNS)
+    facts = expt.facts("ir")
+    assert facts.columns[0] == "run_id"
+    assert not set(waio.orca.RUN_COLUMNS) & set(facts.columns)
+    wide = waio.orca.join_runs(facts, runs).drop_duplicates()
+    pd.testing.assert_frame_equal(expt._order(wide), expt.get_ir_spec())
+    assert (
+        facts.memory_usage(deep=True).sum()
+        < expt.get_ir_spec().memory_usage(deep=True).sum()
+    )
+    vdat = expt.get_vib_freq()
+    assert list(vdat.columns[-5:]) == list(waio.orca.RUN_COLUMNS)
+    assert vdat.shape == (135, 8)
+
+
 ######################
 # VPT2 Anharmonicity #
 ######################
@@ -219,3 +263,32 @@ def test_vpt2_transitions(datadir):
     vdat = expt.get_vpt2_transitions()
     assert vdat.shape == (9, 9)
     pass
+
+
+def test_unit_light_tables(datadir):
+    oth = ["HF", "MP2", "B3LYP"]
+    expt = waio.orca.orcaExp(expfolder=datadir / "ir_spec", order_theory=oth)
+    light = waio.orca.orcaExp(
+        expfolder=datadir / "ir_spec", order_theory=oth, units=False
+    )
+    vdat, ldat = expt.get_ir_spec(), light.get_ir_spec()
+    assert ldat.freq.dtype == np.float64
+    assert ldat.attrs["units"] == {
+        "freq": "reciprocal_centimeter",
+        "T2": "kilometer / mole",
+    }
+    pd.testing.assert_frame_equal(attach_units(ldat), vdat)
+    energy = light.get_final_sp_energy()
+    assert set(energy.unit) == {"hartree"}
+    np.testing.assert_array_equal(
+        energy.final_sp_energy, expt.get_final_sp_energy().final_sp_energy
+    )
+    # Extractor batches do not depend on the mode of the run
+    ofile = expt.orclist[0]
+    heavy = waio._table.to_batch(waio.orca._OrcaRun(ofile).ir_spec())
+    run = waio.orca._OrcaRun(ofile, units=False)
+    assert run.ir_spec().attrs["units"] == ldat.attrs["units"]
+    batch = waio._table.to_batch(run.ir_spec())
+    assert batch["units"] == heavy["units"]
+    for name, arr in heavy["columns"].items():
+        np.testing.assert_array_equal(batch["columns"][name], arr)
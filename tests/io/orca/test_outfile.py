@@ -0,0 +1,174 @@
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import wailord.io as waio
+from wailord.io._outfile import (
+    OutBuffer,
+    SectionIndex,
+    decode_table,
+    last_line,
+    table_bounds,
+)
+
+SP_DIR = Path(__file__).parent / "singles" / "test_sp"
+
+
+@pytest.mark.parametrize("threshold", [0, 1 << 30])
+def test_index_matches_line_search(threshold):
+    ofile = SP_DIR / "orca_qcisdt.out"
+    with OutBuffer(ofile, mmap_threshold=threshold) as buf:
+        index = SectionIndex(buf, waio.orca.SECTION_MARKERS)
+        flines = ofile.read_text().splitlines(keepends=True)
+        for key in ("Actual Energy", "MDCI", "MDCI w/o Triples", "Mulliken"):
+            expected = [
+                line.rstrip("\n")
+                for line in flines
+                if waio.orca.OUT_REGEX[key].search(line)
+            ]
+            found = [buf.line(pos) for pos in index.offsets[key]]
+            assert found == expected
+
+
+def test_section_stops_at_next_marker():
+    with OutBuffer(SP_DIR / "orca_qcisdt.out") as buf:
+        index = SectionIndex(buf, waio.orca.SECTION_MARKERS)
+        text = buf.text(*index.section("MDCI"))
+        assert text.startswith("The Calculated Surface using the MDCI energy\n")
+        assert "minus triple correction" not in text
+        assert len(re.findall(r"^\s*\d+\.\d+\s+-\d+\.\d+$", text, re.M)) == 33
+
+
+def test_orcarun_is_lazy():
+    run = waio.orca._OrcaRun(SP_DIR / "orca_qcisdt.out")
+    assert run._buf is None
+    assert run.eeval == 33
+    assert run._fin_sp_e is None
+    run.close()
+    assert run._buf is None
+
+
+@pytest.mark.parametrize("blocksize", [7, 4096, 1 << 16])
+def test_last_line_matches_forward_search(blocksize):
+    marker = waio.orca.SECTION_MARKERS["final_single_point_e"]
+    for ofile in SP_DIR.glob("*.out"):
+        flines = ofile.read_text().splitlines()
+        expected = [line for line in flines if re.match(marker, line)]
+        got = last_line(ofile, marker, blocksize=blocksize)
+        assert got == (expected[-1] if expected else None)
+
+
+def test_final_energies_match_getter():
+    expt = waio.orca.orcaExp(SP_DIR.parent.parent / "test_io" / "h2")
+    fast = expt.final_energies()
+    slow = expt.get_final_sp_energy()
+    pd.testing.assert_frame_equal(fast, slow)
+
+
+def test_mult_energy_surface_is_aligned():
+    run = waio.orca._OrcaRun(SP_DIR / "orca_qcisdt.out")
+    etypes = ["Actual Energy", "MDCI", "MDCI w/o Triples", "SCF Energy"]
+    edat = run.mult_energy_surface(etypes)
+    assert edat.shape[0] == 33
+    for etype in etypes:
+        single = run.single_energy_surface(etype)
+        np.testing.assert_array_equal(edat.bond_length, single.bond_length)
+        np.testing.assert_array_equal(edat[etype], single[etype])
+    with pytest.raises(ValueError):
+        run.surface_arrays("MDCI", npoints=40)
+
+
+def test_decode_table_columns():
+    data = b"""IR SPECTRUM
+ Mode   freq
+-----------
+   6:   1639.47   57.557835  ( -0.000000   0.000000   7.586688)
+   7:   3807.28    3.478362  ( -0.000000  -0.000000   1.865037)
+
+trailing text
+"""
+    cols = decode_table(
+        data,
+        data.index(b"   6:"),
+        data.index(b"\n\ntrailing") + 1,
+        {
+            "Mode": np.int64,
+            "freq": np.float64,
+            "T2": None,
+            "TX": np.float64,
+            "TY": np.float64,
+            "TZ": np.float64,
+        },
+        delete=b":()",
+    )
+    assert list(cols) == ["Mode", "freq", "TX", "TY", "TZ"]
+    np.testing.assert_array_equal(cols["Mode"], [6, 7])
+    assert cols["Mode"].dtype == np.int64
+    np.testing.assert_array_equal(cols["TZ"], [7.586688, 1.865037])
+    with pytest.raises(ValueError):
+        decode_table(data, data.index(b"   6:"), data.index(b"TZ\n") - 3, {"a": str})
+    ragged = re.compile(rb"^\s*(\d+):\s+(\S+)( imag)?", re.M)
+    cols = decode_table(
+        b" 0: 1.0\n 1: -2.5 imag\n",
+        0,
+        22,
+        {"Mode": str, "freq": np.float64, "imaginary": bool},
+        pattern=ragged,
+    )
+    assert list(cols["Mode"]) == ["0", "1"]
+    np.testing.assert_array_equal(cols["imaginary"], [False, True])
+
+
+def test_decode_table_rejects_malformed_rows():
+    columns = {"Mode": np.int64, "freq": np.float64, "T2": np.float64}
+    data = b"   6   1639.47   57.56\n   7   ********   3.48\n   8   3900.1   0.1\n"
+    with pytest.raises(ValueError):
+        decode_table(data, 0, len(data), columns)
+    # Three rows short of a column are still six tokens, two "rows" of three
+    short = b"   6   1639.47\n   7   3807.28\n   8   3900.1\n"
+    with pytest.raises(ValueError):
+        decode_table(short, 0, len(short), columns)
+    cols = decode_table(data.replace(b"********", b"3807.28"), 0, len(data), columns)
+    np.testing.assert_array_equal(cols["Mode"], [6, 7, 8])
+
+
+def test_legacy_tables_match_line_parse():
+    run = waio.orca._OrcaRun(SP_DIR / "b3lyp_6311g88_h2o.out")
+    with OutBuffer(run.ofile) as buf:
+        index = SectionIndex(buf, waio.orca.SECTION_MARKERS)
+        start, end = table_bounds(buf, index.offsets["irSpectrum"][0], skip=4)
+        rows = [line.split() for line in buf.text(start, end).splitlines()]
+    ir = run.ir_spec()
+    assert [int(row[0].rstrip(":")) for row in rows] == list(ir.Mode)
+    assert [float(row[2]) for row in rows] == list(ir.T2.pint.magnitude)
+    vib = run.vib_freq()
+    assert list(vib.Mode) == list(range(9))
+    assert not vib.imaginary.any()
+    np.testing.assert_array_equal(vib.freq.pint.magnitude[-3:], ir.freq.pint.magnitude)
+    run.close()
+    run = waio.orca._OrcaRun(SP_DIR / "orca_imaginary_freq.out")
+    assert run.vib_freq().imaginary.sum() == 1
+    run.close()
+
+
+def test_mult_energy_surface_differing_axes(monkeypatch):
+    run = waio.orca._OrcaRun(SP_DIR / "orca_qcisdt.out")
+    surfaces = {
+        "Actual Energy": ([1.0, 1.1, 1.2, 1.3], [-1.0, -1.1, -1.2, -1.3]),
+        # Printed with less precision, one point missing, out of order
+        "SCF Energy": ([1.3 + 4e-7, 1.0, 1.2 - 4e-7], [-3.3, -3.0, -3.2]),
+    }
+    monkeypatch.setattr(
+        run,
+        "surface_arrays",
+        lambda etype, npoints=None: tuple(map(np.array, surfaces[etype])),
+    )
+    edat = run.mult_energy_surface(list(surfaces))
+    np.testing.assert_array_equal(edat.bond_length, [1.0, 1.2, 1.3])
+    np.testing.assert_array_equal(edat["Actual Energy"], [-1.0, -1.2, -1.3])
+    np.testing.assert_array_equal(edat["SCF Energy"], [-3.0, -3.2, -3.3])
+    strict = run.mult_energy_surface(list(surfaces), atol=1e-9)
+    np.testing.assert_array_equal(strict.bond_length, [1.0])
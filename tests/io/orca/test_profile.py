@@ -0,0 +1,73 @@
+import json
+from pathlib import Path
+
+import pytest
+
+import wailord.io as waio
+from wailord.io.profile import ENV, ParseRecord, profiling
+
+TEST_IO = Path(__file__).parent / "test_io"
+OTH = ["HF", "MP2", "B3LYP"]
+
+
+def test_profile_records(tmp_path):
+    expt = waio.orca.orcaExp(TEST_IO / "ir_spec", order_theory=OTH, profile=True)
+    expt.get_ir_spec()
+    expt.get_final_sp_energy()
+    frame = expt.profile.frame()
+    assert list(frame.columns) == list(ParseRecord._fields)
+    assert len(frame) == 2 * len(expt.orclist)
+    assert set(frame.extractor) == {"ir_spec", "final_sp_e"}
+    assert (frame.seconds > 0).all()
+    assert (frame.bytes_read > 0).all()
+    assert frame.backend.isin(["grammar", "regex"]).all()
+    summary = expt.profile.summary()
+    assert summary.calls.sum() == len(frame)
+    assert set(expt.profile.timings) == {"discover", "backend", "collect"}
+    # Served from memory, nothing is parsed again
+    expt.get_ir_spec()
+    assert len(expt.profile.records) == len(frame)
+    report = json.loads(expt.profile.to_json(tmp_path / "profile.json"))
+    assert len(report["records"]) == len(frame)
+    assert (tmp_path / "profile.json").exists()
+
+
+def test_profile_env(monkeypatch):
+    monkeypatch.setenv(ENV, "tracemalloc")
+    expt = waio.orca.orcaExp(TEST_IO / "vpt2_h2o", order_theory=OTH)
+    expt.get_vpt2_transitions()
+    assert expt.profile.memory and not expt.profile.cprofile
+    assert expt.profile.peak_memory > 0
+    assert len(expt.profile.records) == len(expt.orclist)
+    assert waio.orca.orcaExp(TEST_IO / "vpt2_h2o", profile=False).profile is None
+    monkeypatch.delenv(ENV)
+    assert waio.orca.orcaExp(TEST_IO / "vpt2_h2o").profile is None
+
+
+@pytest.mark.parametrize("executor", ["serial", "process"])
+def test_profiling_block(executor):
+    with profiling(cprofile=True) as prof:
+        expt = waio.orca.orcaExp(TEST_IO / "h2", workers=2, executor=executor)
+        expt.get_energy_surface()
+    assert len(prof.records) == len(expt.orclist)
+    assert prof.timings["discover"] > 0
+    assert "get_energy_surface" in prof.stats_text(50)
+    assert expt.profile is None
+
+
+def test_grammar_fallback_recorded(monkeypatch):
+    def broken(parse, path):
+        raise ValueError("no grammar for this")
+
+    monkeypatch.setattr(waio.orca, "grammar_parser", lambda section: print)
+    monkeypatch.setattr(waio.orca, "_ir_via_chemparseplot", broken)
+    ofile = waio.orca.orcaExp(TEST_IO / "ir_spec").orclist[0]
+    run = waio.orca._OrcaRun(ofile, backends={"ir": "grammar"})
+    spec, record = run.call("ir_spec")
+    section = len(run.section_text("irSpectrum").encode())
+    run.close()
+    assert len(spec)
+    assert record.backend == "regex"
+    assert record.fallback == "ValueError: no grammar for this"
+    # The shared buffer and the slice handed to the grammar
+    assert record.bytes_read == ofile.stat().st_size + section
@@ -0,0 +1,108 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import wailord.io as waio
+
+pytest.importorskip("h5py")
+
+TEST_IO = Path(__file__).parent / "test_io"
+OTH = ["HF", "MP2", "B3LYP"]
+
+
+def test_store_serves_tables(tmp_path):
+    expt = waio.orca.orcaExp(TEST_IO / "ir_spec", order_theory=OTH)
+    path = expt.to_store(tmp_path / "exp.h5", tables=["energy", "ir"])
+    with waio.store.ExperimentStore(path) as stored:
+        assert stored.orclist == expt.orclist
+        assert sorted(stored.tables) == ["energy", "ir"]
+        pd.testing.assert_frame_equal(stored.get_ir_spec(), expt.get_ir_spec())
+        pd.testing.assert_frame_equal(
+            stored.get_final_sp_energy(), expt.get_final_sp_energy()
+        )
+        pd.testing.assert_frame_equal(stored.facts("ir"), expt.facts("ir"))
+        assert "theory" not in stored._h5["tables/ir"]
+        runs = stored.runs
+        assert list(runs.run_id) == list(range(len(expt.orclist)))
+        # The CO2 jobs stop on a symmetry error after the frequencies
+        assert list(runs.slug[~runs.terminated].unique()) == ["C1O2_co2"]
+        with pytest.raises(KeyError):
+            stored.get_vpt2_transitions()
+
+
+def test_store_trajectories(tmp_path):
+    expt = waio.orca.orcaExp(TEST_IO / "h2")
+    path = expt.to_store(tmp_path / "exp.h5")
+    with waio.store.ExperimentStore(path) as stored:
+        for run_id in (0, len(expt.orclist) - 1):
+            want = waio.orca.read_trajectory(expt.orclist[run_id])
+            got = stored.trajectory(run_id)
+            np.testing.assert_array_equal(got.coords.magnitude, want.coords.magnitude)
+            np.testing.assert_array_equal(got.symbols, want.symbols)
+            np.testing.assert_array_equal(
+                got.energies.magnitude, want.energies.magnitude
+            )
+
+
+def test_store_defaults_to_held_tables(tmp_path, monkeypatch):
+    oth = ["UHF", "UKS BLYP", "UKS B3LYP"]
+    expt = waio.orca.orcaExp(TEST_IO / "multxyz_pop", order_theory=oth)
+    path = expt.to_store(tmp_path / "exp.h5", trajectories=False)
+    with waio.store.ExperimentStore(path) as stored:
+        # No scans, so no surface table
+        assert sorted(stored.tables) == ["energy", "pop", "vib"]
+        nruns = len(expt.orclist)
+        assert stored.lacking["surface"] == list(range(nruns))
+        pd.testing.assert_frame_equal(stored.get_vib_freq(), expt.get_vib_freq())
+        pd.testing.assert_frame_equal(stored.final_energies(), expt.final_energies())
+        assert stored.run_info() == expt.run_info()
+        runs, arrays = stored.get_population_arrays()
+        want_runs, want = expt.get_population_arrays()
+        pd.testing.assert_frame_equal(runs, want_runs)
+        for poptype, pops in want.items():
+            np.testing.assert_array_equal(arrays[poptype].symbols, pops.symbols)
+            np.testing.assert_array_equal(arrays[poptype].charges, pops.charges)
+            np.testing.assert_array_equal(arrays[poptype].spins, pops.spins)
+        with pytest.raises(KeyError):
+            stored.get_ir_spec()
+        with pytest.raises(KeyError):
+            stored.get_population_arrays("Mulliken")
+
+    def no_reads(*args, **kwargs):
+        raise AssertionError("read an output")
+
+    monkeypatch.setattr(waio.orca, "final_energy", no_reads)
+    monkeypatch.setattr(waio.orca, "read_populations", no_reads)
+    with waio.store.ExperimentStore(path) as stored:
+        assert stored.final_energies().final_sp_energy.notna().all()
+        assert stored.get_population_arrays()[1]["Loewdin"].charges.size
+
+
+def test_held_tables_parse_once(tmp_path, monkeypatch):
+    expt = waio.orca.orcaExp(TEST_IO / "h2")
+    broken = expt.orclist[1]
+    real_pop = waio.orca._OrcaRun.mult_population_analysis
+
+    def pop(run, *args):
+        if run.ofile == broken:
+            raise KeyError("Mulliken")
+        return real_pop(run, *args)
+
+    opened = []
+    real_run = waio.orca._OrcaRun
+
+    def counted(runf, *args, **kwargs):
+        opened.append(runf)
+        return real_run(runf, *args, **kwargs)
+
+    monkeypatch.setattr(waio.orca._OrcaRun, "mult_population_analysis", pop)
+    monkeypatch.setattr(waio.orca, "_OrcaRun", counted)
+    path = expt.to_store(tmp_path / "exp.h5", trajectories=False)
+    # Every output is parsed once, whatever fails on it
+    assert sorted(opened) == sorted(expt.orclist)
+    with waio.store.ExperimentStore(path) as stored:
+        assert sorted(stored.tables) == ["energy", "surface", "vib"]
+        assert stored.lacking["pop"] == [1]
+        assert len(stored.lacking["ir"]) == len(expt.orclist)
@@ -0,0 +1,43 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import wailord.io as waio
+
+SP_DIR = Path(__file__).parent / "singles" / "test_sp"
+
+
+def _legacy_frames(ofile):
+    lines = ofile.read_text().splitlines()
+    frames = []
+    for num, line in enumerate(lines):
+        if "CARTESIAN COORDINATES (ANGSTROEM)" in line:
+            frame = []
+            for atom in lines[num + 2 :]:
+                if not atom.strip():
+                    break
+                frame.append(atom.split())
+            frames.append(frame)
+    return frames
+
+
+@pytest.mark.parametrize(
+    "name", ["ch3f_3ang_b3lyp.out", "orca_qcisdt.out", "b3lyp_6311g88_h2o.out"]
+)
+def test_trajectory_matches_line_parse(name):
+    ofile = SP_DIR / name
+    traj = waio.orca.read_trajectory(ofile)
+    frames = _legacy_frames(ofile)
+    assert traj.coords.shape == (len(frames), len(frames[0]), 3)
+    assert str(traj.coords.units) == "angstrom"
+    assert list(traj.symbols) == [atom[0] for atom in frames[0]]
+    expected = np.array([[atom[1:] for atom in frame] for frame in frames], float)
+    np.testing.assert_array_equal(traj.coords.magnitude, expected)
+    assert traj.energies.magnitude[-1] == waio.orca.final_energy(ofile, grammar=False)
+
+
+def test_no_geometry():
+    traj = waio.orca.read_trajectory(SP_DIR / "orcaVPT2.out")
+    assert traj.coords.shape == (0, 0, 3)
+    assert len(traj.energies) == 1
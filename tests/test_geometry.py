@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from wailord import geometry
+from wailord.io import orca
+
+WATER = np.array([[0.0, 0.0, 0.0], [0.9572, 0.0, 0.0], [-0.2400, 0.9266, 0.0]])
+
+
+def test_single_frame():
+    np.testing.assert_allclose(geometry.distances(WATER, [(0, 1)]), [0.9572])
+    np.testing.assert_allclose(
+        geometry.angles(WATER, [(0, 1, 2)]), [104.5215], atol=1e-3
+    )
+    dmat = geometry.distance_matrix(WATER)
+    assert dmat.shape == (3, 3)
+    np.testing.assert_allclose(dmat, dmat.T)
+    (i, j), dist = geometry.neighbour_list(WATER, 1.0)
+    assert list(zip(i, j)) == [(0, 1), (0, 2)]
+    assert len(dist) == 2
+
+
+def test_stacked_frames_and_units():
+    frames = np.stack([WATER, 2 * WATER, WATER + 1.0])
+    lengths = geometry.distances(orca.Q_(frames, "angstrom"), [(0, 1), (0, 2)])
+    assert lengths.shape == (3, 2)
+    assert str(lengths.units) == "angstrom"
+    np.testing.assert_allclose(lengths.magnitude[1], 2 * lengths.magnitude[0])
+    angles = geometry.angles(frames, [(0, 1, 2)])
+    np.testing.assert_allclose(angles[:, 0], angles[0, 0])
+
+
+@pytest.mark.parametrize("torsion", [-120.0, 0.0, 60.0, 180.0])
+def test_dihedral(torsion):
+    rad = np.radians(torsion)
+    quad = np.array(
+        [
+            [1.0, 0.0, 0.0],
+            [0.0, 0.0, 0.0],
+            [0.0, 0.0, 1.0],
+            [np.cos(rad), np.sin(rad), 1.0],
+        ]
+    )
+    got = geometry.dihedrals(quad, [(0, 1, 2, 3)])[0]
+    assert got == pytest.approx(torsion) or abs(got) == pytest.approx(180.0)
+
+
+def test_padded_frames():
+    padded = geometry.pad_frames([WATER, WATER[:2]])
+    assert padded.shape == (2, 3, 3)
+    assert np.isnan(geometry.angles(padded, [(0, 1, 2)])[1, 0])
+
+
+def test_wrappers_match_kernels():
+    dat = pd.DataFrame(
+        [
+            orca.inpcart(sym, *(orca.Q_(val, "angstrom") for val in xyz))
+            for sym, xyz in zip("OHH", WATER)
+        ]
+    )
+    bl = orca.getBL(dat, dat.x, dat.y, dat.z, [0, 1])
+    ba = orca.getBA(dat, dat.x, dat.y, dat.z, [0, 1, 2])
+    assert bl.magnitude == pytest.approx(0.9572)
+    assert ba.magnitude == pytest.approx(geometry.angles(WATER, [(0, 1, 2)])[0])
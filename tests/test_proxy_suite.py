@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import re
 from pathlib import Path
 
 import pytest
@@ -46,6 +47,31 @@ def test_orca_final_energy_via_chemparseplot():
     assert e == pytest.approx(-1.01010039, rel=1e-6)
 
 
+def test_final_energy_grammar_sees_lines(monkeypatch, tmp_path):
+    grammar = pytest.importorskip("chemparseplot.parse.grammar.orca_text")
+    import wailord.io as waio
+    from wailord.testing import write_output
+
+    seen = []
+    parse = grammar.parse_orca_text_summary
+
+    def spy(text):
+        seen.append(text)
+        return parse(text)
+
+    monkeypatch.setattr(waio.orca, "grammar_parser", lambda section: spy)
+    ofile = write_output(tmp_path / "orca.out", atoms=20, steps=30, modes=0)
+    text = ofile.read_text()
+    want = parse(text).final_energy_hartree
+    assert waio.orca._final_energy_via_chemparseplot(text) == want
+    assert waio.orca.final_energy(ofile) == pytest.approx(want)
+    assert seen and all("\n" not in line for line in seen)
+    # Positive energies are missed by the section marker, not by the grammar
+    ofile.write_text(re.sub(r"(POINT ENERGY\s+)-", r"\1 ", text))
+    assert waio.orca.final_energy(ofile) == pytest.approx(-want)
+    assert all("\n" not in line for line in seen)
+
+
 def test_inp_generator_is_batch_api(tmp_path):
     """Multi-job YAML harness remains a first-class batch-shell API (no deprecation)."""
     import warnings
@@ -0,0 +1,173 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from wailord.io import orca
+from wailord.scan import ScanGrid
+
+SP_DIR = Path(__file__).parent / "io" / "orca" / "singles" / "test_sp"
+
+R_AXIS = np.linspace(0.8, 1.6, 9)
+A_AXIS = np.linspace(-180.0, 180.0, 13)
+
+
+def _double_well(r, a):
+    # Minimum at r = 1.2, wells at a = +-90, barrier at a = 0
+    return (r - 1.2) ** 2 + 0.01 * np.cos(np.radians(2 * a))
+
+
+def _steps(order=None):
+    rr, aa = np.meshgrid(R_AXIS, A_AXIS, indexing="ij")
+    values = np.column_stack([rr.ravel(), aa.ravel()])
+    order = np.arange(len(values)) if order is None else order
+    values = values[order]
+    energies = _double_well(values[:, 0], values[:, 1])
+    geometries = np.zeros((len(values), 2, 3))
+    geometries[:, 1, 0] = values[:, 0]
+    return values, energies, geometries
+
+
+def _write_scan(path, values, energies, old_banner=False):
+    out = ["There are 2 parameter(s) to be scanned\n\n"]
+    for num, ((r, a), energy) in enumerate(zip(values, energies), start=1):
+        stars = "         " + "*" * 61
+        if old_banner:
+            out += [
+                f"{stars}\n",
+                f"         *        RELAXED SURFACE SCAN STEP {num:3d}        *\n",
+                f"         *   Bond (  1,   0)  : {r:12.8f}   *\n",
+                f"         *   Dihedral (  3,   2,   1,   0)  : {a:12.8f}   *\n",
+                f"{stars}\n",
+            ]
+        else:
+            out += [
+                f"{stars}\n",
+                f"                                TRAJECTORY STEP {num:3d}\n",
+                f"                  R  : {r:12.8f}\n",
+                f"                  A  : {a:12.8f}\n",
+                f"{stars}\n",
+            ]
+        out += [
+            "\n---------------------------------\n",
+            "CARTESIAN COORDINATES (ANGSTROEM)\n",
+            "---------------------------------\n",
+            "  H      0.000000    0.000000    0.000000\n",
+            f"  H      {r:.6f}    0.000000    0.000000\n\n",
+            f"FINAL SINGLE POINT ENERGY      {energy - 4.0:.12f}\n\n",
+            "---------------------------------\n",
+            "CARTESIAN COORDINATES (ANGSTROEM)\n",
+            "---------------------------------\n",
+            "  H      0.000000    0.000000    0.000000\n",
+            f"  H      {r:.6f}    0.000000    0.000000\n\n",
+            f"FINAL SINGLE POINT ENERGY      {energy - 5.0:.12f}\n\n",
+        ]
+    path.write_text("".join(out))
+    return path
+
+
+def test_grid_from_shuffled_steps():
+    order = np.random.default_rng(7).permutation(len(R_AXIS) * len(A_AXIS))
+    values, energies, geometries = _steps(order)
+    grid = ScanGrid(["R", "A"], values, energies, geometries, ["H", "H"])
+    assert grid.shape == (9, 13)
+    np.testing.assert_array_equal(grid.coords[0], R_AXIS)
+    np.testing.assert_array_equal(grid.coords[1], A_AXIS)
+    rr, aa = np.meshgrid(R_AXIS, A_AXIS, indexing="ij")
+    np.testing.assert_allclose(grid.energy, _double_well(rr, aa))
+    np.testing.assert_allclose(grid.geometry[..., 1, 0], rr)
+    frame = grid.to_frame()
+    assert list(frame.columns) == ["R", "A", "energy"]
+    assert len(frame) == grid.energy.size
+
+
+def test_jittered_coordinates_share_axes():
+    values, energies, geometries = _steps()
+    noise = np.random.default_rng(3).uniform(-2e-7, 2e-7, values.shape)
+    grid = ScanGrid(["R", "A"], values + noise, energies, geometries, ["H", "H"])
+    assert grid.shape == (9, 13)
+    assert np.isfinite(grid.energy).all()
+    np.testing.assert_allclose(grid.coords[0], R_AXIS, atol=1e-6)
+    np.testing.assert_allclose(grid.coords[1], A_AXIS, atol=1e-6)
+    rr, aa = np.meshgrid(R_AXIS, A_AXIS, indexing="ij")
+    np.testing.assert_allclose(grid.energy, _double_well(rr, aa))
+    # Without a tolerance every printed value is its own grid point
+    exact = ScanGrid(
+        ["R", "A"], values + noise, energies, geometries, ["H", "H"], atol=0
+    )
+    assert np.isnan(exact.energy).any()
+
+
+def test_missing_steps_are_nan():
+    values, energies, geometries = _steps()
+    grid = ScanGrid(["R", "A"], values[1:], energies[1:], geometries[1:], ["H", "H"])
+    assert np.isnan(grid.energy[0, 0])
+    assert np.isnan(grid.geometry[0, 0]).all()
+    assert np.isfinite(grid.energy).sum() == grid.energy.size - 1
+
+
+def test_stationary_points():
+    grid = ScanGrid(["R", "A"], *_steps(), ["H", "H"])
+    minima = grid.minima()
+    assert sorted(minima["A"]) == [-90.0, 90.0]
+    np.testing.assert_allclose(minima["R"], 1.2)
+    saddles = grid.saddles()
+    assert list(saddles["A"]) == [0.0]
+    np.testing.assert_allclose(saddles["R"], 1.2)
+    assert saddles["index"][0] == (4, 6)
+
+
+def test_interpolate():
+    grid = ScanGrid(["R", "A"], *_steps(), ["H", "H"])
+    # Exact at the nodes
+    np.testing.assert_allclose(
+        grid.interpolate([[R_AXIS[3], A_AXIS[5]]]), [grid.energy[3, 5]]
+    )
+    # Linear along one axis between nodes
+    mid = grid.interpolate([[0.5 * (R_AXIS[3] + R_AXIS[4]), A_AXIS[5]]])
+    np.testing.assert_allclose(mid, [0.5 * (grid.energy[3, 5] + grid.energy[4, 5])])
+    # Bilinear functions are reproduced everywhere inside the grid
+    values, _, geometries = _steps()
+    plane = 2.0 * values[:, 0] - 0.01 * values[:, 1] + 0.5
+    flat = ScanGrid(["R", "A"], values, plane, geometries, ["H", "H"])
+    points = np.column_stack(
+        [np.linspace(0.8, 1.6, 17), np.linspace(-170.0, 175.0, 17)]
+    )
+    np.testing.assert_allclose(
+        flat.interpolate(points), 2.0 * points[:, 0] - 0.01 * points[:, 1] + 0.5
+    )
+    assert np.isnan(grid.interpolate([[2.0, 0.0]])).all()
+
+
+def test_read_one_dimensional_scan():
+    ofile = SP_DIR / "orca_qcisdt.out"
+    grid = orca.read_scan(ofile)
+    assert grid.dims == ["R"]
+    assert grid.shape == (33,)
+    np.testing.assert_allclose(grid.coords[0], np.linspace(0.4, 2.0, 33))
+    run = orca._OrcaRun(ofile)
+    _, surface = run.surface_arrays("Actual Energy")
+    np.testing.assert_allclose(run.scan_grid().energy, surface)
+    run.close()
+    bonds = np.linalg.norm(grid.geometry[:, 1] - grid.geometry[:, 0], axis=-1)
+    np.testing.assert_allclose(bonds, grid.coords[0], atol=1e-5)
+    assert list(grid.minima()["R"]) == [0.75]
+
+
+@pytest.mark.parametrize("old_banner", [False, True])
+def test_read_two_dimensional_scan(tmp_path, old_banner):
+    values, energies, _ = _steps()
+    ofile = _write_scan(tmp_path / "scan.out", values, energies, old_banner)
+    grid = orca.read_scan(ofile)
+    assert grid.shape == (9, 13)
+    assert len(grid.dims) == 2
+    rr, aa = np.meshgrid(R_AXIS, A_AXIS, indexing="ij")
+    # The last energy and geometry of every step land on the grid
+    np.testing.assert_allclose(grid.energy + 5.0, _double_well(rr, aa), atol=1e-11)
+    np.testing.assert_allclose(grid.geometry[..., 1, 0], rr)
+    assert sorted(grid.minima()["index"]) == [(4, 3), (4, 9)]
+
+
+def test_not_a_scan():
+    with pytest.raises(ValueError):
+        orca.read_scan(SP_DIR / "orcaVPT2.out")
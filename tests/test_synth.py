@@ -0,0 +1,69 @@
+import numpy as np
+
+from wailord.io import orca
+from wailord.testing import (
+    THEORIES,
+    render_output,
+    run_generation,
+    write_experiment,
+    write_generation_config,
+    write_output,
+)
+
+
+def test_render_is_deterministic():
+    assert render_output(seed=3) == render_output(seed=3)
+    assert render_output(seed=3) != render_output(seed=4)
+
+
+def test_synthetic_output_parses(tmp_path):
+    jobdir = tmp_path / "synth" / "HF" / "spin_01" / "OPT" / "STO-3G"
+    ofile = write_output(
+        jobdir / "orca.out",
+        atoms=7,
+        steps=4,
+        scan_points=5,
+        modes=12,
+        populations=2,
+        imaginary=1,
+    )
+    run = orca._OrcaRun(ofile)
+    assert run.trajectory().coords.shape == (20, 7, 3)
+    assert run.scan_grid().shape == (5,)
+    assert run.mult_energy_surface().shape == (5, 10)
+    vib = run.vib_freq()
+    assert len(vib) == 18
+    assert vib.imaginary.sum() == 1
+    assert len(run.ir_spec()) == len(run.vpt2_transitions()) == 12
+    pops = run.population_arrays()
+    assert pops["Mulliken"].charges.shape == (10, 7)
+    np.testing.assert_allclose(pops["Loewdin"].charges.sum(axis=1), 0.0, atol=1e-5)
+    run.close()
+
+
+def test_experiment_tree(tmp_path):
+    root = write_experiment(tmp_path, runs=30, atoms=4, steps=2, modes=3)
+    expt = orca.orcaExp(root, order_theory=list(THEORIES))
+    assert len(expt.orclist) == 30
+    energy = expt.get_final_sp_energy()
+    assert energy.final_sp_energy.notna().all()
+    assert set(energy.theory) == set(THEORIES)
+    assert len(expt.get_ir_spec()) == 90
+
+
+def test_generation_counts(tmp_path):
+    conf = write_generation_config(
+        tmp_path / "config", xyz=3, styles=2, spins=2, calculations=1, basis_sets=2
+    )
+    report = run_generation(conf, tmp_path / "run")
+    inputs = sorted((tmp_path / "run" / "wailordFold").rglob("orca.inp"))
+    assert len(inputs) == 24
+    assert "*xyz 0 2" in inputs[-1].read_text()
+    # An input and a job script per job, plus the harness and the manifest
+    assert report["files"] == 50
+    assert report["copy"] == 24
+    # The input, the script copy and its rewrite per job, a harness per xyz,
+    # the manifest
+    assert report["writes"] == 24 * 3 + 3 + 1
+    assert report["bytes"] > 0
+    assert report["stages"]["writeinp"] < report["seconds"]
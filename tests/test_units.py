@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from wailord import units
+from wailord.io import orca
+
+
+@pytest.mark.parametrize(
+    "helper, target",
+    [
+        (units.hartree_to_kcal_mol, "kcal_mol"),
+        (units.hartree_to_kj_mol, "kJ / avogadro_number"),
+        (units.hartree_to_ev, "eV"),
+    ],
+)
+def test_energy_helpers_match_pint(helper, target):
+    energies = np.linspace(-2.0, 2.0, 11).reshape(-1, 1)
+    want = orca.Q_(energies, "hartree").m_as(target)
+    got = helper(energies)
+    assert got.shape == energies.shape
+    np.testing.assert_allclose(got, want, rtol=1e-12)
+
+
+def test_wavenumbers_and_round_trips():
+    np.testing.assert_allclose(
+        units.wavenumber_to_hz([1.0, 2.0]), [2.99792458e10, 5.99584916e10]
+    )
+    np.testing.assert_allclose(
+        units.factor("kcal/mol", "hartree") * 627.509474, 1.0, rtol=1e-8
+    )
+    assert units.unit_name("cm-1") == units.unit_name("cm_1") == "reciprocal_centimeter"
+
+
+def test_magnitudes_of_any_input():
+    freq = pd.Series([100.0, 200.0]).astype("pint[cm_1]")
+    np.testing.assert_allclose(units.magnitude(freq, "1/m"), [1e4, 2e4])
+    np.testing.assert_allclose(
+        units.magnitude(orca.Q_(1.0, "hartree"), "eV"), 27.211386, rtol=1e-7
+    )
+    np.testing.assert_array_equal(units.magnitude([1.0, 2.0], "eV"), [1.0, 2.0])
+
+
+def test_tag_strip_attach():
+    frame = pd.DataFrame({"Mode": [6, 7], "freq": [1000.0, 2000.0]})
+    light = units.tag_units(frame.copy(), {"freq": "cm_1"}, quantities=False)
+    assert light["freq"].dtype == np.float64
+    assert light.attrs["units"] == {"freq": "reciprocal_centimeter"}
+    np.testing.assert_allclose(units.column(light, "freq", "1/m"), [1e5, 2e5])
+    heavy = units.tag_units(frame.copy(), {"freq": "cm_1"})
+    pd.testing.assert_frame_equal(units.attach_units(light), heavy)
+    stripped = units.strip_units(heavy)
+    pd.testing.assert_frame_equal(stripped, light)
+    assert stripped.attrs == light.attrs
+    np.testing.assert_allclose(units.column(heavy, "freq", "1/m"), [1e5, 2e5])
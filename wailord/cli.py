@@ -1,22 +1,85 @@
 """Console script for wailord."""
 import sys
+from pathlib import Path
+
 import click
 
 from wailord.exp import cookies
 
 
-@click.command()
+@click.group(invoke_without_command=True)
 @click.option("--conf", default=None, help="Configuration file in YAML")
 @click.option(
     "--experiment",
     default="basicExperiment",
     help="Which experiment should be generated?",
 )
-def main(conf, experiment):
+@click.pass_context
+def main(ctx, conf, experiment):
     """Console script for wailord."""
-    cookies.gen_base(experiment, absolute=False, filen=conf)
+    if ctx.invoked_subcommand is None:
+        cookies.gen_base(experiment, absolute=False, filen=conf)
     return 0
 
 
+@main.command()
+@click.argument("root", type=click.Path(exists=True, file_okay=False, path_type=Path))
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["gz", "xz", "bz2", "zst"]),
+    default="gz",
+    show_default=True,
+    help="Compression format",
+)
+@click.option("--workers", type=int, default=None, help="Parallel workers")
+@click.option(
+    "--force",
+    is_flag=True,
+    help="Also compress outputs which did not terminate normally",
+)
+def compress(root, fmt, workers, force):
+    """Compresses the finished outputs of an experiment in place.
+
+    Each output is replaced only once its compressed copy decompresses to the
+    same bytes and parses the same.
+    """
+    from wailord.io.compress import compress_experiment
+
+    results = compress_experiment(root, fmt=fmt, force=force, workers=workers)
+    size = packed = 0
+    for res in results:
+        if res.status == "compressed":
+            size += res.size
+            packed += res.packed
+        else:
+            click.echo(f"{res.status}: {res.path} ({res.reason})")
+    done = sum(res.status == "compressed" for res in results)
+    click.echo(f"Compressed {done} of {len(results)} outputs, {size} -> {packed} bytes")
+    if any(res.status == "failed" for res in results):
+        sys.exit(1)
+
+
+@main.command()
+@click.argument("root", type=click.Path(exists=True, file_okay=False, path_type=Path))
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Archive to write, defaults to ROOT.wailord",
+)
+def archive(root, output):
+    """Packs an experiment tree into a single indexed archive.
+
+    The tree is left in place; `orcaExp` reads the archive directly.
+    """
+    from wailord.io.archive import Archive, pack_experiment
+
+    path = pack_experiment(root, output)
+    with Archive(path) as arch:
+        njobs = len(arch.jobdirs())
+        click.echo(f"Packed {len(arch)} files of {njobs} jobs into {path}")
+
+
 if __name__ == "__main__":
     sys.exit(main())  # pragma: no cover
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""Vectorised internal coordinates for stacked geometries.
+
+Every function takes coordinates shaped ``(..., n_atoms, 3)``: a single frame,
+a trajectory ``(n_steps, n_atoms, 3)`` or a whole experiment
+``(n_runs, n_steps, n_atoms, 3)``. Index tuples select the atoms, and results
+keep the leading axes, so one call covers every frame of every run.
+
+Coordinates may be plain arrays or pint quantities; lengths keep the input
+units, angles are plain floats (degrees unless ``degrees=False``). Ragged sets
+of frames (different atom counts) can be stacked with `pad_frames`.
+
+Example:
+    Bond angles of every step of an optimisation::
+
+        from wailord import geometry
+        from wailord.io.orca import read_trajectory
+
+        traj = read_trajectory(Path("orca.out"))
+        hoh = geometry.angles(traj.coords, [(0, 1, 2)])  # (n_steps, 1)
+"""
+
+import numpy as np
+
+
+def _split_units(coords):
+    """Magnitudes as float64 and the units (or None) of *coords*"""
+    units = getattr(coords, "units", None)
+    mag = getattr(coords, "magnitude", coords)
+    return np.asarray(mag, dtype=np.float64), units
+
+
+def _with_units(values, units):
+    return values if units is None else values * units
+
+
+def _columns(coords, indices, width):
+    """The ``width`` atoms of each index tuple, as separate arrays"""
+    indices = np.asarray(indices, dtype=np.intp).reshape(-1, width)
+    return [coords[..., indices[:, col], :] for col in range(width)]
+
+
+def _norm(vec):
+    return np.sqrt(np.einsum("...i,...i->...", vec, vec))
+
+
+def pad_frames(frames):
+    """Stacks frames with different atom counts, padding with NaN
+
+    Args:
+        frames (list): ``(n_atoms, 3)`` arrays
+
+    Returns:
+        np.ndarray: ``(n_frames, max_atoms, 3)``
+    """
+    frames = [_split_units(frame)[0] for frame in frames]
+    natoms = max((len(frame) for frame in frames), default=0)
+    out = np.full((len(frames), natoms, 3), np.nan)
+    for num, frame in enumerate(frames):
+        out[num, : len(frame)] = frame
+    return out
+
+
+def distances(coords, pairs):
+    """Bond lengths
+
+    Args:
+        coords: ``(..., n_atoms, 3)`` coordinates
+        pairs: ``(m, 2)`` atom indices
+
+    Returns:
+        ``(..., m)`` lengths, in the units of *coords*
+    """
+    coords, units = _split_units(coords)
+    first, second = _columns(coords, pairs, 2)
+    return _with_units(_norm(second - first), units)
+
+
+def angles(coords, triples, degrees=True):
+    """Plane angles, the first index of each triple being the vertex
+
+    Args:
+        coords: ``(..., n_atoms, 3)`` coordinates
+        triples: ``(m, 3)`` atom indices
+        degrees (bool, optional): Degrees rather than radians. Defaults to
+            True.
+
+    Returns:
+        np.ndarray: ``(..., m)`` angles, NaN where a bond has zero length
+    """
+    coords, _ = _split_units(coords)
+    vertex, first, second = _columns(coords, triples, 3)
+    v1 = first - vertex
+    v2 = second - vertex
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cos = np.einsum("...i,...i->...", v1, v2) / (_norm(v1) * _norm(v2))
+    ang = np.arccos(np.clip(cos, -1.0, 1.0))
+    return np.degrees(ang) if degrees else ang
+
+
+def dihedrals(coords, quads, degrees=True):
+    """Signed torsion angles about the bond between the middle two atoms
+
+    Args:
+        coords: ``(..., n_atoms, 3)`` coordinates
+        quads: ``(m, 4)`` atom indices
+        degrees (bool, optional): Degrees rather than radians. Defaults to
+            True.
+
+    Returns:
+        np.ndarray: ``(..., m)`` angles in ``(-180, 180]``
+    """
+    coords, _ = _split_units(coords)
+    p0, p1, p2, p3 = _columns(coords, quads, 4)
+    b0 = p0 - p1
+    b1 = p2 - p1
+    b2 = p3 - p2
+    with np.errstate(invalid="ignore", divide="ignore"):
+        b1 = b1 / _norm(b1)[..., None]
+    v = b0 - np.einsum("...i,...i->...", b0, b1)[..., None] * b1
+    w = b2 - np.einsum("...i,...i->...", b2, b1)[..., None] * b1
+    x = np.einsum("...i,...i->...", v, w)
+    y = np.einsum("...i,...i->...", np.cross(b1, v), w)
+    ang = np.arctan2(y, x)
+    return np.degrees(ang) if degrees else ang
+
+
+def distance_matrix(coords):
+    """All interatomic distances
+
+    Args:
+        coords: ``(..., n_atoms, 3)`` coordinates
+
+    Returns:
+        ``(..., n_atoms, n_atoms)`` distances, in the units of *coords*
+    """
+    coords, units = _split_units(coords)
+    diff = coords[..., :, None, :] - coords[..., None, :, :]
+    return _with_units(_norm(diff), units)
+
+
+def neighbour_list(coords, cutoff):
+    """Atom pairs closer than a cutoff
+
+    Args:
+        coords: ``(..., n_atoms, 3)`` coordinates
+        cutoff (float): Distance, in the units of *coords* (or a quantity)
+
+    Returns:
+        tuple: Index arrays as from ``np.nonzero`` (leading axes, then the
+        atoms ``i < j``) and the matching distances
+    """
+    coords, units = _split_units(coords)
+    if hasattr(cutoff, "units"):
+        cutoff = cutoff.m_as(units) if units is not None else cutoff.magnitude
+    dmat = distance_matrix(coords)
+    natoms = dmat.shape[-1]
+    upper = np.triu(np.ones((natoms, natoms), dtype=bool), k=1)
+    hits = np.nonzero((dmat < cutoff) & upper)
+    return hits, _with_units(dmat[hits], units)
@@ -10,4 +10,16 @@ Role split (rgpkgs suite):
   assembly (``orca.orcaExp``), HTST rates, SLURM-oriented out-file walks, and
   thin XYZ helpers for embedding coordinates in generated inputs.
 """
-from . import inp, orca, xyz
+from . import (
+    archive,
+    arrow,
+    backend,
+    cache,
+    compress,
+    discover,
+    inp,
+    orca,
+    profile,
+    store,
+    xyz,
+)
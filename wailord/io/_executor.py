@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""Pluggable executors for experiment-wide extraction.
+
+Work is split into chunks of consecutive items which are submitted as single
+tasks, so inter-process traffic is one pickle per chunk rather than one per
+output. Results always come back in input order, whatever the executor.
+
+Executors:
+    * ``"process"``: a process pool, for CPU-bound parsing (the default)
+    * ``"thread"``: a thread pool, for I/O-bound shared filesystems
+    * ``"serial"``: inline in the calling process, for debugging
+    * any :obj:`concurrent.futures.Executor` instance, used as is
+"""
+
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+EXECUTORS = ("process", "thread", "serial")
+
+
+def resolve_workers(workers):
+    """Number of workers; `None` means 1 and negative values count back from
+    the number of CPUs (``-1`` is all of them)"""
+    if workers is None:
+        return 1
+    if workers < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + workers)
+    return max(1, workers)
+
+
+def chunked(items, chunksize):
+    """Consecutive slices of *items* with at most *chunksize* entries"""
+    return [items[i : i + chunksize] for i in range(0, len(items), chunksize)]
+
+
+def default_chunksize(nitems, workers):
+    """About four chunks per worker, so stragglers can be balanced"""
+    return max(1, -(-nitems // (4 * workers)))
+
+
+def run_chunks(fn, items, args=(), workers=None, executor="process", chunksize=None):
+    """Maps ``fn(chunk, *args)`` over chunks of *items*
+
+    Args:
+        fn (callable): Takes a list of items (plus *args*) and returns a list
+            with one result per item. Must be picklable for process pools.
+        items (list): Work items
+        args (tuple, optional): Extra positional arguments for *fn*
+        workers (int, optional): See `resolve_workers`. Defaults to serial.
+        executor (optional): One of `EXECUTORS` or an `Executor` instance.
+            Defaults to ``"process"``, used only when more than one worker
+            is requested.
+        chunksize (int, optional): Items per task. Defaults to
+            `default_chunksize`
+
+    Returns:
+        list: Results of *fn* for every item, in the order of *items*
+    """
+    items = list(items)
+    if not items:
+        return []
+    nworkers = resolve_workers(workers)
+    if isinstance(executor, Executor):
+        pool, owned = executor, False
+    elif executor not in EXECUTORS:
+        raise ValueError(f"executor must be one of {EXECUTORS}, got {executor}")
+    elif executor == "serial" or nworkers == 1:
+        return list(fn(items, *args))
+    elif executor == "thread":
+        pool, owned = ThreadPoolExecutor(max_workers=nworkers), True
+    else:
+        pool, owned = ProcessPoolExecutor(max_workers=nworkers), True
+    chunksize = chunksize or default_chunksize(len(items), nworkers)
+    try:
+        futures = [pool.submit(fn, chunk, *args) for chunk in chunked(items, chunksize)]
+        results = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+    finally:
+        if owned:
+            pool.shutdown(cancel_futures=True)
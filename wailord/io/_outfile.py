@@ -0,0 +1,519 @@
+# -*- coding: utf-8 -*-
+"""Shared buffers and section indices for ORCA output files.
+
+An output is read once into an :class:`OutBuffer` (memory mapped above
+``MMAP_THRESHOLD`` bytes) and scanned once by :class:`SectionIndex`, which
+records the byte offset of every section marker. Extractors then seek straight
+to their section instead of re-opening and re-splitting the whole file.
+
+Markers are regular expressions which must start with a literal anchor (e.g.
+``"IR SPECTRUM"``). All anchors are found in a single pass over the buffer and
+each hit is then verified against the full marker expression; this is much
+cheaper than one alternation over every marker expression.
+
+Tables under a marker are decoded by :func:`decode_table` straight from the
+bytes of their rows into typed NumPy columns, without a Python object per row.
+
+Outputs compressed with gzip, xz, bzip2 or zstandard (``orca.out.gz`` etc.,
+see `COMPRESSED`) are decompressed on the fly by every reader here; nothing
+is extracted to disk. zstandard needs the optional ``zstandard`` package.
+Members of experiment archives (see `wailord.io.archive`) are read in place
+the same way, compressed ones by decompressing straight from their blob handle.
+"""
+
+import bisect
+import bz2
+import gzip
+import io
+import lzma
+import mmap
+import os
+import re
+from pathlib import Path
+
+import numpy as np
+
+from wailord.io.archive import archive_member, member_stat, open_member
+
+MMAP_THRESHOLD = 1 << 20  #: Files at least this large (bytes) are memory mapped
+
+_REGEX_META = set(".^$*+?{}[]|()")
+
+#: Suffixes of compressed outputs
+COMPRESSED = (".gz", ".xz", ".bz2", ".zst")
+
+
+def compression(path):
+    """Compression suffix of a path (e.g. ``".gz"``), or None if plain"""
+    suffix = Path(path).suffix
+    return suffix if suffix in COMPRESSED else None
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("zstandard is needed for .zst outputs") from None
+    return zstandard
+
+
+def open_raw(path):
+    """Seekable binary stream of the stored bytes of a file or archive
+    member, without decompressing"""
+    member = archive_member(path)
+    if member is None:
+        return open(path, "rb")
+    return open_member(*member)
+
+
+def output_stat(path):
+    """``os.stat`` of a file, or the recorded size and modification time
+    (``st_size``, ``st_mtime_ns``) of an archive member"""
+    member = archive_member(path)
+    if member is None:
+        return os.stat(path)
+    return member_stat(*member)
+
+
+def on_disk(path):
+    """Whether a path is a plain output file, which other programs can read"""
+    return compression(path) is None and archive_member(path) is None
+
+
+def open_output(path, mode="rb"):
+    """Binary stream of an output, decompressed (or compressed, when
+    writing) on the fly according to its suffix
+
+    Args:
+        path (:obj:`Path`): The output, possibly an archive member
+        mode (str, optional): ``"rb"`` or ``"wb"``. Defaults to ``"rb"``.
+
+    Returns:
+        A binary file object
+    """
+    kind = compression(path)
+    if archive_member(path) is not None:
+        if mode != "rb":
+            raise (ValueError(f"Archive members are read only: {path}"))
+        if kind is None:
+            return open_raw(path)
+        blob = open_raw(path)
+        return io.BufferedReader(_Decompressed(_decompress(blob, kind), blob))
+    if kind is None:
+        return open(path, mode)
+    return _decompress(path, kind, mode)
+
+
+def _decompress(src, kind, mode="rb"):
+    """Decompressing (or compressing) stream over a path or binary handle"""
+    if kind == ".gz":
+        return gzip.open(src, mode)
+    if kind == ".xz":
+        return lzma.open(src, mode)
+    if kind == ".bz2":
+        return bz2.open(src, mode)
+    return _zstandard().open(src, mode)
+
+
+class _Decompressed(io.RawIOBase):
+    """Decompressed stream of an archive member, which also closes the blob
+    handle it reads from
+
+    Args:
+        stream: Decompressing stream over *blob*
+        blob: Blob handle of the member (see `wailord.io.archive.open_member`)
+    """
+
+    def __init__(self, stream, blob):
+        self._stream = stream
+        self._blob = blob
+
+    def readable(self):
+        return True
+
+    def readinto(self, buf):
+        return self._stream.readinto(buf)
+
+    def close(self):
+        if not self.closed:
+            try:
+                self._stream.close()
+            finally:
+                self._blob.close()
+        super().close()
+
+
+def _literal_prefix(pattern):
+    """Leading literal text of a regular expression (escapes resolved)."""
+    prefix = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            nxt = pattern[i + 1 : i + 2]
+            if not nxt or nxt.isalnum():
+                break
+            prefix.append(nxt)
+            i += 2
+            continue
+        if char in _REGEX_META:
+            break
+        prefix.append(char)
+        i += 1
+    # A trailing quantifier applies to the last literal character
+    if i < len(pattern) and pattern[i] in "*?{" and prefix:
+        prefix.pop()
+    return "".join(prefix)
+
+
+class OutBuffer:
+    """Read-only byte view of one output file.
+
+    Small files are read into memory, larger ones are memory mapped so that
+    seeking into a single section does not pull the whole file in. Compressed
+    outputs and archive members are read into memory.
+
+    Args:
+        path (:obj:`Path`): The output file
+        mmap_threshold (int, optional): Size in bytes from which the file is
+            memory mapped. Defaults to `MMAP_THRESHOLD`
+    """
+
+    def __init__(self, path, mmap_threshold=MMAP_THRESHOLD):
+        self.path = Path(path)
+        self._mmap = None
+        if not on_disk(self.path):
+            with open_output(self.path) as fh:
+                self.data = fh.read()
+            return
+        with open(self.path, "rb") as fh:
+            size = os.fstat(fh.fileno()).st_size
+            if size and size >= mmap_threshold:
+                self._mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+                self.data = self._mmap
+            else:
+                self.data = fh.read()
+
+    def __repr__(self):
+        kind = "mmap" if self._mmap is not None else "bytes"
+        return f"OutBuffer({self.path}, {len(self)} bytes, {kind})"
+
+    def __len__(self):
+        return len(self.data)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Releases the memory map, if any"""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+            self.data = b""
+
+    def text(self, start=0, end=None):
+        """Decoded text of the byte range ``[start, end)``"""
+        return self.data[start:end].decode("utf-8", errors="replace")
+
+    def line_start(self, pos):
+        """Offset of the first byte of the line containing *pos*"""
+        return self.data.rfind(b"\n", 0, pos) + 1
+
+    def line(self, pos):
+        """The decoded line (without newline) containing *pos*"""
+        start = self.line_start(pos)
+        stop = self.data.find(b"\n", start)
+        if stop == -1:
+            stop = len(self.data)
+        return self.text(start, stop)
+
+    def iter_lines(self, pos, end=None):
+        """Yields decoded lines, newline included, starting from the line
+        which contains *pos* and stopping at *end* (defaults to EOF)"""
+        data = self.data
+        start = self.line_start(pos)
+        end = len(data) if end is None else end
+        while start < end:
+            stop = data.find(b"\n", start, end)
+            stop = end if stop == -1 else stop + 1
+            yield data[start:stop].decode("utf-8", errors="replace")
+            start = stop
+
+
+class SectionIndex:
+    """Byte offsets of every section marker in an :class:`OutBuffer`.
+
+    Args:
+        buf (:obj:`OutBuffer`): The buffer to index
+        markers (dict): Section name to regular expression (``str`` or
+            compiled). Each expression must begin with a literal anchor.
+
+    Attributes:
+        offsets (dict): Section name to an ordered list of marker offsets
+    """
+
+    def __init__(self, buf, markers):
+        self.buf = buf
+        self.offsets = {key: [] for key in markers}
+        anchors = {}
+        for key, marker in markers.items():
+            pattern = getattr(marker, "pattern", marker)
+            anchor = _literal_prefix(pattern).encode()
+            if not anchor:
+                raise ValueError(f"Marker {key!r} does not start with a literal")
+            anchors.setdefault(anchor, []).append((key, re.compile(pattern.encode())))
+        ordered = sorted(anchors, key=len, reverse=True)
+        scan = re.compile(b"|".join(re.escape(anchor) for anchor in ordered))
+        data = buf.data
+        self._bounds = []
+        for hit in scan.finditer(data):
+            pos = hit.start()
+            for anchor in ordered:
+                if data[pos : pos + len(anchor)] != anchor:
+                    continue
+                for key, verify in anchors[anchor]:
+                    if verify.match(data, pos):
+                        self.offsets[key].append(pos)
+                        self._bounds.append(pos)
+        self._bounds.sort()
+
+    def __repr__(self):
+        found = {key: len(val) for key, val in self.offsets.items() if val}
+        return f"SectionIndex({self.buf.path}, {found})"
+
+    def __contains__(self, key):
+        return bool(self.offsets.get(key))
+
+    def section(self, key, occurrence=0):
+        """Byte range of one occurrence of a section
+
+        The range starts at the line holding the marker and stops at the next
+        indexed marker of any kind (or EOF).
+
+        Args:
+            key (str): Section name
+            occurrence (int, optional): Which occurrence, negative values count
+                from the end. Defaults to the first one.
+
+        Returns:
+            tuple: ``(start, end)`` byte offsets
+        """
+        pos = self.offsets[key][occurrence]
+        nxt = bisect.bisect_right(self._bounds, pos)
+        end = self._bounds[nxt] if nxt < len(self._bounds) else len(self.buf)
+        return self.buf.line_start(pos), end
+
+    def lines(self, key, skip=0):
+        """Yields, per marker occurrence, the marker line and an iterator over
+        the lines following it
+
+        Args:
+            key (str): Section name
+            skip (int, optional): Lines after the marker line to skip before
+                the returned iterator starts. Defaults to 0.
+        """
+        for pos in self.offsets[key]:
+            it = self.buf.iter_lines(pos)
+            header = next(it)
+            for _ in range(skip):
+                next(it, None)
+            yield header, it
+
+
+BLANK_LINE = re.compile(rb"^[ \t\r]*$", re.M)  #: Default end of a table body
+
+
+def table_bounds(buf, pos, skip=0, stop=BLANK_LINE):
+    """Byte range of the rows of a table under a section marker
+
+    Args:
+        buf (:obj:`OutBuffer`): The buffer
+        pos (int): Offset of the marker, e.g. from :class:`SectionIndex`
+        skip (int, optional): Lines between the marker line and the first row
+            (rules, column headers). Defaults to 0.
+        stop: Compiled ``bytes`` expression matching (from its start) the
+            first line after the table. Defaults to `BLANK_LINE`
+
+    Returns:
+        tuple: ``(start, end)`` byte offsets, empty if the file ends first
+    """
+    data = buf.data
+    start = buf.line_start(pos)
+    for _ in range(skip + 1):
+        newline = data.find(b"\n", start)
+        if newline == -1:
+            return len(data), len(data)
+        start = newline + 1
+    hit = stop.search(data, start)
+    return start, hit.start() if hit else len(data)
+
+
+def _column(tokens, dtype):
+    if dtype is bool:
+        return tokens != b""
+    if dtype is str:
+        return tokens.astype(str)
+    return tokens.astype(dtype)
+
+
+def _check_rows(block, size, width):
+    """Raises ValueError unless *size* tokens make one row of *width* per
+    non-blank line of *block*"""
+    rows = block.count(b"\n") + 1 - len(BLANK_LINE.findall(block))
+    if size != rows * width:
+        raise ValueError(
+            f"{size} values do not fill {rows} rows of {width} columns"
+        )
+
+
+def decode_table(data, start, end, columns, delete=b"", pattern=None):
+    """Typed columns of a whitespace separated text table in one call
+
+    Rows are not split one by one: the whole byte range is tokenised at once
+    and reshaped to ``(n_rows, n_columns)``, then every column is converted
+    with a single ``astype``. Purely numeric tables are converted to floats
+    in one call, which fails on any malformed token (e.g. the ``***`` ORCA
+    prints for overflowing fields).
+
+    Args:
+        data (bytes): Buffer holding the table, e.g. :attr:`OutBuffer.data`
+        start (int): Offset of the first row
+        end (int): Offset just past the last row
+        columns (dict): Column name to dtype, one entry per token of a row (or
+            per group of *pattern*). ``str`` gives arrays of text,
+            ``bool`` whether an optional group matched, None drops the token.
+        delete (bytes, optional): Characters removed before tokenising, e.g.
+            ``b":()"``. Defaults to none.
+        pattern (optional): Compiled ``bytes`` expression with one group per
+            column, for tables whose rows do not all have the same number of
+            tokens. Defaults to whitespace tokens.
+
+    Returns:
+        dict: Column name to NumPy array
+
+    Raises:
+        ValueError: If a token is not a number (numeric tables) or the tokens
+            do not fill every non-blank line as one row
+    """
+    block = data[start:end]
+    if delete:
+        block = block.translate(None, delete)
+    width = len(columns)
+    numeric = all(dtype not in (str, bool) for dtype in columns.values())
+    if pattern is None and numeric:
+        values = np.array(block.split(), dtype=np.float64)
+        _check_rows(block, values.size, width)
+        values = values.reshape(-1, width)
+        return {
+            name: values[:, num].astype(dtype)
+            for num, (name, dtype) in enumerate(columns.items())
+            if dtype is not None
+        }
+    if pattern is None:
+        tokens = np.array(block.split(), dtype=bytes)
+        _check_rows(block, tokens.size, width)
+    else:
+        tokens = np.array(pattern.findall(block), dtype=bytes)
+        if tokens.size % width:
+            raise ValueError(
+                f"{tokens.size} tokens do not fill rows of {width} columns"
+            )
+    tokens = tokens.reshape(-1, width)
+    return {
+        name: _column(tokens[:, num], dtype)
+        for num, (name, dtype) in enumerate(columns.items())
+        if dtype is not None
+    }
+
+
+TAIL_BLOCK = 1 << 16  #: Block size (bytes) of the reverse reader
+
+
+def last_line(path, marker, blocksize=TAIL_BLOCK, limit=None, stats=None):
+    """Last line of a file which matches a marker, read backwards from EOF
+
+    The file is read in blocks of *blocksize* bytes from the end, so the cost
+    depends on the distance of the match from EOF rather than on the file
+    size. Lines spanning block boundaries are reassembled. Compressed outputs
+    cannot be read backwards; they are streamed through once instead.
+
+    Args:
+        path (:obj:`Path`): The file
+        marker (str): Regular expression (``str`` or compiled) starting with a
+            literal anchor, as for :class:`SectionIndex`
+        blocksize (int, optional): Bytes read per step. Defaults to
+            `TAIL_BLOCK`
+        limit (int, optional): Give up after reading this many bytes from the
+            end. Defaults to the whole file.
+        stats (dict, optional): Its ``"bytes"`` entry is increased by the
+            number of bytes read
+
+    Returns:
+        str: The decoded line without its newline, or None if no line matches
+    """
+    pattern = getattr(marker, "pattern", marker)
+    anchor = _literal_prefix(pattern).encode()
+    if not anchor:
+        raise ValueError(f"Marker {pattern!r} does not start with a literal")
+    verify = re.compile(pattern.encode())
+    stats = {} if stats is None else stats
+    if compression(path) is not None:
+        return _last_line_stream(path, anchor, verify, 16 * blocksize, limit, stats)
+    with open_raw(path) as fh:
+        fh.seek(0, os.SEEK_END)
+        pos = fh.tell()
+        floor = 0 if limit is None else max(0, pos - limit)
+        # Bytes of the (partial) line which started in the previous block
+        carry = b""
+        while pos > floor:
+            start = max(floor, pos - blocksize)
+            fh.seek(start)
+            chunk = fh.read(pos - start) + carry
+            stats["bytes"] = stats.get("bytes", 0) + pos - start
+            # The first line is only complete once the start of file is reached
+            first = chunk.find(b"\n") + 1 if start else 0
+            hit = chunk.rfind(anchor)
+            while hit >= first:
+                lstart = chunk.rfind(b"\n", 0, hit) + 1
+                if lstart < first:
+                    break
+                lstop = chunk.find(b"\n", hit)
+                line = chunk[lstart : len(chunk) if lstop == -1 else lstop]
+                if verify.search(line):
+                    return line.decode("utf-8", errors="replace")
+                hit = chunk.rfind(anchor, 0, hit)
+            carry = chunk[:first]
+            pos = start
+    return None
+
+
+def _last_line_stream(path, anchor, verify, blocksize, limit, stats):
+    """`last_line` reading a compressed output forwards"""
+    found, found_at, offset = None, 0, 0
+    carry = b""
+    with open_output(path) as fh:
+        while True:
+            block = fh.read(blocksize)
+            stats["bytes"] = stats.get("bytes", 0) + len(block)
+            chunk = carry + block
+            # Only complete lines, unless the stream is over
+            stop = len(chunk) if not block else chunk.rfind(b"\n") + 1
+            hit = chunk.rfind(anchor, 0, stop)
+            while hit != -1:
+                lstart = chunk.rfind(b"\n", 0, hit) + 1
+                lstop = chunk.find(b"\n", hit, stop)
+                line = chunk[lstart : stop if lstop == -1 else lstop]
+                if verify.search(line):
+                    found, found_at = line, offset + lstart
+                    break
+                hit = chunk.rfind(anchor, 0, lstart)
+            carry = chunk[stop:]
+            offset += stop
+            if not block:
+                break
+    if found is None or (limit is not None and offset - found_at > limit):
+        return None
+    return found.decode("utf-8", errors="replace")
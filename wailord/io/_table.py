@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""Columnar batches for extractor results.
+
+A batch is a plain ``dict`` of NumPy columns with units recorded on the side,
+which makes it cheap to pickle, store and ship between processes compared to
+pint-pandas frames. Both ``_OrcaRun`` result shapes round-trip:
+
+* data frames (``kind == "frame"``), pint columns become float magnitudes
+  (unit-light frames already hold them, with units in ``attrs["units"]``);
+* row dictionaries such as ``_OrcaRun.final_sp_e`` (``kind == "row"``).
+
+Experiment tables are kept narrow: `narrow_batch` drops the run metadata which
+extractors broadcast into every row (recording where it was), and
+`stack_facts` stacks the batches of every run with the ``run_id`` of each row,
+so the metadata is stored once per run and joined back on demand.
+"""
+
+import numpy as np
+import pandas as pd
+import pint
+import pint_pandas
+
+
+def _encode_column(values, batch, name, units):
+    """Plain NumPy column for one series, recording units on the side"""
+    if isinstance(values.dtype, pint_pandas.PintType):
+        batch["units"][name] = str(values.dtype.units)
+        return np.asarray(values.pint.magnitude, dtype=float)
+    if name in units:
+        batch["units"][name] = units[name]
+        return np.asarray(values.to_numpy(), dtype=float)
+    arr = values.to_numpy()
+    if arr.dtype == object and len(arr) and all(
+        isinstance(val, pint.Unit) for val in arr
+    ):
+        batch["unit_objects"].append(name)
+        return np.array([str(val) for val in arr], dtype=object)
+    if not isinstance(values.dtype, np.dtype):
+        batch["dtypes"][name] = values.dtype
+    return arr
+
+
+def to_batch(result):
+    """Columnar batch of an extractor result
+
+    Args:
+        result (:obj:`pd.DataFrame` or dict): A frame or a single row
+
+    Returns:
+        dict: The batch
+    """
+    kind = "row" if isinstance(result, dict) else "frame"
+    frame = pd.DataFrame([result]) if kind == "row" else result
+    units = frame.attrs.get("units", {})
+    batch = {"kind": kind, "units": {}, "unit_objects": [], "dtypes": {}}
+    batch["columns"] = {
+        name: _encode_column(frame[name], batch, name, units)
+        for name in frame.columns
+    }
+    return batch
+
+
+def from_batch(batch, ureg=None, units=True):
+    """Inverse of `to_batch`
+
+    Args:
+        batch (dict): A batch from `to_batch`
+        ureg (:obj:`pint.UnitRegistry`, optional): Registry used to rebuild
+            unit objects. Defaults to the pint-pandas registry.
+        units (bool, optional): Rebuild pint columns and unit objects.
+            Otherwise the magnitudes stay float64 with their units in
+            ``attrs["units"]``, and unit objects are left as strings.
+            Defaults to True.
+
+    Returns:
+        :obj:`pd.DataFrame` or dict: The frame or row which was encoded
+    """
+    ureg = ureg or pint_pandas.PintType.ureg
+    data = {}
+    for name, arr in batch["columns"].items():
+        if name in batch["units"] and units:
+            data[name] = pd.Series(arr, dtype=f"pint[{batch['units'][name]}]")
+        elif name in batch["unit_objects"] and units:
+            parsed = {val: ureg.Unit(val) for val in set(arr)}
+            data[name] = pd.Series([parsed[val] for val in arr], dtype=object)
+        else:
+            data[name] = pd.Series(arr, dtype=batch["dtypes"].get(name, arr.dtype))
+    frame = pd.DataFrame(data, columns=list(batch["columns"]))
+    if not units:
+        frame.attrs["units"] = dict(batch["units"])
+    if batch["kind"] == "row":
+        return {name: frame[name].iloc[0] for name in frame.columns}
+    return frame
+
+
+def batch_nrows(batch):
+    """Number of rows held by a batch"""
+    for arr in batch["columns"].values():
+        return len(arr)
+    return 0
+
+
+def concat_batches(batches, ureg=None):
+    """Stacks batches row-wise into one frame batch
+
+    Columns are the union of all batches in order of appearance, as with
+    ``pd.concat``; missing entries are NaN (numeric) or None. Pint columns are
+    converted to the units of the first batch which carries them.
+
+    Args:
+        batches (list): Batches from `to_batch`, None entries are skipped
+        ureg (:obj:`pint.UnitRegistry`, optional): Registry for unit
+            conversion. Defaults to the pint-pandas registry.
+
+    Returns:
+        dict: A single batch of kind ``"frame"``
+    """
+    ureg = ureg or pint_pandas.PintType.ureg
+    batches = [batch for batch in batches if batch is not None]
+    out = {"kind": "frame", "units": {}, "unit_objects": [], "dtypes": {}}
+    names = {}
+    for batch in batches:
+        for name, arr in batch["columns"].items():
+            names.setdefault(name, arr.dtype)
+        for name, unit in batch["units"].items():
+            out["units"].setdefault(name, unit)
+        for name in batch["unit_objects"]:
+            if name not in out["unit_objects"]:
+                out["unit_objects"].append(name)
+        for name, dtype in batch["dtypes"].items():
+            out["dtypes"].setdefault(name, dtype)
+    columns = {}
+    for name, dtype in names.items():
+        parts = []
+        for batch in batches:
+            arr = batch["columns"].get(name)
+            if arr is None:
+                nrows = batch_nrows(batch)
+                if name in out["units"] or np.issubdtype(dtype, np.number):
+                    arr = np.full(nrows, np.nan)
+                else:
+                    arr = np.full(nrows, None, dtype=object)
+            elif batch["units"].get(name, out["units"].get(name)) != out[
+                "units"
+            ].get(name):
+                arr = ureg.Quantity(arr, batch["units"][name]).m_as(
+                    out["units"][name]
+                )
+            parts.append(arr)
+        columns[name] = np.concatenate(parts)
+    out["columns"] = columns
+    return out
+
+
+def narrow_batch(batch, names):
+    """Drops run metadata columns from a batch, in place
+
+    The positions of the dropped columns are kept under ``run_columns`` so
+    the wide layout can be rebuilt. A batch without any of them gets all of
+    *names* appended, since every experiment table carries its run.
+
+    Args:
+        batch (dict): A batch from `to_batch`
+        names (list): The run metadata columns
+
+    Returns:
+        dict: The batch
+    """
+    if "run_columns" in batch:
+        return batch
+    columns = list(batch["columns"])
+    layout = [[pos, name] for pos, name in enumerate(columns) if name in names]
+    if not layout:
+        layout = [[len(columns) + num, name] for num, name in enumerate(names)]
+    batch["columns"] = {
+        name: arr for name, arr in batch["columns"].items() if name not in names
+    }
+    for key in ("units", "dtypes"):
+        batch[key] = {
+            name: val for name, val in batch[key].items() if name not in names
+        }
+    batch["unit_objects"] = [
+        name for name in batch["unit_objects"] if name not in names
+    ]
+    batch["run_columns"] = layout
+    return batch
+
+
+def stack_facts(batches):
+    """Stacks the narrow batches of every run into one fact batch
+
+    Args:
+        batches (list): One batch from `narrow_batch` per run, None for runs
+            without results; the position in the list is the ``run_id``
+
+    Returns:
+        dict: A frame batch with ``run_id`` (the run of every row) and the
+        ``run_columns`` layout of the first batch
+    """
+    out = concat_batches(batches)
+    nrows = [0 if batch is None else batch_nrows(batch) for batch in batches]
+    out["run_id"] = np.repeat(np.arange(len(batches), dtype=np.int64), nrows)
+    out["run_columns"] = next(
+        (batch["run_columns"] for batch in batches if batch is not None), []
+    )
+    return out
@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+"""Single-file archives of finished experiment trees.
+
+A finished experiment is many small files (inputs, job scripts, outputs,
+geometries), which parallel filesystems punish on every walk and backup.
+`pack_experiment` stores a whole tree in one SQLite file (``myexp.wailord``),
+with one row per file holding its bytes as a blob, and an index of the jobs:
+their directory, output and run parameters.
+
+Files inside an archive are addressed by ordinary paths with the archive as
+their directory, e.g. ``myexp.wailord/6-31G/.../orca.out``. Every reader in
+`wailord.io` opens such member paths directly: the member is looked up by its
+primary key and read (or seeked into, for `wailord.io._outfile.last_line`)
+through an incremental blob handle, so nothing is extracted. `orcaExp` takes
+the archive in place of the experiment folder, and with ``manifest=True``
+lists the indexed jobs instead of the member names.
+
+Members keep their bytes as they were, so outputs compressed beforehand (see
+`wailord.io.compress`) stay compressed inside the archive.
+
+Example:
+    Pack a finished experiment, then work from the archive::
+
+        from wailord.io.archive import Archive, pack_experiment
+        from wailord.io.orca import orcaExp
+
+        arch = pack_experiment(Path("myexp"))  # myexp.wailord
+        expt = orcaExp(arch, manifest=True)
+        with Archive(arch) as store:
+            store.jobs()
+"""
+
+import errno
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from pathlib import Path
+
+import pandas as pd
+
+ARCHIVE_SUFFIX = ".wailord"  #: Suffix of experiment archives
+FORMAT_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE members (
+    name TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    mode INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE TABLE jobs (
+    run_id INTEGER PRIMARY KEY,
+    jobdir TEXT NOT NULL,
+    output TEXT NOT NULL,
+    params TEXT NOT NULL
+);
+CREATE INDEX jobs_jobdir ON jobs (jobdir);
+"""
+
+_COPY_BLOCK = 1 << 20
+
+#: The ``os.stat`` fields of a member used by the readers
+MemberStat = namedtuple("MemberStat", "st_size st_mtime_ns")
+
+_READERS = threading.local()
+
+
+def is_archive(path):
+    """Whether a path is an experiment archive"""
+    return str(path).endswith(ARCHIVE_SUFFIX) and os.path.isfile(path)
+
+
+def archive_member(path):
+    """Archive and member name of a path inside an archive
+
+    Args:
+        path (:obj:`Path`): E.g. ``myexp.wailord/HF/orca.out``
+
+    Returns:
+        tuple: ``(archive, name)``, or None for paths outside archives
+    """
+    text = os.fspath(path)
+    if ARCHIVE_SUFFIX + os.sep not in text:
+        return None
+    parts = Path(text).parts
+    for num, part in enumerate(parts[:-1]):
+        if part.endswith(ARCHIVE_SUFFIX):
+            archive = Path(*parts[: num + 1])
+            if os.path.isfile(archive):
+                return archive, "/".join(parts[num + 1 :])
+    return None
+
+
+def _connect(archive):
+    uri = f"{Path(archive).resolve().as_uri()}?mode=ro"
+    return sqlite3.connect(uri, uri=True, check_same_thread=False)
+
+
+def _reader(archive):
+    """Read-only connection to an archive, one per process and thread,
+    reopened when the archive is replaced"""
+    stat = os.stat(archive)
+    version = (stat.st_ino, stat.st_mtime_ns)
+    conns = getattr(_READERS, "conns", None)
+    if conns is None:
+        conns = _READERS.conns = {}
+    # Connections must not cross a fork
+    key = (os.getpid(), os.fspath(archive))
+    cached = conns.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    if cached is not None:
+        cached[1].close()
+    conn = _connect(archive)
+    conns[key] = (version, conn)
+    return conn
+
+
+def _member_row(archive, name, columns):
+    row = (
+        _reader(archive)
+        .execute(f"SELECT {columns} FROM members WHERE name = ?", (name,))
+        .fetchone()
+    )
+    if row is None:
+        raise (
+            FileNotFoundError(
+                errno.ENOENT, "No such archive member", f"{archive}/{name}"
+            )
+        )
+    return row
+
+
+def open_member(archive, name):
+    """Seekable, read-only binary handle on the bytes of a member"""
+    (rowid,) = _member_row(archive, name, "rowid")
+    return _reader(archive).blobopen("members", "data", rowid, readonly=True)
+
+
+def member_stat(archive, name):
+    """:obj:`MemberStat` of a member, as recorded when it was packed"""
+    return MemberStat(*_member_row(archive, name, "size, mtime_ns"))
+
+
+class Archive:
+    """Reader of an experiment archive
+
+    Args:
+        path (:obj:`Path`): The archive
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._conn = _connect(self.path)
+        meta = dict(self._conn.execute("SELECT key, value FROM meta"))
+        if int(meta.get("version", 0)) > FORMAT_VERSION:
+            raise (
+                ValueError(
+                    f"{self.path} has archive format {meta['version']}, "
+                    f"this wailord reads up to {FORMAT_VERSION}"
+                )
+            )
+        self.meta = meta
+
+    def __repr__(self):
+        return f"Archive({self.path}, {len(self)} members)"
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM members").fetchone()[0]
+
+    def __contains__(self, name):
+        row = self._conn.execute(
+            "SELECT 1 FROM members WHERE name = ?", (name,)
+        ).fetchone()
+        return row is not None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Closes the database"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def names(self):
+        """Member names (``/`` separated, relative to the experiment root),
+        sorted"""
+        return [
+            name
+            for (name,) in self._conn.execute("SELECT name FROM members ORDER BY name")
+        ]
+
+    def read(self, name):
+        """Bytes of a member"""
+        row = self._conn.execute(
+            "SELECT data FROM members WHERE name = ?", (name,)
+        ).fetchone()
+        if row is None:
+            raise (KeyError(f"{name} is not in {self.path}"))
+        return row[0]
+
+    def jobs(self):
+        """Job index: ``run_id``, ``jobdir``, ``output`` and the run
+        parameters of every output found when packing"""
+        rows = self._conn.execute(
+            "SELECT run_id, jobdir, output, params FROM jobs ORDER BY run_id"
+        ).fetchall()
+        return pd.DataFrame(
+            [
+                {"run_id": run_id, "jobdir": jobdir, "output": output}
+                | json.loads(params)
+                for run_id, jobdir, output, params in rows
+            ],
+            columns=None if rows else ["run_id", "jobdir", "output"],
+        )
+
+    def jobdirs(self):
+        """Indexed job directories, as listed by a manifest (see
+        `wailord.io.discover.read_manifest`)"""
+        rows = self._conn.execute("SELECT jobdir FROM jobs ORDER BY run_id")
+        return list(dict.fromkeys(jobdir for (jobdir,) in rows))
+
+    def extract(self, dest, names=None):
+        """Writes members back to files, with their modes and times
+
+        Args:
+            dest (:obj:`Path`): Directory to extract into
+            names (list, optional): Members to extract. Defaults to all.
+
+        Returns:
+            list: The paths written
+        """
+        dest = Path(dest)
+        written = []
+        for name in self.names() if names is None else names:
+            (rowid, mtime_ns, mode) = self._conn.execute(
+                "SELECT rowid, mtime_ns, mode FROM members WHERE name = ?", (name,)
+            ).fetchone()
+            target = dest.joinpath(*name.split("/"))
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with (
+                self._conn.blobopen("members", "data", rowid, readonly=True) as blob,
+                open(target, "wb") as out,
+            ):
+                for block in iter(lambda: blob.read(_COPY_BLOCK), b""):
+                    out.write(block)
+            os.chmod(target, mode & 0o7777)
+            os.utime(target, ns=(mtime_ns, mtime_ns))
+            written.append(target)
+        return written
+
+
+def _walk(root, skip):
+    """Files under *root*, depth first in sorted order"""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            path = Path(dirpath) / name
+            if path not in skip:
+                yield path
+
+
+def _add_member(conn, root, path):
+    """Streams one file into the members table"""
+    stat = os.stat(path)
+    cur = conn.execute(
+        "INSERT INTO members VALUES (?, ?, ?, ?, zeroblob(?))",
+        (
+            path.relative_to(root).as_posix(),
+            stat.st_size,
+            stat.st_mtime_ns,
+            stat.st_mode,
+            stat.st_size,
+        ),
+    )
+    with (
+        open(path, "rb") as src,
+        conn.blobopen("members", "data", cur.lastrowid) as blob,
+    ):
+        for block in iter(lambda: src.read(_COPY_BLOCK), b""):
+            blob.write(block)
+
+
+def pack_experiment(root, path=None, discovery=None):
+    """Packs an experiment tree into a single archive
+
+    Every file under *root* becomes a member; the outputs found by
+    *discovery* are indexed as jobs with their run parameters (see
+    `wailord.io.orca.getRunInfo`). The archive is written next to its final
+    name and only moved there once complete. The tree is left untouched.
+
+    Args:
+        root (:obj:`Path`): Experiment root
+        path (:obj:`Path`, optional): The archive. Defaults to *root* with
+            `ARCHIVE_SUFFIX` appended.
+        discovery (:obj:`Discovery`, optional): Rules for finding outputs.
+            Defaults to the `orcaExp` ones.
+
+    Returns:
+        :obj:`Path`: The archive written
+    """
+    from wailord.io.discover import Discovery
+    from wailord.io.orca import getRunInfo
+
+    root = Path(root).resolve()
+    if not root.is_dir():
+        raise (ValueError(f"{root} is not an experiment folder"))
+    if path is None:
+        path = root.with_name(root.name + ARCHIVE_SUFFIX)
+    path = Path(path).resolve()
+    part = path.with_name(f"{path.name}.part")
+    part.unlink(missing_ok=True)
+    conn = sqlite3.connect(part)
+    try:
+        # A crash leaves only the partial file, which is never read
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.executescript(_SCHEMA)
+        for member in _walk(root, {path, part}):
+            _add_member(conn, root, member)
+        discovery = discovery or Discovery()
+        for run_id, ofile in enumerate(discovery.iter_outputs(root)):
+            try:
+                params = getRunInfo(ofile.parent)
+            except IndexError:
+                params = {}
+            rel = ofile.relative_to(root)
+            conn.execute(
+                "INSERT INTO jobs VALUES (?, ?, ?, ?)",
+                (run_id, rel.parent.as_posix(), rel.as_posix(), json.dumps(params)),
+            )
+        conn.executemany(
+            "INSERT INTO meta VALUES (?, ?)",
+            [
+                ("version", str(FORMAT_VERSION)),
+                ("root", root.name),
+                ("created", str(time.time())),
+            ],
+        )
+        conn.commit()
+    except BaseException:
+        conn.close()
+        part.unlink(missing_ok=True)
+        raise
+    conn.close()
+    os.replace(part, path)
+    return path
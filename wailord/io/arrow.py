@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""Arrow and Parquet persistence for experiment tables.
+
+Pint columns (and the float64 columns of unit-light tables, which carry their
+units in ``attrs["units"]``) are stored as plain ``float64`` magnitudes; their
+units are recorded in the field metadata (``unit``) and, together with the column order
+and the category order of ordered categoricals, under the ``wailord`` key of
+the schema metadata. Basis and theory columns are dictionary encoded. Parquet
+datasets are partitioned by theory and basis (hive style), so readers can load
+only the slices they filter on.
+
+Requires ``pyarrow`` (``pip install wailord[arrow]``).
+
+Example:
+    Write every table of an experiment and read back one slice::
+
+        expt.to_parquet(Path("tables"))
+        mp2 = read_parquet(Path("tables") / "energy", filters=[("theory", "=", "MP2")])
+"""
+
+import json
+from pathlib import Path
+
+import pandas as pd
+import pint
+import pint_pandas
+from pandas.api.types import CategoricalDtype
+
+META_KEY = b"wailord"
+PARTITION_COLS = ("theory", "basis")  #: Default Parquet partitioning
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ImportError(
+            "Arrow/Parquet export needs pyarrow, install wailord[arrow]"
+        ) from exc
+    return pa, pq
+
+
+def to_arrow(frame):
+    """Arrow table of an experiment table
+
+    Args:
+        frame (:obj:`pd.DataFrame`): A table from ``orcaExp``
+
+    Returns:
+        :obj:`pyarrow.Table`: Unit-free columns with units in the metadata
+    """
+    pa, _ = _pyarrow()
+    meta = {"columns": list(frame.columns), "units": {}, "unit_objects": []}
+    meta["categories"] = {}
+    plain = {}
+    light = frame.attrs.get("units", {})
+    for name in frame.columns:
+        col = frame[name]
+        if name in light and not isinstance(col.dtype, pint_pandas.PintType):
+            meta["units"][name] = light[name]
+            col = col.astype("float64")
+        elif isinstance(col.dtype, pint_pandas.PintType):
+            meta["units"][name] = str(col.dtype.units)
+            col = pd.Series(col.pint.magnitude, dtype="float64", index=col.index)
+        elif col.dtype == object and len(col) and all(
+            isinstance(val, pint.Unit) for val in col
+        ):
+            meta["unit_objects"].append(name)
+            col = col.astype(str).astype("category")
+        elif isinstance(col.dtype, CategoricalDtype) and col.dtype.ordered:
+            meta["categories"][name] = [str(cat) for cat in col.dtype.categories]
+        plain[name] = col
+    table = pa.Table.from_pandas(pd.DataFrame(plain), preserve_index=False)
+    fields = [
+        field.with_metadata({"unit": meta["units"][field.name]})
+        if field.name in meta["units"]
+        else field
+        for field in table.schema
+    ]
+    schema = pa.schema(fields, metadata=table.schema.metadata)
+    table = table.cast(schema)
+    return table.replace_schema_metadata(
+        {**table.schema.metadata, META_KEY: json.dumps(meta).encode()}
+    )
+
+
+def from_arrow(table, ureg=None):
+    """Inverse of `to_arrow`, also for tables read from a partitioned dataset
+
+    Args:
+        table (:obj:`pyarrow.Table`): The stored table
+        ureg (:obj:`pint.UnitRegistry`, optional): Registry used to rebuild
+            unit objects. Defaults to the pint-pandas registry.
+
+    Returns:
+        :obj:`pd.DataFrame`: The table with pint columns and ordered categories
+    """
+    ureg = ureg or pint_pandas.PintType.ureg
+    raw = (table.schema.metadata or {}).get(META_KEY)
+    frame = table.to_pandas()
+    if raw is None:
+        return frame
+    meta = json.loads(raw)
+    for name, unit in meta["units"].items():
+        if name in frame:
+            frame[name] = frame[name].astype("float64").astype(f"pint[{unit}]")
+    for name in meta["unit_objects"]:
+        if name in frame:
+            frame[name] = pd.Series(
+                [ureg.Unit(str(val)) for val in frame[name]],
+                dtype=object,
+                index=frame.index,
+            )
+    for name, cats in meta["categories"].items():
+        if name in frame:
+            dtype = CategoricalDtype(categories=cats, ordered=True)
+            frame[name] = frame[name].astype(str).astype(dtype)
+    order = [name for name in meta["columns"] if name in frame]
+    return frame[order + [name for name in frame if name not in order]]
+
+
+def write_parquet(frame, path, partition_cols=PARTITION_COLS):
+    """Writes a table as a Parquet dataset
+
+    Args:
+        frame (:obj:`pd.DataFrame`): A table from ``orcaExp``
+        path (:obj:`Path`): Dataset directory, existing files are kept
+        partition_cols (:obj:`list`, optional): Columns to partition by,
+            those missing from the table are skipped. Defaults to
+            `PARTITION_COLS`
+
+    Returns:
+        :obj:`Path`: The dataset directory
+    """
+    _, pq = _pyarrow()
+    table = to_arrow(frame)
+    cols = [name for name in partition_cols or () if name in table.column_names]
+    pq.write_to_dataset(table, str(path), partition_cols=cols or None)
+    return Path(path)
+
+
+def read_parquet(path, filters=None, columns=None):
+    """Reads a table written by `write_parquet`
+
+    Args:
+        path (:obj:`Path`): Dataset directory
+        filters (list, optional): ``pyarrow`` filters, e.g.
+            ``[("theory", "=", "MP2")]``; only matching partitions are read
+        columns (list, optional): Columns to load. Defaults to all.
+
+    Returns:
+        :obj:`pd.DataFrame`: The table, see `from_arrow`
+    """
+    _, pq = _pyarrow()
+    return from_arrow(pq.read_table(str(path), filters=filters, columns=columns))
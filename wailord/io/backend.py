@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""Choice between the chemparseplot grammar parsers and the regex decoders.
+
+Most `wailord.io.orca._OrcaRun` extractors can be answered either by a
+chemparseplot grammar parser, which is handed the text of its sections only,
+or by the regex decoders working on the shared section index. Each section has a mode:
+
+    * ``"grammar"`` (the default): the chemparseplot parser, falling back to
+      regex when it gives nothing
+    * ``"regex"``: only the section index decoders
+    * ``"auto"``: the first outputs of an experiment are parsed both ways
+      (`BackendPolicy.samples` of them); if the grammar answered and agreed
+      with the regex decoders on all of them the faster backend is kept,
+      otherwise regex. Until then the grammar is tried first.
+
+Whether chemparseplot provides a section's parser is checked once per
+process; sections without one always use regex. The choices of the
+``"auto"`` sections belong to their policy: every `orcaExp` gets its own
+unless one is passed in, so only experiments sharing a policy share its
+choices. Policies can be saved to JSON and loaded again so repeated sweeps
+skip the comparison.
+
+The default modes come from the ``WAILORD_BACKEND`` environment variable,
+either one mode for every section (``regex``) or comma separated
+``section=mode`` pairs (``vib=regex,ir=auto``); unlisted sections are
+``"grammar"``.
+"""
+
+import collections
+import functools
+import importlib
+import json
+import os
+
+import pandas as pd
+
+#: Environment variable holding the default modes
+ENV = "WAILORD_BACKEND"
+
+MODES = ("grammar", "regex", "auto")
+
+#: Section to the module and name of its chemparseplot grammar parser
+GRAMMARS = {
+    "final_energy": (
+        "chemparseplot.parse.grammar.orca_text",
+        "parse_orca_text_summary",
+    ),
+    "surface": ("chemparseplot.api", "extract_orca_geomscan_energy"),
+    "vib": ("chemparseplot.parse.orca.freq", "parse_orca_vibrational_frequencies"),
+    "ir": ("chemparseplot.parse.orca.freq", "parse_orca_ir_spectrum"),
+    "vpt2": ("chemparseplot.parse.orca.vpt2", "parse_orca_vpt2_fundamentals"),
+    "pop": ("chemparseplot.parse.orca.populations", "parse_orca_populations"),
+}
+
+#: `_OrcaRun` extractor to the section it parses
+EXTRACTOR_SECTIONS = {
+    "final_sp_e": "final_energy",
+    "mult_energy_surface": "surface",
+    "single_energy_surface": "surface",
+    "surface_arrays": "surface",
+    "vib_freq": "vib",
+    "ir_spec": "ir",
+    "vpt2_transitions": "vpt2",
+    "single_population_analysis": "pop",
+    "mult_population_analysis": "pop",
+}
+
+BackendTrial = collections.namedtuple(
+    "BackendTrial", "section path grammar_seconds regex_seconds agree"
+)
+
+
+@functools.lru_cache(maxsize=None)
+def grammar_parser(section):
+    """The chemparseplot parser of a section, or None when the installed
+    chemparseplot lacks it; looked up once per process"""
+    module, name = GRAMMARS[section]
+    try:
+        return getattr(importlib.import_module(module), name)
+    except (ImportError, AttributeError):
+        return None
+
+
+def parse_modes(policy="grammar"):
+    """Mode of every section
+
+    Args:
+        policy: A mode for every section, ``section=mode`` pairs separated by
+            commas, or a dictionary of section to mode; unlisted sections are
+            ``"grammar"``
+
+    Returns:
+        dict: Section to mode
+    """
+    if isinstance(policy, str):
+        policy = policy.strip()
+        if "=" in policy:
+            policy = dict(pair.split("=", 1) for pair in policy.split(","))
+        else:
+            policy = dict.fromkeys(GRAMMARS, policy or "grammar")
+    modes = dict.fromkeys(GRAMMARS, "grammar")
+    for section, mode in policy.items():
+        section, mode = section.strip(), mode.strip()
+        if section not in GRAMMARS:
+            raise (ValueError(f"Unknown section {section}, use one of {list(GRAMMARS)}"))
+        if mode not in MODES:
+            raise (ValueError(f"Backend mode must be one of {MODES}, got {mode}"))
+        modes[section] = mode
+    return modes
+
+
+class BackendPolicy:
+    """Section modes and the backends chosen for the ``"auto"`` ones
+
+    Args:
+        policy (optional): Modes, see `parse_modes`. Defaults to
+            ``"grammar"``.
+        samples (int, optional): Outputs compared before an ``"auto"`` section
+            is decided. Defaults to 3.
+
+    Attributes:
+        modes (dict): Section to mode
+        choices (dict): Section to the backend chosen in ``"auto"`` mode
+        trials (list): :obj:`BackendTrial` of every comparison
+    """
+
+    def __init__(self, policy="grammar", samples=3):
+        self.modes = parse_modes(policy)
+        self.samples = samples
+        self.choices = {}
+        self.trials = []
+
+    def __repr__(self):
+        return f"BackendPolicy({self.resolved()})"
+
+    def resolve(self, section):
+        """``"grammar"``, ``"regex"``, or ``"auto"`` while undecided"""
+        if grammar_parser(section) is None:
+            return "regex"
+        mode = self.modes[section]
+        if mode != "auto":
+            return mode
+        return self.choices.get(section, "auto")
+
+    def resolved(self):
+        """`resolve` of every section, as handed to `_OrcaRun`"""
+        return {section: self.resolve(section) for section in GRAMMARS}
+
+    def undecided(self, extractor):
+        """Section of an extractor if it still has to be compared, else None"""
+        section = EXTRACTOR_SECTIONS.get(extractor)
+        if section is None or self.resolve(section) != "auto":
+            return None
+        return section
+
+    def record(self, trial):
+        """Adds a :obj:`BackendTrial`, deciding its section after `samples`
+
+        The grammar is kept only when it answered and agreed with the regex
+        decoders on every sample, and was faster in total.
+        """
+        self.trials.append(trial)
+        trials = [tr for tr in self.trials if tr.section == trial.section]
+        if len(trials) < self.samples:
+            return
+        faster = sum(tr.grammar_seconds for tr in trials) < sum(
+            tr.regex_seconds for tr in trials
+        )
+        agree = all(tr.agree for tr in trials)
+        self.choices[trial.section] = "grammar" if agree and faster else "regex"
+
+    def report(self):
+        """The trials as a data frame"""
+        return pd.DataFrame(self.trials, columns=list(BackendTrial._fields))
+
+    def to_json(self, path=None):
+        """Modes, choices and trials as JSON, also written to *path* if given"""
+        document = json.dumps(
+            {
+                "modes": self.modes,
+                "samples": self.samples,
+                "choices": self.choices,
+                "trials": [trial._asdict() for trial in self.trials],
+            },
+            indent=2,
+        )
+        if path is not None:
+            with open(path, "w") as out:
+                out.write(document)
+        return document
+
+    @classmethod
+    def load(cls, path):
+        """A policy saved by `to_json`, with its choices"""
+        with open(path) as inp:
+            saved = json.load(inp)
+        policy = cls(saved["modes"], samples=saved["samples"])
+        policy.choices = dict(saved["choices"])
+        policy.trials = [BackendTrial(**trial) for trial in saved["trials"]]
+        return policy
+
+
+def default_policy():
+    """A new :obj:`BackendPolicy` with the modes from `ENV`"""
+    return BackendPolicy(os.environ.get(ENV, "grammar"))
@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+"""Persistent parse cache for experiment tables.
+
+Extractor results of ``_OrcaRun`` are stored as columnar batches in a SQLite
+file, keyed by the output path, the extractor, its arguments and the backend
+which parsed it (see `wailord.io.backend`), so experiments with different
+backend policies never serve each other's results. An entry is
+only served while the file still has the recorded size and modification time
+(and, optionally, the same content digest), so unchanged outputs are never
+parsed twice while edited or re-run jobs are picked up automatically.
+
+Example:
+    Re-use parsed results across sessions::
+
+        from wailord.io.cache import ParseCache
+        from wailord.io.orca import orcaExp
+
+        expt = orcaExp(Path("myexp"), cache=ParseCache(max_bytes=2 << 30))
+        expt.get_final_sp_energy()  # cold: parses every output
+        expt.get_final_sp_energy()  # warm: served from the cache
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+
+from wailord.io._outfile import open_raw, output_stat
+from wailord.io._table import from_batch, to_batch
+
+DEFAULT_MAX_BYTES = 1 << 30  #: Default size bound for stored payloads (1 GiB)
+CACHE_NAME = "parse_cache.sqlite"
+_COMMIT_EVERY = 256
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    path TEXT NOT NULL,
+    extractor TEXT NOT NULL,
+    args TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest TEXT,
+    nbytes INTEGER NOT NULL,
+    accessed REAL NOT NULL,
+    payload BLOB NOT NULL,
+    PRIMARY KEY (path, extractor, args)
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+"""
+
+
+def default_cache_dir():
+    """User cache directory for wailord (honours ``XDG_CACHE_HOME``)"""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "wailord"
+
+
+def file_digest(path, chunk=1 << 20):
+    """BLAKE2b digest of a file, read in chunks"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open_raw(path) as fh:
+        for block in iter(lambda: fh.read(chunk), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """On-disk cache of extractor results.
+
+    Args:
+        path (:obj:`Path`, optional): SQLite file, or a directory in which
+            ``parse_cache.sqlite`` is kept. Defaults to `default_cache_dir`
+        max_bytes (int, optional): Upper bound on the stored payload size;
+            least recently used entries are evicted beyond it. Defaults to
+            `DEFAULT_MAX_BYTES`
+        hash_content (bool, optional): Also require a matching content digest.
+            This reads every output on lookup, so it only pays off on
+            filesystems with unreliable modification times. Defaults to False.
+    """
+
+    def __init__(self, path=None, max_bytes=DEFAULT_MAX_BYTES, hash_content=False):
+        path = Path(path) if path is not None else default_cache_dir()
+        if path.suffix != ".sqlite":
+            path = path / CACHE_NAME
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hash_content = hash_content
+        self.hits = 0
+        self.misses = 0
+        self._pending = 0
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        (self._total,) = self._conn.execute(
+            "SELECT COALESCE(SUM(nbytes), 0) FROM entries"
+        ).fetchone()
+
+    def __repr__(self):
+        return (
+            f"ParseCache({self.path}, {len(self)} entries, "
+            f"{self._total}/{self.max_bytes} bytes)"
+        )
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Commits pending writes and closes the database"""
+        if self._conn is not None:
+            self._conn.commit()
+            self._conn.close()
+            self._conn = None
+
+    def commit(self):
+        """Flushes pending writes to disk"""
+        self._conn.commit()
+        self._pending = 0
+
+    def _key(self, path, extractor, args, backend=None):
+        # The backend is folded into the arguments
+        if backend is not None:
+            args = {"args": args, "backend": backend}
+        return (
+            os.path.abspath(path),
+            extractor,
+            json.dumps(args, sort_keys=True, default=str),
+        )
+
+    def stamp(self, path):
+        """``(size, mtime_ns, digest)`` of a file as recorded in the cache"""
+        stat = output_stat(path)
+        digest = file_digest(path) if self.hash_content else None
+        return stat.st_size, stat.st_mtime_ns, digest
+
+    def _written(self):
+        self._pending += 1
+        if self._pending >= _COMMIT_EVERY:
+            self.commit()
+
+    def get(self, path, extractor, args=(), stamp=None, backend=None):
+        """Cached batch for an extractor call, or None if absent or stale
+
+        Args:
+            path (:obj:`Path`): The output file
+            extractor (str): The ``_OrcaRun`` method name
+            args: JSON-able arguments of the call
+            stamp (tuple, optional): `stamp` of the file, if already taken
+            backend (str, optional): ``"grammar"`` or ``"regex"``, for
+                extractors with a grammar parser
+        """
+        key = self._key(path, extractor, args, backend)
+        row = self._conn.execute(
+            "SELECT size, mtime_ns, digest, payload FROM entries "
+            "WHERE path = ? AND extractor = ? AND args = ?",
+            key,
+        ).fetchone()
+        if row is None or row[:3] != (stamp or self.stamp(path)):
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._conn.execute(
+            "UPDATE entries SET accessed = ? "
+            "WHERE path = ? AND extractor = ? AND args = ?",
+            (time.time(), *key),
+        )
+        self._written()
+        return pickle.loads(zlib.decompress(row[3]))
+
+    def put(self, path, extractor, args, batch, stamp=None, backend=None):
+        """Stores a batch for an extractor call
+
+        Args:
+            path (:obj:`Path`): The output file
+            extractor (str): The ``_OrcaRun`` method name
+            args: JSON-able arguments of the call
+            batch (dict): Columnar batch from ``to_batch``
+            stamp (tuple, optional): ``(size, mtime_ns, digest)`` taken before
+                parsing; defaults to the current state of the file
+            backend (str, optional): Backend which parsed it, see `get`
+        """
+        key = self._key(path, extractor, args, backend)
+        stamp = stamp or self.stamp(path)
+        payload = zlib.compress(pickle.dumps(batch, protocol=5), 1)
+        old = self._conn.execute(
+            "SELECT nbytes FROM entries WHERE path = ? AND extractor = ? AND args = ?",
+            key,
+        ).fetchone()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (*key, *stamp, len(payload), time.time(), payload),
+        )
+        self._total += len(payload) - (old[0] if old else 0)
+        self._written()
+        if self._total > self.max_bytes:
+            self.evict()
+
+    def fetch(self, path, extractor, args, compute, backend=None):
+        """Result of an extractor call, computed and stored on a miss
+
+        Args:
+            path (:obj:`Path`): The output file
+            extractor (str): The ``_OrcaRun`` method name
+            args: JSON-able arguments of the call
+            compute (callable): Produces the result on a cache miss
+            backend (str, optional): Backend of *compute*, see `get`
+
+        Returns:
+            The frame or row produced by *compute*
+        """
+        batch = self.get(path, extractor, args, backend=backend)
+        if batch is not None:
+            return from_batch(batch)
+        stamp = self.stamp(path)
+        result = compute()
+        self.put(
+            path, extractor, args, to_batch(result), stamp=stamp, backend=backend
+        )
+        return result
+
+    def evict(self, max_bytes=None):
+        """Drops least recently used entries until the payload fits
+
+        Args:
+            max_bytes (int, optional): Target size. Defaults to `max_bytes`
+
+        Returns:
+            int: Number of entries dropped
+        """
+        target = self.max_bytes if max_bytes is None else max_bytes
+        dropped = 0
+        rows = self._conn.execute(
+            "SELECT rowid, nbytes FROM entries ORDER BY accessed"
+        ).fetchall()
+        for rowid, nbytes in rows:
+            if self._total <= target:
+                break
+            self._conn.execute("DELETE FROM entries WHERE rowid = ?", (rowid,))
+            self._total -= nbytes
+            dropped += 1
+        self.commit()
+        return dropped
+
+    def invalidate(self, paths=None, extractor=None):
+        """Removes entries
+
+        Args:
+            paths (:obj:`list` of :obj:`Path`, optional): Outputs to forget.
+                Defaults to every output.
+            extractor (str, optional): Only forget this extractor's results
+
+        Returns:
+            int: Number of entries removed
+        """
+        clauses, params = [], []
+        if extractor is not None:
+            clauses.append("extractor = ?")
+            params.append(extractor)
+        where = " AND ".join(clauses) or "1"
+        if paths is None:
+            cur = self._conn.execute(f"DELETE FROM entries WHERE {where}", params)
+            removed = cur.rowcount
+        else:
+            removed = 0
+            for path in paths:
+                cur = self._conn.execute(
+                    f"DELETE FROM entries WHERE path = ? AND {where}",
+                    [os.path.abspath(path), *params],
+                )
+                removed += cur.rowcount
+        (self._total,) = self._conn.execute(
+            "SELECT COALESCE(SUM(nbytes), 0) FROM entries"
+        ).fetchone()
+        self.commit()
+        return removed
+
+    def clear(self):
+        """Removes every entry and compacts the database"""
+        removed = self.invalidate()
+        self._conn.execute("VACUUM")
+        return removed
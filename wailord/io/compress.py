@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""In-place compression of finished ORCA outputs.
+
+Outputs are compressed one by one next to the original (``orca.out`` becomes
+``orca.out.gz``), and the original is only removed once the compressed copy
+has been read back: its decompressed bytes must hash the same, and parsing it
+must find the same sections, final energy and termination as parsing the
+original. Anything else leaves the original untouched.
+
+Every reader in `wailord.io` opens compressed outputs directly, and discovery
+lists them, so experiments keep working while their outputs shrink.
+
+Example:
+    From the command line, or in Python::
+
+        $ wailord compress myexp --format xz --workers 8
+
+        from wailord.io.compress import compress_experiment
+
+        results = compress_experiment(Path("myexp"), fmt="gz")
+"""
+
+import hashlib
+import os
+import shutil
+from collections import namedtuple
+from pathlib import Path
+
+from wailord.io._executor import run_chunks
+from wailord.io._outfile import (
+    OutBuffer,
+    SectionIndex,
+    compression,
+    open_output,
+)
+from wailord.io.archive import is_archive
+from wailord.io.discover import Discovery
+from wailord.io.orca import SECTION_MARKERS, final_energy, output_state
+
+#: Format name to the suffix of the compressed output
+FORMATS = {"gz": ".gz", "xz": ".xz", "bz2": ".bz2", "zst": ".zst"}
+
+#: Outcome of one output: `status` is ``"compressed"``, ``"skipped"`` or
+#: ``"failed"``, `reason` says why for the last two
+CompressResult = namedtuple("CompressResult", "path target status reason size packed")
+
+_COPY_BLOCK = 1 << 20
+
+
+def _fingerprint(path):
+    """What parsing an output finds: marker counts, final energy, termination"""
+    with OutBuffer(path) as buf:
+        index = SectionIndex(buf, SECTION_MARKERS)
+        counts = {key: len(offsets) for key, offsets in index.offsets.items()}
+    try:
+        energy = final_energy(path, grammar=False)
+    except ValueError:
+        energy = None
+    return counts, energy, output_state(path).terminated
+
+
+def _digest(path):
+    """SHA-256 of the (decompressed) bytes of an output"""
+    digest = hashlib.sha256()
+    with open_output(path) as fh:
+        for block in iter(lambda: fh.read(_COPY_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def compress_output(path, fmt="gz", force=False):
+    """Compresses one output in place, once the copy is verified
+
+    Args:
+        path (:obj:`Path`): A plain output
+        fmt (str, optional): Key of `FORMATS`. Defaults to ``"gz"``.
+        force (bool, optional): Also compress outputs which did not
+            terminate normally (e.g. still running). Defaults to False.
+
+    Returns:
+        :obj:`CompressResult`: What was done
+    """
+    path = Path(path)
+    if fmt not in FORMATS:
+        raise (ValueError(f"fmt must be one of {sorted(FORMATS)}, got {fmt}"))
+    target = path.with_name(path.name + FORMATS[fmt])
+    size = path.stat().st_size
+    if compression(path) is not None:
+        return CompressResult(path, path, "skipped", "already compressed", size, size)
+    if not force and not output_state(path).terminated:
+        return CompressResult(path, None, "skipped", "not terminated", size, None)
+    if target.exists():
+        return CompressResult(path, target, "skipped", "target exists", size, None)
+    want = _fingerprint(path)
+    # Not matched by discovery while it is written
+    part = path.with_name(f"{path.name}.part{FORMATS[fmt]}")
+    try:
+        with open(path, "rb") as src, open_output(part, "wb") as dst:
+            shutil.copyfileobj(src, dst, _COPY_BLOCK)
+        if _digest(part) != _digest(path):
+            raise (ValueError("decompressed bytes differ"))
+        if _fingerprint(part) != want:
+            raise (ValueError("compressed output parses differently"))
+        shutil.copystat(path, part)
+        os.replace(part, target)
+    except Exception as exc:
+        part.unlink(missing_ok=True)
+        return CompressResult(path, None, "failed", str(exc), size, None)
+    path.unlink()
+    return CompressResult(path, target, "compressed", None, size, target.stat().st_size)
+
+
+def _compress_chunk(paths, fmt, force):
+    """Executor task: `compress_output` over a chunk of outputs"""
+    return [compress_output(path, fmt, force) for path in paths]
+
+
+def compress_experiment(
+    root, fmt="gz", force=False, discovery=None, workers=None, executor="process"
+):
+    """Compresses every plain output of an experiment, see `compress_output`
+
+    Args:
+        root (:obj:`Path`): Experiment root
+        fmt (str, optional): Key of `FORMATS`. Defaults to ``"gz"``.
+        force (bool, optional): Also compress outputs which did not
+            terminate normally. Defaults to False.
+        discovery (:obj:`Discovery`, optional): Rules for finding outputs.
+            Defaults to the `orcaExp` ones.
+        workers (int, optional): Parallel workers, as for `orcaExp`.
+            Defaults to serial.
+        executor (optional): As for `orcaExp`. Defaults to ``"process"``.
+
+    Returns:
+        list: :obj:`CompressResult` of every output
+    """
+    if is_archive(root):
+        raise (ValueError(f"{root} is an archive, compress before packing it"))
+    discovery = discovery or Discovery()
+    paths = [
+        path for path in discovery.iter_outputs(root) if compression(path) is None
+    ]
+    return run_chunks(
+        _compress_chunk, paths, (fmt, force), workers=workers, executor=executor
+    )
@@ -0,0 +1,347 @@
+# -*- coding: utf-8 -*-
+"""Discovery of ORCA outputs in experiment trees.
+
+Directories are listed with ``os.scandir``, whose entries carry their file type,
+so deciding whether to descend or keep an entry costs no ``stat`` call. This
+matters on parallel filesystems, where every ``stat`` of a ``.gbw``, ``.scfp``
+or ``.molden`` file is a metadata server round trip.
+
+Patterns are either glob strings, matched against the entry name, or compiled
+regular expressions, searched in the path relative to the experiment root.
+Compressed outputs (``orca.out.gz``, see `wailord.io._outfile.COMPRESSED`)
+match the default rules too; where both a plain output and a compressed copy
+are present, only the plain one is listed. Experiment archives (see
+`wailord.io.archive`) are listed from their member names, the same rules
+applying as to the tree they were packed from.
+
+Generated experiments carry a generation manifest (`GENERATION_MANIFEST`,
+written by `wailord.io.inp.inpGenerator` into its project folder) with a
+`JobRecord` per job. Its outputs are looked up directly, one ``stat`` per job;
+only the experiment root is listed, to find the project folders.
+
+Example:
+    Only the ORCA outputs, skipping backups and scratch directories::
+
+        from wailord.io.discover import Discovery
+
+        disc = Discovery(exclude=["*.bak"], prune=["scratch", ".*"])
+        for ofile in disc.iter_outputs(Path("myexp")):
+            ...
+"""
+
+import fnmatch
+import json
+import os
+import posixpath
+from collections import namedtuple
+from pathlib import Path
+
+from wailord.io._outfile import (
+    COMPRESSED,
+    compression,
+    open_output,
+    output_stat,
+)
+from wailord.io.archive import Archive, is_archive
+
+#: ORCA writes its log to ``<name>.out``, possibly compressed later
+DEFAULT_INCLUDE = ("*.out", *(f"*.out{suffix}" for suffix in COMPRESSED))
+DEFAULT_EXCLUDE = ("*slurm*",)  #: Scheduler logs share the suffix
+DEFAULT_PRUNE = (".*", "__pycache__")  #: Directories never descended into
+MANIFEST_NAME = "jobs.manifest"  #: Job directories, one per line
+GENERATION_MANIFEST = "jobs.jsonl"  #: Job records, one JSON object per line
+
+#: One generated job: its parameters as configured, the source geometry, the
+#: SHA-256 of its input, and its directory and expected output relative to the
+#: experiment root
+JobRecord = namedtuple(
+    "JobRecord", "style spin calc basis xyz slug input_hash jobdir output"
+)
+
+
+def _matches(patterns, name, relpath):
+    for pattern in patterns:
+        if isinstance(pattern, str):
+            if fnmatch.fnmatchcase(name, pattern):
+                return True
+        elif pattern.search(relpath):
+            return True
+    return False
+
+
+def _list_disk(directory):
+    """Sorted subdirectory and file names of a directory"""
+    try:
+        with os.scandir(directory) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+    except FileNotFoundError:
+        return [], []
+    subdirs, files = [], []
+    for entry in entries:
+        (subdirs if entry.is_dir(follow_symlinks=False) else files).append(entry.name)
+    return subdirs, files
+
+
+def _archive_lister(root):
+    """`_list_disk` over the member names of an archive at *root*"""
+    with Archive(root) as arch:
+        names = arch.names()
+    tree = {}
+    for name in names:
+        parent, _, base = name.rpartition("/")
+        tree.setdefault(parent, (set(), []))[1].append(base)
+        # Register every ancestor directory with its parent
+        while parent:
+            grand, _, dirname = parent.rpartition("/")
+            subdirs = tree.setdefault(grand, (set(), []))[0]
+            if dirname in subdirs:
+                break
+            subdirs.add(dirname)
+            parent = grand
+
+    def listdir(directory):
+        rel = os.path.relpath(directory, root)
+        subdirs, files = tree.get("" if rel == "." else rel, ((), []))
+        return sorted(subdirs), files
+
+    return listdir
+
+
+class Discovery:
+    """Rules for finding outputs under an experiment root
+
+    Args:
+        include (:obj:`list`, optional): File patterns to keep. Defaults to
+            `DEFAULT_INCLUDE`
+        exclude (:obj:`list`, optional): File patterns to drop, even if
+            included. Defaults to `DEFAULT_EXCLUDE`
+        prune (:obj:`list`, optional): Directory patterns which are not
+            descended into. Defaults to `DEFAULT_PRUNE`
+        maxdepth (int, optional): Deepest directory level to list, the root
+            being level 0. Defaults to no limit.
+    """
+
+    def __init__(
+        self,
+        include=DEFAULT_INCLUDE,
+        exclude=DEFAULT_EXCLUDE,
+        prune=DEFAULT_PRUNE,
+        maxdepth=None,
+    ):
+        self.include = list(include)
+        self.exclude = list(exclude)
+        self.prune = list(prune)
+        self.maxdepth = maxdepth
+
+    def __repr__(self):
+        return (
+            f"Discovery(include={self.include}, exclude={self.exclude}, "
+            f"prune={self.prune}, maxdepth={self.maxdepth})"
+        )
+
+    def keep(self, name, relpath):
+        """Whether a file is an output under these rules"""
+        return _matches(self.include, name, relpath) and not _matches(
+            self.exclude, name, relpath
+        )
+
+    def _scan(self, root, directory, depth, recurse, listdir):
+        dirnames, filenames = listdir(directory)
+        subdirs, kept = [], []
+        if recurse:
+            for name in dirnames:
+                path = os.path.join(directory, name)
+                if not _matches(self.prune, name, os.path.relpath(path, root)):
+                    subdirs.append(path)
+        for name in filenames:
+            relpath = os.path.relpath(os.path.join(directory, name), root)
+            if self.keep(name, relpath):
+                kept.append(name)
+        # A compressed copy next to its plain output is being written
+        names = set(kept)
+        for name in kept:
+            if compression(name) is None or Path(name).stem not in names:
+                yield Path(directory) / name
+        if self.maxdepth is not None and depth >= self.maxdepth:
+            return
+        for subdir in subdirs:
+            yield from self._scan(root, subdir, depth + 1, recurse, listdir)
+
+    def iter_jobs(self, root, records):
+        """Outputs of generated jobs, without walking the tree
+
+        The expected output of every record is looked up, then its compressed
+        variants; jobs which have not written one yet are skipped.
+
+        Args:
+            root (:obj:`Path`): Experiment root, or an experiment archive
+            records (list): :obj:`JobRecord` of the jobs, e.g. from
+                `read_job_records`
+
+        Yields:
+            tuple: Absolute path of every output found, and its record
+        """
+        base = os.fspath(Path(root).resolve())
+        for record in records:
+            for suffix in ("", *COMPRESSED):
+                # Records hold relative paths already, no need for Path objects
+                relpath = record.output + suffix
+                path = os.path.join(base, relpath)
+                if self.keep(relpath.rpartition("/")[2], relpath) and _exists(path):
+                    yield Path(path), record
+                    break
+
+    def iter_outputs(self, root, jobdirs=None):
+        """Lazily yields outputs, in sorted order within every directory
+
+        Args:
+            root (:obj:`Path`): Experiment root, or an experiment archive
+            jobdirs (:obj:`list`, optional): Directories (relative to *root*)
+                to list instead of walking the tree, e.g. from `read_manifest`
+
+        Yields:
+            :obj:`Path`: Absolute path of every output
+        """
+        root = Path(root).resolve()
+        listdir = _archive_lister(root) if is_archive(root) else _list_disk
+        if jobdirs is None:
+            yield from self._scan(root, root, 0, True, listdir)
+            return
+        for jobdir in jobdirs:
+            yield from self._scan(root, root / jobdir, 0, False, listdir)
+
+
+def iter_outputs(root, **kwargs):
+    """`Discovery.iter_outputs` with default rules; keyword arguments are
+    passed on to `Discovery`"""
+    jobdirs = kwargs.pop("jobdirs", None)
+    return Discovery(**kwargs).iter_outputs(root, jobdirs=jobdirs)
+
+
+def _exists(path):
+    try:
+        output_stat(path)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def read_manifest(path):
+    """Job directories listed in a manifest
+
+    Args:
+        path (:obj:`Path`): The manifest, an experiment root holding
+            `MANIFEST_NAME`, or an experiment archive (its job index)
+
+    Returns:
+        list: Directories relative to the experiment root, or None if there is
+        no manifest
+    """
+    path = Path(path)
+    if is_archive(path):
+        with Archive(path) as arch:
+            return arch.jobdirs()
+    if path.is_dir():
+        path = path / MANIFEST_NAME
+    if not path.is_file():
+        return None
+    with path.open() as fh:
+        return [line.strip() for line in fh if line.strip()]
+
+
+def write_manifest(root, outputs, path=None):
+    """Records the directories holding *outputs* for later discovery
+
+    Args:
+        root (:obj:`Path`): Experiment root
+        outputs (list): Output paths, e.g. an experiment's `orclist`
+        path (:obj:`Path`, optional): Manifest file. Defaults to
+            `MANIFEST_NAME` in *root*
+
+    Returns:
+        :obj:`Path`: The manifest written
+    """
+    root = Path(root).resolve()
+    path = Path(path) if path is not None else root / MANIFEST_NAME
+    jobdirs = dict.fromkeys(
+        os.path.relpath(Path(ofile).resolve().parent, root) for ofile in outputs
+    )
+    path.write_text("".join(f"{jobdir}\n" for jobdir in jobdirs))
+    return path
+
+
+def _job_manifests(root):
+    """Generation manifests of an experiment root: its own, else those of
+    the project folders right below it, with their folder names"""
+    if _exists(root / GENERATION_MANIFEST):
+        return [("", root / GENERATION_MANIFEST)]
+    listdir = _archive_lister(root) if is_archive(root) else _list_disk
+    return [
+        (subdir, root / subdir / GENERATION_MANIFEST)
+        for subdir in listdir(root)[0]
+        if _exists(root / subdir / GENERATION_MANIFEST)
+    ]
+
+
+def _read_job_records(path, prefix=""):
+    with open_output(path) as fh:
+        records = [JobRecord(**json.loads(line)) for line in fh if line.strip()]
+    if not prefix:
+        return records
+    return [
+        rec._replace(
+            xyz=posixpath.normpath(f"{prefix}/{rec.xyz}"),
+            jobdir=posixpath.normpath(f"{prefix}/{rec.jobdir}"),
+            output=posixpath.normpath(f"{prefix}/{rec.output}"),
+        )
+        for rec in records
+    ]
+
+
+def read_job_records(path):
+    """Job records of a generation manifest
+
+    The generator writes the manifest into its project folder, so for an
+    experiment root without one the project folders right below it are
+    looked into; their records are returned relative to the root.
+
+    Args:
+        path (:obj:`Path`): The manifest, or an experiment root (or archive)
+            holding `GENERATION_MANIFEST` or project folders with one
+
+    Returns:
+        list: :obj:`JobRecord` in generation order, or None if there is no
+        manifest
+    """
+    path = Path(path)
+    if not (is_archive(path) or path.is_dir()):
+        try:
+            return _read_job_records(path)
+        except FileNotFoundError:
+            return None
+    manifests = _job_manifests(path)
+    if not manifests:
+        return None
+    return [
+        rec
+        for prefix, manifest in manifests
+        for rec in _read_job_records(manifest, prefix)
+    ]
+
+
+def write_job_records(path, records):
+    """Writes a generation manifest
+
+    Args:
+        path (:obj:`Path`): The manifest, usually `GENERATION_MANIFEST` in the
+            project folder (or experiment root)
+        records (list): :obj:`JobRecord` of every job
+
+    Returns:
+        :obj:`Path`: The manifest written
+    """
+    path = Path(path)
+    path.write_text(
+        "".join(f"{json.dumps(record._asdict())}\n" for record in records)
+    )
+    return path
@@ -11,22 +11,32 @@ XYZ coordinate text for ``* xyz`` blocks comes from ``wailord.io.xyz``
 .. _ORCA input description:
    https://sites.google.com/site/orcainputlibrary/generalinput
 """
-import wailord.io as waio
-import wailord._utils as wau
-
+import hashlib
+import itertools as itertt
 import os
+import re
 import shutil
 import textwrap
 import warnings
-import itertools as itertt
-from pathlib import Path
 from operator import itemgetter
+from pathlib import Path
 
 import yaml
 
+import wailord._utils as wau
+import wailord.io as waio
+from wailord.io.discover import (
+    GENERATION_MANIFEST,
+    JobRecord,
+    write_job_records,
+)
+
 SCAN_TYPES = {"D": "Dihedral", "B": "Bond", "A": "Angle"}
 CONSTRAINT_TYPES = {"D": "Dihedral", "B": "Bond", "A": "Angle", "C": "Cartesian"}
 AXIS_PROXY = {"x": 1, "y": 2, "z": 3}  # 0 is the atom type
+OUTPUT_NAME = "orca.out"  # Unless the config or jobscript names another
+# The redirect of the ORCA call in a jobscript, e.g. ``orca orca.inp >orca.out``
+JOB_OUTPUT = re.compile(r"\S+\.inp\b[^>\n]*>{1,2}\s*[\"']?([\w.+-]+)[\"']?(?:\s|$)")
 
 
 class inpGenerator:
@@ -54,6 +64,9 @@ class inpGenerator:
         self.blocks = None
         self.config = None
         self.scripts = []
+        self.jobs = []  # JobRecord of every generated input
+        self.manifest = None  # Defaults to GENERATION_MANIFEST in prjname
+        self.outname = None  # See output_name
 
         fpath = Path(filename)
         with fpath.open(mode="r") as ymlfile:
@@ -265,8 +278,65 @@ class inpGenerator:
         self.parse_xyz()
         if self.qc.active is True:
             self.parse_qc()
+        self.write_manifest()
         pass
 
+    def write_manifest(self, path=None):
+        """Writes the generation manifest of the jobs generated so far
+
+        Paths in the records are relative to the directory of the manifest,
+        which `wailord.io.orca.orcaExp` reads instead of walking the tree.
+
+        Args:
+            path (:obj:`Path`, optional): The manifest. Defaults to
+                `manifest`, or `GENERATION_MANIFEST` in the project folder
+        Returns:
+            path (:obj:`Path`): The manifest written
+        """
+        if path is None:
+            path = self.manifest or Path(self.prjname) / GENERATION_MANIFEST
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        path = Path(path)
+        root = path.parent.resolve()
+        records = [
+            rec._replace(
+                xyz=os.path.relpath(rec.xyz, root),
+                jobdir=Path(os.path.relpath(rec.jobdir, root)).as_posix(),
+                output=Path(os.path.relpath(rec.output, root)).as_posix(),
+            )
+            for rec in self.jobs
+        ]
+        return write_job_records(path, records)
+
+    def output_name(self):
+        """Name of the ORCA output written in every job folder
+
+        Taken from ``output`` in the config, else from the redirect of the
+        ORCA call in the jobscript, else `OUTPUT_NAME`.
+
+        Returns:
+            str: The output file name
+        """
+        if self.outname is not None:
+            return self.outname
+        if self.config.get("output"):
+            self.outname = str(self.config.output)
+            return self.outname
+        self.outname = OUTPUT_NAME
+        script = self.conf_path.parent / self.config.jobscript
+        try:
+            match = JOB_OUTPUT.search(script.read_text())
+        except (OSError, UnicodeDecodeError):
+            match = None
+        if match is not None:
+            self.outname = match.group(1)
+        else:
+            warnings.warn(
+                f"No output redirect found in {script}, recording jobs as "
+                f"writing {OUTPUT_NAME}; set output in the config otherwise"
+            )
+        return self.outname
+
     def parse_viz(self, viz):
         if viz.chemcraft is True:
             string = """
@@ -381,52 +451,70 @@ class inpGenerator:
 
     def gendir_qc(self, basename=None, extra=None):
         """Function to generate QC folder structure recursively"""
+        xyz_path = Path(self.xyz[-1])
         if basename is None:
-            xyz_path = Path(self.xyz[-1])
             slug = f"{waio.xyz.system_label(xyz_path)}_{xyz_path.stem}"
             basename = Path(f"{self.prjname}/{slug}")
         if extra is not None:
             print("Overwriting extra from yml file")
             self.extra = extra
         for styl in self.config.qc.style:
-            styl = styl.replace(" ", "_")
-            self.gendir_qcspin(basename / styl)
+            job = {"style": styl, "xyz": xyz_path, "slug": Path(basename).name}
+            self.gendir_qcspin(basename / styl.replace(" ", "_"), job)
         self.genharness(basename)
         pass
 
-    def gendir_qcspin(self, path):
+    def gendir_qcspin(self, path, job=None):
         """Generates the style folders"""
         for sp in self.spin:
+            spjob = None if job is None else {**job, "spin": " ".join(sp.split())}
             sp = sp.replace(" ", "")
-            self.gendir_qccalc(path / Path(f"spin_{sp}"))
+            self.gendir_qccalc(path / Path(f"spin_{sp}"), spjob)
         pass
 
-    def gendir_qccalc(self, path):
+    def gendir_qccalc(self, path, job=None):
         """Generates set of calculation folders"""
         for cal in self.config.qc.calculations:
-            self.gendir_qcbasis(path / cal)
+            caljob = None if job is None else {**job, "calc": cal}
+            self.gendir_qcbasis(path / cal, caljob)
         pass
 
-    def gendir_qcbasis(self, path):
+    def gendir_qcbasis(self, path, job=None):
         """Generates the directory of input files. Note that the folders will have +
         replaced by P and * by 8"""
         for base in self.config.qc.basis_sets:
             bas = base.replace("+", "P").replace("*", "8")
             Path.mkdir(path / bas, parents=True, exist_ok=True)
-            self.geninp(path / bas)
+            self.geninp(path / bas, None if job is None else {**job, "basis": base})
         pass
 
-    def geninp(self, path):
-        """Uses the path to generate details for an input file"""
-        tmpstr = str(path).split("/")
+    def geninp(self, path, job=None):
+        """Generates an input file, and records the job for the manifest
+
+        Args:
+            path (:obj:`Path`): The job folder
+            job (dict, optional): ``style``, ``spin``, ``calc``, ``basis``,
+                ``xyz`` and ``slug`` of the job, as passed down by
+                `gendir_qc`. Defaults to decoding the folder names.
+        """
+        if job is None:
+            tmpstr = str(path).split("/")
+            job = {
+                # Reverse the function call order
+                "basis": tmpstr[-1].replace("P", "+").replace("8", "*"),
+                "calc": tmpstr[-2],
+                "spin": " ".join(
+                    list(itertt.chain.from_iterable(tmpstr[-3].replace("spin_", "")))
+                ),
+                "style": tmpstr[-4].replace("_", " "),
+                "xyz": Path(self.xyz[-1]),
+                "slug": tmpstr[-5] if len(tmpstr) > 4 else "",
+            }
         tmpconf = {
-            # Reverse the function call order
-            "basis": tmpstr[-1].replace("P", "+").replace("8", "*"),
-            "calc": tmpstr[-2],
-            "spin": " ".join(
-                list(itertt.chain.from_iterable(tmpstr[-3].replace("spin_", "")))
-            ),
-            "style": tmpstr[-4].replace("_", " "),
+            "basis": job["basis"],
+            "calc": job["calc"],
+            "spin": job["spin"],
+            "style": job["style"],
             "name": path / "orca.inp",
             "unrestricted": False,
         }
@@ -434,6 +522,19 @@ class inpGenerator:
             if tmpconf["style"].find("UKS") != -1 or tmpconf["style"].find("UHF") != -1:
                 tmpconf["unrestricted"] = True
         self.writeinp(tmpconf)
+        self.jobs.append(
+            JobRecord(
+                style=job["style"],
+                spin=job["spin"],
+                calc=job["calc"],
+                basis=job["basis"],
+                xyz=str(Path(job["xyz"]).resolve()),
+                slug=job["slug"],
+                input_hash=hashlib.sha256(tmpconf["name"].read_bytes()).hexdigest(),
+                jobdir=str(Path(path).resolve()),
+                output=str(Path(path).resolve() / self.output_name()),
+            )
+        )
         self.putscript(
             to_loc=path,
             from_loc=self.conf_path.parent / self.config.jobscript,
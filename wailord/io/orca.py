@@ -34,28 +34,70 @@ Todo:
 
 """
 
-import numpy as np
-import pandas as pd
+import contextlib
 import itertools as itertt
-
-import re
+import json
 import os
+import re
+import tempfile
 import textwrap
-import pint
-import pint_pandas
+import time
 import warnings
-
-from pathlib import Path
-from functools import reduce
-from collections import namedtuple, OrderedDict
+from collections import OrderedDict, namedtuple
 from operator import itemgetter
-from pandas.api.types import CategoricalDtype
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pint
+import pint_pandas
 import yaml
+from pandas.api.types import CategoricalDtype
+
+from wailord import geometry
+from wailord.io import arrow
+from wailord.io import profile as parse_profile
+from wailord.io._executor import run_chunks
+from wailord.io._outfile import (
+    BLANK_LINE,
+    TAIL_BLOCK,
+    OutBuffer,
+    SectionIndex,
+    decode_table,
+    last_line,
+    open_output,
+    output_stat,
+    table_bounds,
+)
+from wailord.io._table import (
+    from_batch,
+    narrow_batch,
+    stack_facts,
+    to_batch,
+)
+from wailord.io.archive import is_archive
+from wailord.io.backend import (
+    EXTRACTOR_SECTIONS,
+    BackendPolicy,
+    BackendTrial,
+    default_policy,
+    grammar_parser,
+)
+from wailord.io.cache import ParseCache
+from wailord.io.discover import (
+    Discovery,
+    iter_outputs,
+    read_job_records,
+    read_manifest,
+)
+from wailord.io.profile import ParseRecord
+from wailord.scan import AXIS_ATOL, ScanGrid
+from wailord.units import column, factor, magnitude, strip_units, tag_units
 
 # Pint setup — prefer chemparseplot.units (suite owner); local fallback only.
 PA_ = pint_pandas.PintArray
 try:
-    from chemparseplot.units import ureg, Q_
+    from chemparseplot.units import Q_, ureg
 except ImportError:  # pragma: no cover
     ureg = pint.UnitRegistry()
     Q_ = ureg.Quantity
@@ -98,16 +140,272 @@ OUT_REGEX = {
     "Vibrational Frequency": re.compile(r"VIBRATIONAL FREQUENCIES"),
 }
 
+#: Literal-led markers indexed in a single pass by ``SectionIndex``; the keys
+#: mirror `OUT_REGEX` with a few extra fields used by the extractors
+SECTION_MARKERS = {
+    "cartesian_coord": r"CARTESIAN COORDINATES \(ANGSTROEM\)",
+    "final_single_point_e": r"FINAL SINGLE POINT ENERGY\s*-",
+    "basis_set": r"Orbital basis set information",
+    "MDCI": r"The Calculated Surface using the MDCI energy\n",
+    "MDCI w/o Triples": (
+        r"The Calculated Surface using the MDCI energy minus triple correction"
+    ),
+    "Actual Energy": r"The Calculated Surface using the 'Actual Energy'",
+    "SCF Energy": r"The Calculated Surface using the SCF energy",
+    "energy_evals": r"There will be\s*\d* energy evaluations",
+    "Mulliken": r"MULLIKEN ATOMIC CHARGES",
+    "Loewdin": r"LOEWDIN ATOMIC CHARGES",
+    "irSpectrum": r"IR SPECTRUM",
+    "vpt2trans": r"Fundamental transition",
+    "Vibrational Frequency": r"VIBRATIONAL FREQUENCIES",
+    "n_atoms": r"Number of atoms",
+    "terminated": r"ORCA TERMINATED NORMALLY",
+    "scan_step": r"TRAJECTORY STEP\s+\d+",
+    "relaxed_scan_step": r"RELAXED SURFACE SCAN STEP\s+\d+",
+}
+
 # ------------ Refactor
 
+#: Label of the energy lines, any sign (`SECTION_MARKERS` only takes negative
+#: energies)
+ENERGY_LABEL = "FINAL SINGLE POINT ENERGY"
+
+#: Sections of the energy surface tables
+SURFACE_SECTIONS = ("Actual Energy", "MDCI", "MDCI w/o Triples", "SCF Energy")
+#: Scan coordinates of two surfaces closer than this are the same point, as
+#: on the axes of a `ScanGrid`
+SURFACE_ATOL = AXIS_ATOL
+
+
+def _lines_from_end(text, label):
+    """Lines of *text* holding *label*, the last one first"""
+    end = len(text)
+    while (hit := text.rfind(label, 0, end)) != -1:
+        start = text.rfind("\n", 0, hit) + 1
+        stop = text.find("\n", hit)
+        yield text[start : len(text) if stop == -1 else stop]
+        end = start
+
+
 def _final_energy_via_chemparseplot(text: str):
-    """Return last final single-point energy (hartree Magnitude) or None."""
-    try:
-        from chemparseplot.parse.grammar.orca_text import parse_orca_text_summary
-    except ImportError:
+    """Return last final single-point energy (hartree Magnitude) or None.
+
+    The grammar only ever sees energy lines: they are located in *text* with
+    a substring search, the last first, so whole outputs (with every
+    geometry of an optimisation) are never parsed by the grammar.
+    """
+    parse_orca_text_summary = grammar_parser("final_energy")
+    if parse_orca_text_summary is None:
         return None
-    summary = parse_orca_text_summary(text)
-    return summary.final_energy_hartree
+    for line in _lines_from_end(text, ENERGY_LABEL):
+        energy = parse_orca_text_summary(line).final_energy_hartree
+        if energy is not None:
+            return energy
+    return None
+
+
+def final_energy(ofile, grammar=True):
+    """Last final single point energy of an output, in hartree
+
+    The energy line is located by reading the file backwards from EOF, so the
+    cost does not grow with the length of the output. Only when no such line is
+    found is the whole text handed to the grammar parser.
+
+    Args:
+        ofile (:obj:`Path`): The output file
+        grammar (bool, optional): Parse the energy line with chemparseplot when
+            it is installed, instead of taking its last field. Defaults to True.
+
+    Returns:
+        float: The energy, or None if the output has none
+    """
+    return _final_energy(ofile, grammar)[0]
+
+
+def _final_energy(ofile, grammar=True, stats=None):
+    """`final_energy` and the backend which found it (``"grammar"`` or
+    ``"regex"``); ``stats["bytes"]`` counts the bytes read"""
+    stats = {} if stats is None else stats
+    line = last_line(ofile, SECTION_MARKERS["final_single_point_e"], stats=stats)
+    if line is None:
+        if not grammar:
+            return None, "regex"
+        # Non-negative energies: only the last labelled line goes to the grammar
+        line = last_line(ofile, ENERGY_LABEL, stats=stats)
+        suite_e = None if line is None else _final_energy_via_chemparseplot(line)
+        return (None, "regex") if suite_e is None else (float(suite_e), "grammar")
+    suite_e = _final_energy_via_chemparseplot(line) if grammar else None
+    if suite_e is not None:
+        return float(suite_e), "grammar"
+    return float(line.split()[-1]), "regex"
+
+
+OutputState = namedtuple("OutputState", "size mtime_ns terminated")
+
+
+def output_state(ofile):
+    """Size, modification time and termination status of an output
+
+    Only the last `TAIL_BLOCK` bytes are searched for the termination banner,
+    which ORCA prints just before the run time.
+
+    Args:
+        ofile (:obj:`Path`): The output file
+
+    Returns:
+        :obj:`OutputState`: The state, `terminated` is True for normal
+        termination
+    """
+    stat = output_stat(ofile)
+    return OutputState(stat.st_size, stat.st_mtime_ns, _terminated(ofile))
+
+
+def _terminated(ofile):
+    """Whether the termination banner is in the last `TAIL_BLOCK` bytes"""
+    banner = last_line(ofile, SECTION_MARKERS["terminated"], limit=TAIL_BLOCK)
+    return banner is not None
+
+
+def _final_energies(paths):
+    """Executor task: `final_energy` of a chunk of outputs, NaN if absent"""
+    out = []
+    for runf in paths:
+        try:
+            energy = final_energy(runf, grammar=False)
+        except (OSError, ValueError):
+            energy = None
+        out.append(np.nan if energy is None else energy)
+    return out
+
+
+Trajectory = namedtuple("Trajectory", "symbols coords energies")
+
+
+def _trajectory(buf, index):
+    """`Trajectory` from an indexed buffer; see `read_trajectory`"""
+    data = buf.data
+    blocks = []
+    for pos in index.offsets["cartesian_coord"]:
+        # Skip the dashed rule under the marker, and the last row's newline
+        start, end = table_bounds(buf, pos, skip=1)
+        blocks.append(data[start:end].rstrip(b"\n"))
+    energies = np.array(
+        [
+            float(buf.line(pos).split()[-1])
+            for pos in index.offsets["final_single_point_e"]
+        ],
+        dtype=np.float64,
+    )
+    if not blocks:
+        return Trajectory(
+            symbols=np.empty(0, dtype=str),
+            coords=Q_(np.empty((0, 0, 3)), "angstrom"),
+            energies=Q_(energies, "hartree"),
+        )
+    n_atoms = len(blocks[0].split(b"\n"))
+    tokens = np.array(b" ".join(blocks).split())
+    if tokens.size != 4 * n_atoms * len(blocks):
+        raise (ValueError(f"Geometry blocks of {buf.path} differ in size"))
+    tokens = tokens.reshape(len(blocks), n_atoms, 4)
+    return Trajectory(
+        symbols=tokens[0, :, 0].astype(str),
+        coords=Q_(tokens[:, :, 1:].astype(np.float64), "angstrom"),
+        energies=Q_(energies, "hartree"),
+    )
+
+
+def read_trajectory(ofile):
+    """Geometries and energies of every step of a run, in one pass
+
+    All geometry blocks are decoded together into a single array, instead of
+    per-atom objects, and units are attached once per array.
+
+    Args:
+        ofile (:obj:`Path`): The output file
+
+    Returns:
+        :obj:`Trajectory`: ``symbols`` (``(n_atoms,)`` str array), ``coords``
+        (``(n_steps, n_atoms, 3)`` float64 angstrom) and ``energies`` (one
+        hartree value per ``FINAL SINGLE POINT ENERGY``, usually ``n_steps``)
+    """
+    with OutBuffer(ofile) as buf:
+        markers = ("cartesian_coord", "final_single_point_e")
+        index = SectionIndex(buf, {key: SECTION_MARKERS[key] for key in markers})
+        return _trajectory(buf, index)
+
+
+_SCAN_STEPS = ("scan_step", "relaxed_scan_step")
+
+
+def _scan_values(buf, pos):
+    """``{label: value}`` printed in the banner of one scan step"""
+    values = {}
+    lines = buf.iter_lines(pos)
+    next(lines)
+    for line in lines:
+        content = line.strip()
+        if content and not content.strip("*"):
+            break
+        content = content.strip("* \t")
+        if ":" in content:
+            label, value = content.rsplit(":", 1)
+            values[" ".join(label.split())] = float(value)
+    return values
+
+
+def _last_before(offsets, bounds):
+    """Per step, position in *offsets* of the last hit before the step bound,
+    -1 if the step has none"""
+    offsets = np.asarray(offsets, dtype=np.int64)
+    last = np.searchsorted(offsets, bounds[1:], side="left") - 1
+    found = last >= 0
+    found[found] = offsets[last[found]] >= bounds[:-1][found]
+    return np.where(found, last, -1)
+
+
+def _scan_grid(buf, index):
+    """`ScanGrid` from an indexed buffer; see `read_scan`"""
+    steps = sorted(pos for key in _SCAN_STEPS for pos in index.offsets.get(key, ()))
+    if not steps:
+        raise (ValueError(f"No scan found in {buf.path}"))
+    rows = [_scan_values(buf, pos) for pos in steps]
+    dims = list(rows[0])
+    if not dims or any(list(row) != dims for row in rows):
+        raise (ValueError(f"Inconsistent scan coordinates in {buf.path}"))
+    values = np.array([[row[dim] for dim in dims] for row in rows])
+    traj = _trajectory(buf, index)
+    bounds = np.array([*steps, len(buf)], dtype=np.int64)
+    geom = _last_before(index.offsets["cartesian_coord"], bounds)
+    eng = _last_before(index.offsets["final_single_point_e"], bounds)
+    coords = traj.coords.magnitude
+    geometries = np.full((len(steps), *coords.shape[1:]), np.nan)
+    geometries[geom >= 0] = coords[geom[geom >= 0]]
+    energies = np.full(len(steps), np.nan)
+    energies[eng >= 0] = traj.energies.magnitude[eng[eng >= 0]]
+    return ScanGrid(
+        dims, values, energies, geometries, traj.symbols, atol=SURFACE_ATOL
+    )
+
+
+def read_scan(ofile):
+    """Relaxed (or rigid) parameter scan of a run on its grid
+
+    The coordinate values of every ``TRAJECTORY STEP`` define the grid, each
+    step contributing its last energy (hartree) and geometry (angstrom).
+
+    Args:
+        ofile (:obj:`Path`): The output file
+
+    Returns:
+        :obj:`wailord.scan.ScanGrid`: One axis per scanned coordinate
+
+    Raises:
+        ValueError: If the run is not a scan
+    """
+    with OutBuffer(ofile) as buf:
+        markers = ("cartesian_coord", "final_single_point_e", *_SCAN_STEPS)
+        index = SectionIndex(buf, {key: SECTION_MARKERS[key] for key in markers})
+        return _scan_grid(buf, index)
 
 
 def _parse_out(filename, plotter=False):
@@ -116,40 +414,20 @@ def _parse_out(filename, plotter=False):
     Application single-file parse: ``chemparseplot.api.parse_orca_final_energy``
     / grammar track. Experiment multi-file assembly: ``orcaExp``.
     """
-    intcreg, fsp_ereg, get_basis = itemgetter(
-        "cartesian_coord", "final_single_point_e", "basis_set"
-    )(OUT_REGEX)
-    get_spec = re.compile(r"Number\s*of\s*atoms\s*.*\s*\d*")
-    with open(filename) as f:
-        fInp = f.read()
-        suite_e = _final_energy_via_chemparseplot(fInp)
-        if suite_e is not None:
-            fin_energ = float(suite_e) * ureg.hartree
-            if plotter == True:
-                # full series still from regex until grammar exposes all lines publicly
-                energ = [float(x.split()[-1]) for x in fsp_ereg.findall(fInp)]
-        else:
-            fin_energ = float(fsp_ereg.findall(fInp)[-1].split()[-1]) * ureg.hartree
-            if plotter == True:
-                energ = [float(x.split()[-1]) for x in fsp_ereg.findall(fInp)]
-        num_species = int(get_spec.search(fInp).group(0).split()[-1])
-    with open(filename) as f:
-        flines = f.readlines()
-        allAtoms = []
-        for linum, line in enumerate(flines):
-            if get_basis.search(line):
-                basis = flines[linum + 1].split()[-1]
-            if intcreg.search(line):
-                offset = linum + 2
-                for i in range(num_species):
-                    p = flines[offset + i].split()
-                    myAtom = inpcart(
-                        atype=p[0],
-                        x=float(p[1]) * ureg.angstrom,
-                        y=float(p[2]) * ureg.angstrom,
-                        z=float(p[3]) * ureg.angstrom,
-                    )
-                    allAtoms.append(myAtom)
+    oout, traj = _read_out(filename)
+    if plotter == True:
+        return oout, traj.energies.magnitude.tolist()
+    return oout
+
+
+def _read_out(filename):
+    """`_parse_out` row together with the run's `Trajectory`"""
+    with OutBuffer(filename) as buf:
+        index = SectionIndex(buf, SECTION_MARKERS)
+        fin_energ = final_energy(filename) * ureg.hartree
+        traj = _trajectory(buf, index)
+        for _, flines in index.lines("basis_set"):
+            basis = next(flines).split()[-1]
     runinfo = getRunInfo(Path(filename).parent)
     if runinfo["spin"] == "spin_01":
         spin = "singlet"
@@ -157,9 +435,15 @@ def _parse_out(filename, plotter=False):
         spin = "triplet"
     else:
         raise (NotImplementedError(f"Not yet implemented {runinfo['spin']}"))
-    finGeom = []
-    for i in reversed(range(1, num_species + 1)):
-        finGeom.append(allAtoms[-i])
+    finGeom = [
+        inpcart(
+            atype=atype,
+            x=float(xyz[0]) * ureg.angstrom,
+            y=float(xyz[1]) * ureg.angstrom,
+            z=float(xyz[2]) * ureg.angstrom,
+        )
+        for atype, xyz in zip(traj.symbols, traj.coords.magnitude[-1])
+    ]
     #  Creates a dictionary of the system H num O num
     systr = pd.DataFrame(finGeom).atype.value_counts().to_dict()
     # Flattens the dictionary to a list
@@ -175,10 +459,7 @@ def _parse_out(filename, plotter=False):
         spin=spin,
         theory=runinfo["theory"],
     )
-    if plotter == True:
-        return oout, energ
-    else:
-        return oout
+    return oout, traj
 
 
 def get_e(orcaoutdat, basis, system):
@@ -190,49 +471,26 @@ def get_e(orcaoutdat, basis, system):
     ]["final_energy"].to_list()[0]
 
 
-def _euclidean_distance(v1, v2):
-    """||v1 - v2||_2 without an external vector-geometry dependency."""
-    return float(np.linalg.norm(np.asarray(v1, dtype=float) - np.asarray(v2, dtype=float)))
-
-
-def _angle_deg(v12, v13):
-    """Angle in degrees between two vectors (origin at shared vertex)."""
-    a = np.asarray(v12, dtype=float)
-    b = np.asarray(v13, dtype=float)
-    na = np.linalg.norm(a)
-    nb = np.linalg.norm(b)
-    if na == 0.0 or nb == 0.0:
-        raise ValueError("zero-length vector in bond-angle calculation")
-    cosang = float(np.clip(np.dot(a, b) / (na * nb), -1.0, 1.0))
-    return float(np.degrees(np.arccos(cosang)))
+def _frame_coords(dat, indi):
+    """Magnitudes of the selected rows of an `inpcart` frame, ``(n, 3)``"""
+    return np.array(
+        [[dat.x[i].magnitude, dat.y[i].magnitude, dat.z[i].magnitude] for i in indi]
+    )
 
 
 def getBL(dat, x, y, z, indi=[0, 1]):
     """Takes in a data frame of xyz coordinates and uses it to calculate the bond length"""
-    v1 = np.array(
-        [dat.x[indi[0]].magnitude, dat.y[indi[0]].magnitude, dat.z[indi[0]].magnitude]
-    )
-    v2 = np.array(
-        [dat.x[indi[1]].magnitude, dat.y[indi[1]].magnitude, dat.z[indi[1]].magnitude]
-    )
-    return Q_(_euclidean_distance(v1, v2), x[indi[0]].units)
+    length = geometry.distances(_frame_coords(dat, indi), [(0, 1)])[0]
+    return Q_(length, x[indi[0]].units)
 
 
 def getBA(dat, x, y, z, indi=[0, 1, 2]):
     """Takes in a data frame of xyz coordinates and uses it to generate the
     plane angle, indices are used such that the first is the relative center"""
-    v1 = np.array(
-        [dat.x[indi[0]].magnitude, dat.y[indi[0]].magnitude, dat.z[indi[0]].magnitude]
-    )
-    v2 = np.array(
-        [dat.x[indi[1]].magnitude, dat.y[indi[1]].magnitude, dat.z[indi[1]].magnitude]
-    )
-    v3 = np.array(
-        [dat.x[indi[2]].magnitude, dat.y[indi[2]].magnitude, dat.z[indi[2]].magnitude]
-    )
-    v12 = v2 - v1
-    v13 = v3 - v1
-    return Q_(_angle_deg(v12, v13), "degrees")
+    angle = geometry.angles(_frame_coords(dat, indi), [(0, 1, 2)])[0]
+    if np.isnan(angle):
+        raise ValueError("zero-length vector in bond-angle calculation")
+    return Q_(angle, "degrees")
 
 
 def genEBASet(
@@ -246,27 +504,17 @@ def genEBASet(
     """Takes in a Path object, and typically returns bond angles and energies.
     Optionally returns a TeX table or a full dataset with the filenames and
     geometries. Depreciate this eventually."""
-    outs = []
-    for root, dirs, files in os.walk(rootdir.resolve()):
-        for filename in files:
-            if "out" in filename and "slurm" not in filename:
-                outs.append(_parse_out(f"{root}/{filename}"))
-    outdat = pd.DataFrame(data=outs)
+    parsed = [_read_out(str(ofile)) for ofile in iter_outputs(rootdir)]
+    outdat = pd.DataFrame(data=[oout for oout, _ in parsed])
+    # Final frames of every run, stacked so the angles take one call
+    frames = geometry.pad_frames([traj.coords[-1] for _, traj in parsed])
     basis_type = CategoricalDtype(categories=order_basis, ordered=True)
     theory_type = CategoricalDtype(categories=order_theory, ordered=True)
     outdat["basis"] = outdat["basis"].astype(basis_type)
     outdat["theory"] = outdat["theory"].astype(theory_type)
-    # print(outdat.basis[0])
-    # print(pd.DataFrame(outdat.fGeom[0]))
-    outdat["angle"] = outdat.fGeom.apply(
-        lambda geom: getBA(
-            pd.DataFrame(geom),
-            pd.DataFrame(geom).x,
-            pd.DataFrame(geom).y,
-            pd.DataFrame(geom).z,
-            [0, 1, 2],
-        )
-    )
+    outdat["angle"] = [
+        Q_(angle, "degrees") for angle in geometry.angles(frames, [(0, 1, 2)])[:, 0]
+    ]
     outdat.sort_values(by=["theory", "basis"], ignore_index=True, inplace=True)
     outdat.final_energy = outdat.final_energy.apply(
         lambda x: np.around(x, decimals=deci)
@@ -286,6 +534,10 @@ def genEBASet(
 # ------------- Keep ------------------
 
 
+#: Run metadata recovered by `getRunInfo`, one value per output
+RUN_COLUMNS = ("basis", "calc", "spin", "theory", "slug")
+
+
 def getRunInfo(runf):
     """Determines the runtime parameters from the output path
 
@@ -300,9 +552,7 @@ def getRunInfo(runf):
     Returns:
         runinf (:obj:`dict`): A simple unordered dictionary of paramters
     """
-    runinf = OrderedDict(
-        {"basis": None, "calc": None, "spin": None, "theory": None, "slug": None}
-    )
+    runinf = OrderedDict.fromkeys(RUN_COLUMNS)
     rfparts = runf.parts
     for num, od in enumerate(runinf, start=1):
         runinf[od] = rfparts[-num]
@@ -311,6 +561,52 @@ def getRunInfo(runf):
     return dict(runinf)
 
 
+def _record_runinfo(record):
+    """`getRunInfo` of a generated job from its :obj:`JobRecord`
+
+    Spins are labelled by their directory (``spin_01``), as in the walk.
+    """
+    return {
+        "basis": record.basis,
+        "calc": record.calc,
+        "spin": f"spin_{record.spin.replace(' ', '')}",
+        "theory": record.style,
+        "slug": record.slug,
+    }
+
+
+def join_runs(facts, runs, run_columns=None):
+    """Wide layout of a fact table, with the metadata of its runs in every row
+
+    Args:
+        facts (:obj:`pd.DataFrame`): Narrow table with a ``run_id`` column,
+            e.g. from `orcaExp.facts`
+        runs (:obj:`pd.DataFrame`): Run table with ``run_id`` and the
+            `RUN_COLUMNS`, e.g. `orcaExp.runs`
+        run_columns (list, optional): ``(position, name)`` of every metadata
+            column in the wide layout. Defaults to the layout recorded by
+            `orcaExp.facts`, else the `RUN_COLUMNS` are appended.
+
+    Returns:
+        pd.DataFrame: The table without ``run_id``, as from the ``get_*``
+        methods before ordering
+    """
+    if run_columns is None:
+        ncols = len(facts.columns) - 1
+        run_columns = facts.attrs.get(
+            "run_columns",
+            [[ncols + num, name] for num, name in enumerate(RUN_COLUMNS)],
+        )
+    wide = facts.drop(columns="run_id")
+    lookup = runs.set_index("run_id")
+    run_ids = facts["run_id"].to_numpy()
+    for pos, name in sorted(run_columns):
+        values = lookup[name].reindex(run_ids).to_numpy(dtype=object)
+        wide.insert(pos, name, values)
+    wide.attrs.pop("run_columns", None)
+    return wide
+
+
 def calc_htst(product, reactant, transition_state, temperature):
     """Calculates the HTST rate constant.
 
@@ -344,26 +640,108 @@ def calc_htst(product, reactant, transition_state, temperature):
     product = _run(product)
     reactant = _run(reactant)
     transition_state = _run(transition_state)
-    prod = product.vib_freq()
-    react = reactant.vib_freq()
-    ts = transition_state.vib_freq()
-    ppnum = prod.freq.loc[~(prod.freq <= 0)].to_numpy()
-    reactnum = react.freq.loc[~(react.freq <= 0)].to_numpy()
-    tsdenom = ts.freq.loc[~(ts.freq <= 0)].to_numpy()
-    temp = Q_(temperature, "K")
+    # Plain arrays (cm⁻¹ and hartree) until the rates are assembled
+    freqs = [
+        column(run.vib_freq(), "freq", "cm_1")
+        for run in (product, reactant, transition_state)
+    ]
+    ppnum, reactnum, tsdenom = [freq[~(freq <= 0)] for freq in freqs]
+    energies = [
+        magnitude(run.fin_sp_e, "hartree")
+        for run in (product, reactant, transition_state)
+    ]
+    kt = factor("boltzmann_constant", "hartree / K") * temperature
     # FIXME: Should this be the ureg.speed_of_light instead?
     conv = Q_(1, "m/s")
-    preProd = ppnum.prod() / tsdenom.prod()
-    preReact = reactnum.prod() / tsdenom.prod()
-    delProd = transition_state.fin_sp_e - product.fin_sp_e
-    delReact = transition_state.fin_sp_e - reactant.fin_sp_e
-    prodExp = -1 * (delProd / (ureg.boltzmann_constant * temp))
-    reactExp = -1 * (delReact / (ureg.boltzmann_constant * temp))
-    kf = (preProd * conv).to_base_units() * np.exp(prodExp.to_base_units())
-    kb = (preReact * conv).to_base_units() * np.exp(reactExp.to_base_units())
+
+    def _rate(numer, energy):
+        prefactor = Q_(
+            numer.prod() / tsdenom.prod(),
+            ureg.centimeter ** (len(tsdenom) - len(numer)),
+        )
+        barrier = energies[2] - energy
+        return (prefactor * conv).to_base_units() * np.exp(-barrier / kt)
+
+    kf = _rate(ppnum, energies[0])
+    kb = _rate(reactnum, energies[1])
     return (kf, kb)
 
 
+def _call_key(extractor, args):
+    return extractor, json.dumps(args, sort_keys=True, default=str)
+
+
+def _call_from_key(key):
+    extractor, args = key
+    return extractor, tuple(json.loads(args))
+
+
+class _InotifyWatcher:
+    """Recursive inotify watch over an experiment tree"""
+
+    def __init__(self, root, inotify, flags):
+        self._inotify = inotify
+        self._flags = flags
+        self._mask = (
+            flags.CLOSE_WRITE | flags.MOVED_TO | flags.CREATE | flags.DELETE
+        )
+        self._dirs = {}
+        self._add(Path(root))
+
+    def _add(self, directory):
+        for dirpath, _, _ in os.walk(directory):
+            wd = self._inotify.add_watch(dirpath, self._mask)
+            self._dirs[wd] = Path(dirpath)
+
+    def wait(self, timeout):
+        """Blocks until something was written (or *timeout* seconds)"""
+        for event in self._inotify.read(timeout=int(timeout * 1000)):
+            if event.mask & self._flags.ISDIR and event.mask & self._flags.CREATE:
+                self._add(self._dirs[event.wd] / event.name)
+
+    def close(self):
+        self._inotify.close()
+
+
+def _inotify_watcher(root):
+    """An `_InotifyWatcher`, or None without ``inotify_simple``"""
+    try:
+        from inotify_simple import INotify, flags
+    except ImportError:
+        return None
+    return _InotifyWatcher(root, INotify(), flags)
+
+
+# Table name -> (`_OrcaRun` extractor, sort order, drop duplicate rows), matching
+# the corresponding `orcaExp.get_*` methods; used by `orcaExp.collect`
+COLLECT_TABLES = {
+    "energy": ("final_sp_e", ("theory", "basis", "final_sp_energy"), False),
+    "vib": ("vib_freq", ("theory", "basis"), True),
+    "ir": ("ir_spec", ("theory", "basis"), True),
+    "vpt2": ("vpt2_transitions", ("theory", "basis"), True),
+    "pop": ("mult_population_analysis", ("theory", "basis"), True),
+    "surface": ("mult_energy_surface", ("theory", "basis", "bond_length"), True),
+}
+
+
+def _table_calls(
+    tables, etype=["Actual Energy", "SCF Energy"], poptype=["Mulliken", "Loewdin"]
+):
+    """Validated table names and their ``(extractor, args)`` calls"""
+    if isinstance(tables, str):
+        tables = [tables]
+    unknown = set(tables) - set(COLLECT_TABLES)
+    if unknown:
+        raise (ValueError(f"Unknown tables {sorted(unknown)}"))
+    if isinstance(etype, str):
+        etype = [etype]
+    if isinstance(poptype, str):
+        poptype = [poptype]
+    extra = {"surface": (etype,), "pop": (poptype,)}
+    calls = [(COLLECT_TABLES[name][0], extra.get(name, ())) for name in tables]
+    return list(tables), calls
+
+
 class orcaExp:
     """The class meant to handle experiments generated with wailord.
 
@@ -372,23 +750,100 @@ class orcaExp:
     """
 
     def __init__(
-        self, expfolder, deci=3, order_basis=ORDERED_BASIS, order_theory=ORDERED_THEORY
+        self,
+        expfolder,
+        deci=3,
+        order_basis=ORDERED_BASIS,
+        order_theory=ORDERED_THEORY,
+        cache=None,
+        workers=None,
+        executor="process",
+        chunksize=None,
+        discovery=None,
+        manifest=None,
+        units=True,
+        profile=None,
+        backend=None,
     ):
         """Initializes base parameters
 
 
         Args:
-            expfolder (:obj:`Path`): Output path to the generated wailord experiment
+            expfolder (:obj:`Path`): Output path to the generated wailord
+                experiment, or an archive of it (see `wailord.io.archive`)
             order_basis (:obj:`list`, optional): An ordered list for the basis
                 sets. Defaults to `ORDERED_BASIS`
             order_theory (:obj:`list`, optional): An ordered list for the basis
                 sets. Defaults to `ORDERED_THEORY`. Unlike `order_basis` is can
                 vary significantly across experiments.
+            cache (optional): Persistent parse cache. Either a `ParseCache`,
+                a path for one, or `True` for the default user cache
+                directory. Defaults to `None`, which parses every output.
+            workers (int, optional): Parallel workers for the `get_*`
+                collectors, ``-1`` uses every CPU. Defaults to `None` (serial)
+            executor (optional): ``"process"``, ``"thread"`` (for I/O bound
+                shared filesystems), ``"serial"`` or an `Executor` instance.
+                Defaults to ``"process"``
+            chunksize (int, optional): Outputs per submitted task. Defaults to
+                about four tasks per worker.
+            discovery (:obj:`Discovery`, optional): Rules for finding outputs.
+                Defaults to ``*.out`` files which are not scheduler logs.
+            manifest (optional): Job directory manifest (see
+                `wailord.io.discover.write_manifest`) to list instead of
+                walking the tree; `True` uses the one in `expfolder` when it
+                exists. Defaults to `None`, which takes the outputs and their
+                run information from the generation manifest of `expfolder`
+                (see `wailord.io.discover.GENERATION_MANIFEST`) and walks
+                trees without one; `False` always walks.
+            units (bool, optional): Pint columns in the tables. Otherwise they
+                are float64 with their units in ``attrs["units"]`` and unit
+                columns hold strings, which is much cheaper for large
+                experiments (see `wailord.units`). Defaults to True.
+            profile (optional): Record the time, bytes read and backend of
+                every parsed output into a `ParseProfile` (see
+                `wailord.io.profile`), or `True` for a new one. Defaults to
+                `None`, which follows the ``WAILORD_PROFILE`` environment
+                variable; `False` never records.
+            backend (optional): Grammar or regex backend of each section, a
+                `BackendPolicy` or modes for one (see
+                `wailord.io.backend`). Defaults to a new policy with the
+                ``WAILORD_BACKEND`` modes, the grammar unless set; its
+                ``"auto"`` choices are kept for this experiment only.
         """
         self.inpconf = None  #: Populated by `handle_exp`
         self.orclist = None  #: Populated by `handle_exp`
         self.order_basis = order_basis
         self.order_theory = order_theory
+        if cache is True:
+            cache = ParseCache()
+        elif cache is not None and not isinstance(cache, ParseCache):
+            cache = ParseCache(cache)
+        self.cache = cache
+        self.workers = workers
+        self.executor = executor
+        self.chunksize = chunksize
+        self.discovery = discovery or Discovery()
+        self.manifest = manifest
+        self.units = units
+        if profile is None:
+            profile = parse_profile.from_env()
+        elif profile is True:
+            profile = parse_profile.ParseProfile()
+        #: The `ParseProfile` filled in by the collectors, or None
+        self.profile = profile or None
+        if backend is None:
+            backend = default_policy()
+        elif not isinstance(backend, BackendPolicy):
+            backend = BackendPolicy(backend)
+        #: The `BackendPolicy` of the collectors
+        self.backend = backend
+        #: Output path to its `OutputState` when its results were ingested,
+        #: see `refresh`; ``terminated`` is None for outputs served from the
+        #: cache, whose tails are not read
+        self.ingested = {}
+        self._jobs = {}  #: Output path to its run information, if generated
+        self._memo = {}
+        self._runs = None
         self.handle_exp(expfolder)
 
     def __repr__(self):
@@ -410,17 +865,361 @@ class orcaExp:
             efol (:obj:`Path`): Output path
 
         """
-        fnames = []
-        orca_config_path = Path(efol) / "orca.yml"
-        with orca_config_path.open(mode="r") as ymlfile:
+        self.expfolder = Path(efol)
+        orca_config_path = self.expfolder / "orca.yml"
+        with open_output(orca_config_path) as ymlfile:
             self.inpconf = yaml.safe_load(ymlfile)
-        for root, dirs, files in os.walk(efol.resolve()):
-            for filename in files:
-                if "out" in filename and "slurm" not in filename:
-                    fnames.append(Path(f"{root}/{filename}"))
-        self.orclist = fnames
+        with self._timed("discover"):
+            self.orclist = list(self.iter_outputs())
+        self._runs = None
         return
 
+    def _timed(self, stage):
+        """Times a stage into the `profile` and the active `profiling` blocks"""
+        stack = contextlib.ExitStack()
+        for prof in parse_profile.active(self.profile):
+            stack.enter_context(prof.timed(stage))
+        return stack
+
+    def iter_outputs(self):
+        """Lazily yields the experiment's outputs
+
+        Uses the generation manifest by default, or the job directory
+        manifest when one was given (and found); otherwise walks the tree
+        with the experiment's `Discovery` rules. The tree is walked too when
+        no generated job has written its recorded output.
+
+        Yields:
+            :obj:`Path`: Absolute output paths
+        """
+        jobdirs = None
+        if self.manifest is None:
+            records = read_job_records(self.expfolder)
+            found = False
+            for ofile, record in self.discovery.iter_jobs(
+                self.expfolder, records or []
+            ):
+                self._jobs[ofile] = _record_runinfo(record)
+                found = True
+                yield ofile
+            if found:
+                return
+            if records:
+                warnings.warn(
+                    f"None of the {len(records)} generated jobs of "
+                    f"{self.expfolder} has an output, walking the tree instead"
+                )
+        elif self.manifest is True:
+            jobdirs = read_manifest(self.expfolder)
+        elif self.manifest is not False:
+            jobdirs = read_manifest(self.manifest)
+        yield from self.discovery.iter_outputs(self.expfolder, jobdirs=jobdirs)
+
+    def run_info(self, paths=None):
+        """Run information of some (default all) outputs, from the generation
+        manifest where there is one and from their paths otherwise (see
+        `getRunInfo`)
+
+        Returns:
+            list: A dictionary of `RUN_COLUMNS` per output
+        """
+        paths = self.orclist if paths is None else paths
+        return [
+            self._jobs.get(runf) or getRunInfo(Path(runf).parent) for runf in paths
+        ]
+
+    def _collect(self, *calls, missing_ok=False):
+        """Columnar batches of `_OrcaRun` extractor calls over `orclist`
+
+        Every output is visited at most once, whatever the number of calls.
+        Results already ingested by this experiment are reused, then cached
+        results are served; the remaining calls are parsed by the configured
+        executor and stored back in the cache.
+
+        Args:
+            calls: ``(extractor, args)`` pairs
+            missing_ok (bool, optional): Give None for the calls which raise
+                one of `NO_RESULT`, instead of raising. Defaults to False.
+
+        Returns:
+            list: For every call, one batch per output in `orclist` order
+        """
+        paths = list(self.orclist)
+        memos = [self._memo.setdefault(_call_key(*call), {}) for call in calls]
+        batches = [[memo.get(runf) for runf in paths] for memo in memos]
+        items, stamps = [], []
+        for num, runf in enumerate(paths):
+            missing = []
+            # One stamp per output serves the cache lookups, the cache writes
+            # and the ingested state
+            stamp = None
+            for cnum, (extractor, args) in enumerate(calls):
+                if batches[cnum][num] is not None:
+                    continue
+                if self.cache is not None:
+                    stamp = stamp or self.cache.stamp(runf)
+                    cached = self.cache.get(
+                        runf, extractor, args, stamp, self._parsed_by(extractor)
+                    )
+                    if cached is not None:
+                        batches[cnum][num] = narrow_batch(cached, RUN_COLUMNS)
+                if batches[cnum][num] is None:
+                    missing.append(cnum)
+                else:
+                    memos[cnum][runf] = batches[cnum][num]
+            if missing:
+                items.append((num, missing))
+                if self.cache is not None:
+                    stamps.append(stamp)
+            if runf not in self.ingested:
+                if stamp is None:
+                    stat = output_stat(runf)
+                    stamp = (stat.st_size, stat.st_mtime_ns)
+                # Only outputs about to be parsed have their tail read
+                terminated = _terminated(runf) if missing else None
+                self.ingested[runf] = OutputState(*stamp[:2], terminated)
+        with self._timed("backend"):
+            self._choose_backends(paths, items, calls)
+        profiles = parse_profile.active(self.profile)
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(self._timed("collect"))
+            if self.profile is not None:
+                stack.enter_context(self.profile.hooks())
+            parsed = run_chunks(
+                _extract_batches,
+                [
+                    (
+                        paths[num],
+                        [calls[cnum] for cnum in missing],
+                        self._jobs.get(paths[num]),
+                    )
+                    for num, missing in items
+                ],
+                (bool(profiles), self.backend.resolved(), missing_ok),
+                workers=self.workers,
+                executor=self.executor,
+                chunksize=self.chunksize,
+            )
+        if profiles:
+            for prof in profiles:
+                prof.add(rec for _, records in parsed for rec in records)
+            parsed = [batches for batches, _ in parsed]
+        for pos, ((num, missing), results) in enumerate(zip(items, parsed)):
+            for cnum, batch in zip(missing, results):
+                batches[cnum][num] = batch
+                if batch is None:
+                    # Nothing to keep, asking again raises the error
+                    continue
+                memos[cnum][paths[num]] = batch
+                if self.cache is not None:
+                    extractor, args = calls[cnum]
+                    self.cache.put(
+                        paths[num],
+                        extractor,
+                        args,
+                        batch,
+                        stamps[pos],
+                        self._parsed_by(extractor),
+                    )
+        if self.cache is not None:
+            self.cache.commit()
+        return batches
+
+    def _parsed_by(self, extractor):
+        """Backend answering an extractor under the `backend` policy, part of
+        its cache key; undecided ``"auto"`` sections try the grammar first.
+        None for extractors without a grammar parser."""
+        section = EXTRACTOR_SECTIONS.get(extractor)
+        if section is None:
+            return None
+        return "regex" if self.backend.resolve(section) == "regex" else "grammar"
+
+    def _choose_backends(self, paths, items, calls):
+        """Compares both backends of the undecided sections of *calls* on the
+        first outputs to be parsed, until the `backend` policy decides"""
+        for cnum, (extractor, args) in enumerate(calls):
+            section = self.backend.undecided(extractor)
+            if section is None:
+                continue
+            todo = [paths[num] for num, missing in items if cnum in missing]
+            # Outputs without the section are skipped, within limits
+            for runf in todo[: 4 * self.backend.samples]:
+                if self.backend.resolve(section) != "auto":
+                    break
+                try:
+                    trial = _backend_trial(
+                        runf, extractor, args, section, self._jobs.get(runf)
+                    )
+                except Exception:
+                    continue
+                self.backend.record(trial)
+
+    def _fact_batches(self, *calls):
+        """For every call, the results of all outputs as one fact batch (see
+        `wailord.io._table.stack_facts`)"""
+        return [stack_facts(batches) for batches in self._collect(*calls)]
+
+    def _facts_frame(self, batch):
+        facts = from_batch(batch, units=self.units)
+        if self.units and "unit" in facts:
+            # Collectors parse without pint, which names the unit instead
+            facts["unit"] = pd.Series(
+                [ureg.Unit(val) for val in facts["unit"]], dtype=object
+            )
+        facts.insert(0, "run_id", batch["run_id"])
+        facts.attrs["run_columns"] = batch["run_columns"]
+        return facts
+
+    @property
+    def runs(self):
+        """Run table: ``run_id`` (position in `orclist`), ``path`` and the
+        `RUN_COLUMNS` as categoricals, one row per output"""
+        if self._runs is None:
+            runs = pd.DataFrame(
+                self.run_info(),
+                columns=list(RUN_COLUMNS),
+            )
+            for name in RUN_COLUMNS:
+                runs[name] = runs[name].astype("category")
+            runs.insert(0, "path", pd.Series([str(runf) for runf in self.orclist]))
+            runs.insert(0, "run_id", np.arange(len(runs), dtype=np.int64))
+            self._runs = runs
+        return self._runs
+
+    def facts(self, table="energy", **kwargs):
+        """Narrow experiment table, keyed by ``run_id`` into `runs`
+
+        The run metadata is not repeated in every row; `join_runs` (or the
+        ``get_*`` methods) give the wide layout.
+
+        Args:
+            table (str, optional): Key of `COLLECT_TABLES`. Defaults to
+                ``"energy"``
+            **kwargs: ``etype``/``poptype``, as for `collect`
+
+        Returns:
+            :obj:`pd.DataFrame`: ``run_id`` and the extracted columns, in
+            `orclist` order
+        """
+        _, calls = _table_calls([table], **kwargs)
+        (batch,) = self._fact_batches(*calls)
+        return self._facts_frame(batch)
+
+    def _wide(self, batch):
+        """The ``get_*`` layout of a fact batch"""
+        return join_runs(self._facts_frame(batch), self.runs)
+
+    def _forget(self, paths):
+        """Drops ingested results of some outputs"""
+        for runf in paths:
+            self.ingested.pop(runf, None)
+            for memo in self._memo.values():
+                memo.pop(runf, None)
+
+    def refresh(self):
+        """Picks up outputs which appeared or changed since they were ingested
+
+        The tree is rediscovered and only new outputs, outputs whose size or
+        modification time differ from the ingested state, and outputs which had
+        not terminated when they were ingested (e.g. jobs still running) are
+        parsed again.
+        Tables requested so far are brought up to date straight away, later
+        `get_*` calls just reuse the ingested rows.
+
+        Returns:
+            list: The new or changed outputs
+        """
+        found = list(self.iter_outputs())
+        known = set(found)
+        self._forget([runf for runf in self.ingested if runf not in known])
+        changed = []
+        for runf in found:
+            state = self.ingested.get(runf)
+            if state is None:
+                changed.append(runf)
+                continue
+            stat = output_stat(runf)
+            if (stat.st_size, stat.st_mtime_ns) != state[:2]:
+                changed.append(runf)
+            elif state.terminated is False:
+                changed.append(runf)
+        self._forget(changed)
+        if found != self.orclist:
+            self._runs = None
+        self.orclist = found
+        if changed and self._memo:
+            calls = [_call_from_key(key) for key in self._memo]
+            self._collect(*calls)
+        return changed
+
+    def watch(self, interval=60.0, use_inotify=True):
+        """Refreshes the experiment whenever outputs land
+
+        On Linux with ``inotify_simple`` installed, waits for files in the tree
+        to be written, moved in or created (new directories are watched as
+        they appear); otherwise polls every *interval* seconds.
+
+        Args:
+            interval (float, optional): Polling period, and the longest wait
+                for inotify events, in seconds. Defaults to 60.
+            use_inotify (bool, optional): Use inotify when it is available.
+                Defaults to True.
+
+        Yields:
+            list: The outputs picked up by each `refresh` which found any
+
+        Example:
+            >>> for changed in expt.watch():
+            ...     print(expt.get_final_sp_energy())
+        """
+        # Archives do not change while they are read
+        watched = use_inotify and not is_archive(self.expfolder)
+        notify = _inotify_watcher(self.expfolder) if watched else None
+        try:
+            while True:
+                if notify is None:
+                    time.sleep(interval)
+                else:
+                    notify.wait(interval)
+                changed = self.refresh()
+                if changed:
+                    yield changed
+        finally:
+            if notify is not None:
+                notify.close()
+
+    def _table(self, extractor, *args):
+        """One data frame of an extractor's results over `orclist`"""
+        (batch,) = self._fact_batches((extractor, args))
+        return self._wide(batch)
+
+    def _order(self, frame, by=("theory", "basis")):
+        """Casts basis and theory to the experiment's ordered categories and
+        sorts the frame"""
+        basis_type = CategoricalDtype(categories=self.order_basis, ordered=True)
+        theory_type = CategoricalDtype(categories=self.order_theory, ordered=True)
+        frame["basis"] = frame["basis"].astype(basis_type)
+        frame["theory"] = frame["theory"].astype(theory_type)
+        frame.sort_values(by=list(by), ignore_index=True, inplace=True)
+        return frame
+
+    def invalidate_cache(self, paths=None):
+        """Forgets cached results for some (default all) outputs of the
+        experiment
+
+        Args:
+            paths (:obj:`list` of :obj:`Path`, optional): Outputs to forget.
+                Defaults to `orclist`.
+
+        Returns:
+            int: Number of cache entries removed
+        """
+        paths = self.orclist if paths is None else paths
+        self._forget(paths)
+        if self.cache is None:
+            return 0
+        return self.cache.invalidate(paths)
+
     def get_final_sp_energy(self):
         """Returns a datframe of only the final single point energies
 
@@ -432,19 +1231,33 @@ class orcaExp:
         Returns:
             pd.DataFrame: Returns a data frame of final energies
         """
-        edatl = []
-        for runf in self.orclist:
-            runorc = _OrcaRun(runf).final_sp_e()
-            edatl.append(runorc)
-        fe = pd.DataFrame(edatl)
-        basis_type = CategoricalDtype(categories=self.order_basis, ordered=True)
-        theory_type = CategoricalDtype(categories=self.order_theory, ordered=True)
-        fe["basis"] = fe["basis"].astype(basis_type)
-        fe["theory"] = fe["theory"].astype(theory_type)
-        fe.sort_values(
-            by=["theory", "basis", "final_sp_energy"], ignore_index=True, inplace=True
+        return self._order(
+            self._table("final_sp_e"), COLLECT_TABLES["energy"][1]
         )
-        return fe
+
+    def final_energies(self):
+        """Fast sweep of the final single point energies
+
+        Only the tail of every output is read (see `final_energy`) and no
+        `_OrcaRun` is built, so this scales to very large experiments. Outputs
+        without an energy (e.g. failed or running jobs) give NaN instead of
+        raising.
+
+        Returns:
+            pd.DataFrame: The columns of `get_final_sp_energy`, same order
+        """
+        paths = list(self.orclist)
+        energies = run_chunks(
+            _final_energies,
+            paths,
+            workers=self.workers,
+            executor=self.executor,
+            chunksize=self.chunksize,
+        )
+        fe = pd.DataFrame(self.run_info(paths))
+        fe["final_sp_energy"] = np.asarray(energies, dtype=float)
+        fe["unit"] = [ureg.hartree if self.units else "hartree"] * len(fe)
+        return self._order(fe, COLLECT_TABLES["energy"][1])
 
     def get_ir_spec(self):
         """Returns a datframe of the "ir spectrum"
@@ -457,18 +1270,7 @@ class orcaExp:
         Returns:
             pd.DataFrame: Returns a data frame of frequencies
         """
-        vdatl = []
-        for runf in self.orclist:
-            runorc = _OrcaRun(runf).ir_spec()
-            vdatl.append(runorc)
-        ve = pd.concat(vdatl, axis=0)
-        ve = ve.drop_duplicates()
-        basis_type = CategoricalDtype(categories=self.order_basis, ordered=True)
-        theory_type = CategoricalDtype(categories=self.order_theory, ordered=True)
-        ve["basis"] = ve["basis"].astype(basis_type)
-        ve["theory"] = ve["theory"].astype(theory_type)
-        ve.sort_values(by=["theory", "basis"], ignore_index=True, inplace=True)
-        return ve
+        return self._order(self._table("ir_spec").drop_duplicates())
 
     def get_vib_freq(self):
         """Returns a datframe of the vibrational modes
@@ -481,18 +1283,7 @@ class orcaExp:
         Returns:
             pd.DataFrame: Returns a data frame of frequencies
         """
-        vdatl = []
-        for runf in self.orclist:
-            runorc = _OrcaRun(runf).vib_freq()
-            vdatl.append(runorc)
-        ve = pd.concat(vdatl, axis=0)
-        ve = ve.drop_duplicates()
-        basis_type = CategoricalDtype(categories=self.order_basis, ordered=True)
-        theory_type = CategoricalDtype(categories=self.order_theory, ordered=True)
-        ve["basis"] = ve["basis"].astype(basis_type)
-        ve["theory"] = ve["theory"].astype(theory_type)
-        ve.sort_values(by=["theory", "basis"], ignore_index=True, inplace=True)
-        return ve
+        return self._order(self._table("vib_freq").drop_duplicates())
 
     def get_vpt2_transitions(self):
         """Returns a datframe of the fundamental transitions table
@@ -505,18 +1296,7 @@ class orcaExp:
         Returns:
             pd.DataFrame: Returns a data frame of frequencies
         """
-        vdatl = []
-        for runf in self.orclist:
-            runorc = _OrcaRun(runf).vpt2_transitions()
-            vdatl.append(runorc)
-        ve = pd.concat(vdatl, axis=0)
-        ve = ve.drop_duplicates()
-        basis_type = CategoricalDtype(categories=self.order_basis, ordered=True)
-        theory_type = CategoricalDtype(categories=self.order_theory, ordered=True)
-        ve["basis"] = ve["basis"].astype(basis_type)
-        ve["theory"] = ve["theory"].astype(theory_type)
-        ve.sort_values(by=["theory", "basis"], ignore_index=True, inplace=True)
-        return ve
+        return self._order(self._table("vpt2_transitions").drop_duplicates())
 
     def get_energy_surface(self, etype=["Actual Energy", "SCF Energy"]):
         """Populates an energy surface dataframe
@@ -534,20 +1314,8 @@ class orcaExp:
         """
         if type(etype) == str:
             etype = [etype]
-        edatl = []
-        for runf in self.orclist:
-            runsurf = _OrcaRun(runf).mult_energy_surface(etype=etype)
-            edatl.append(runsurf)
-        edat = pd.concat(edatl, axis=0)
-        edat = edat.drop_duplicates()
-        basis_type = CategoricalDtype(categories=self.order_basis, ordered=True)
-        theory_type = CategoricalDtype(categories=self.order_theory, ordered=True)
-        edat["basis"] = edat["basis"].astype(basis_type)
-        edat["theory"] = edat["theory"].astype(theory_type)
-        edat.sort_values(
-            by=["theory", "basis", "bond_length"], ignore_index=True, inplace=True
-        )
-        return edat
+        edat = self._table("mult_energy_surface", etype).drop_duplicates()
+        return self._order(edat, COLLECT_TABLES["surface"][1])
 
     def get_population(self, poptype=["Mulliken", "Loewdin"], /):
         """Populates a population dataframe
@@ -565,18 +1333,142 @@ class orcaExp:
         """
         if type(poptype) == str:
             poptype = [poptype]
-        popdatl = []
-        for runf in self.orclist:
-            runsurf = _OrcaRun(runf).mult_population_analysis(poptype)
-            popdatl.append(runsurf)
-        popdat = pd.concat(popdatl, axis=0)
-        popdat = popdat.drop_duplicates()
-        basis_type = CategoricalDtype(categories=self.order_basis, ordered=True)
-        theory_type = CategoricalDtype(categories=self.order_theory, ordered=True)
-        popdat["basis"] = popdat["basis"].astype(basis_type)
-        popdat["theory"] = popdat["theory"].astype(theory_type)
-        popdat.sort_values(by=["theory", "basis"], ignore_index=True, inplace=True)
-        return popdat
+        popdat = self._table("mult_population_analysis", poptype)
+        return self._order(popdat.drop_duplicates())
+
+    def get_population_arrays(self, poptype=["Mulliken", "Loewdin"], /):
+        """Population analyses of every run as stacked arrays
+
+        Every output is scanned once for all requested types (see
+        `read_populations`), and the per-run arrays are stacked instead of
+        concatenating data frames.
+
+        Args:
+            poptype (:obj:`list` of :obj:`str`, optional): Population analyses.
+                Defaults to Mulliken and Loewdin.
+
+        Returns:
+            tuple: The runs (run information and ``run_id``, the position in
+            `orclist`), sorted as `get_population`, and a dict of population
+            type to :obj:`Populations` whose arrays follow that row order:
+            ``symbols`` ``(n_runs, n_atoms)``, ``charges`` and ``spins``
+            ``(n_runs, n_steps, n_atoms)``, padded with ``""`` and NaN to the
+            largest run (``spins`` is None if no run has spin populations)
+        """
+        if isinstance(poptype, str):
+            poptype = [poptype]
+        paths = list(self.orclist)
+        pops = run_chunks(
+            _population_arrays,
+            paths,
+            args=(tuple(poptype),),
+            workers=self.workers,
+            executor=self.executor,
+            chunksize=self.chunksize,
+        )
+        runs = pd.DataFrame(self.run_info(paths))
+        runs.insert(0, "run_id", np.arange(len(paths)))
+        runs = self._order(runs)
+        order = runs["run_id"].to_numpy()
+        arrays = {
+            pt: _stack_populations([pops[num][pt] for num in order]) for pt in poptype
+        }
+        return runs, arrays
+
+    def collect(
+        self,
+        tables=("energy", "vib", "ir", "vpt2", "pop", "surface"),
+        etype=["Actual Energy", "SCF Energy"],
+        poptype=["Mulliken", "Loewdin"],
+    ):
+        """Several experiment tables from a single pass over the outputs
+
+        Each output is read and indexed once for all of the requested tables,
+        instead of once per `get_*` call.
+
+        Args:
+            tables (:obj:`list` of :obj:`str`, optional): Keys of
+                `COLLECT_TABLES`. Defaults to all of them.
+            etype (:obj:`list` of :obj:`str`, optional): Surfaces for
+                ``"surface"``, as in `get_energy_surface`
+            poptype (:obj:`list` of :obj:`str`, optional): Populations for
+                ``"pop"``, as in `get_population`
+
+        Returns:
+            dict: Data frames keyed by table name, ordered and sorted as by the
+            corresponding `get_*` methods
+
+        Example:
+            >>> tabs = expt.collect(["energy", "ir"])
+            >>> tabs["energy"]
+        """
+        tables, calls = _table_calls(tables, etype, poptype)
+        out = {}
+        for name, batch in zip(tables, self._fact_batches(*calls)):
+            _, order, dedupe = COLLECT_TABLES[name]
+            frame = self._wide(batch)
+            if dedupe:
+                frame = frame.drop_duplicates()
+            out[name] = self._order(frame, order)
+        return out
+
+    def to_arrow(self, table="energy", **kwargs):
+        """One experiment table as an Arrow table
+
+        Args:
+            table (str, optional): Key of `COLLECT_TABLES`. Defaults to
+                ``"energy"``
+            **kwargs: ``etype``/``poptype``, passed on to `collect`
+
+        Returns:
+            :obj:`pyarrow.Table`: See `wailord.io.arrow.to_arrow`
+        """
+        return arrow.to_arrow(self.collect([table], **kwargs)[table])
+
+    def to_parquet(
+        self, path, tables=("energy",), partition_cols=arrow.PARTITION_COLS, **kwargs
+    ):
+        """Writes experiment tables as Parquet datasets, one per table
+
+        Args:
+            path (:obj:`Path`): Directory, each table goes to ``path / name``
+            tables (:obj:`list` of :obj:`str`, optional): Keys of
+                `COLLECT_TABLES`, gathered in one `collect` pass. Defaults to
+                the final energies.
+            partition_cols (:obj:`list`, optional): Partitioning columns.
+                Defaults to theory and basis.
+            **kwargs: ``etype``/``poptype``, passed on to `collect`
+
+        Returns:
+            dict: Dataset directory of every table, read them back with
+            `wailord.io.arrow.read_parquet`
+        """
+        path = Path(path)
+        return {
+            name: arrow.write_parquet(frame, path / name, partition_cols)
+            for name, frame in self.collect(tables, **kwargs).items()
+        }
+
+    def to_store(self, path, tables=None, trajectories=True, **kwargs):
+        """Writes the experiment to a single HDF5 store
+
+        Args:
+            path (:obj:`Path`): The ``.h5`` file, overwritten if present
+            tables (:obj:`list` of :obj:`str`, optional): Keys of
+                `COLLECT_TABLES` to store. Defaults to every table which all
+                outputs hold; the others are listed by
+                `wailord.io.store.ExperimentStore.lacking`.
+            trajectories (bool, optional): Also store the geometries and
+                energies of every step. Defaults to True.
+            **kwargs: ``etype``/``poptype``, passed on to `collect`
+
+        Returns:
+            :obj:`Path`: The store, open it with
+            `wailord.io.store.ExperimentStore`
+        """
+        from wailord.io.store import write_store
+
+        return write_store(self, path, tables, trajectories, **kwargs)
 
     def visit_meta(self, node, visited_children):
         """Returns the overall output."""
@@ -595,15 +1487,10 @@ class orcaExp:
 
 
 
-def _vib_via_chemparseplot(path):
-    try:
-        from chemparseplot.parse.orca.freq import parse_orca_vibrational_frequencies
-    except ImportError:
-        return None
-    modes = parse_orca_vibrational_frequencies(path)
+def _vib_via_chemparseplot(parse, path):
+    modes = parse(path)
     if not modes:
         return None
-    import pandas as pd
     rows = [
         {"Mode": m.mode, "freq": m.freq_cm1, "imaginary": m.imaginary}
         for m in modes
@@ -616,16 +1503,8 @@ def _vib_via_chemparseplot(path):
     return vdat
 
 
-def _vpt2_via_chemparseplot(path):
-    try:
-        from chemparseplot.parse.orca.vpt2 import parse_orca_vpt2_fundamentals
-    except ImportError:
-        return None
-    try:
-        rows = parse_orca_vpt2_fundamentals(path)
-    except ValueError:
-        return None
-    import pandas as pd
+def _vpt2_via_chemparseplot(parse, path):
+    rows = parse(path)
     vdat = pd.DataFrame(
         [
             {
@@ -645,15 +1524,10 @@ def _vpt2_via_chemparseplot(path):
     return vdat
 
 
-def _ir_via_chemparseplot(path):
-    try:
-        from chemparseplot.parse.orca.freq import parse_orca_ir_spectrum
-    except ImportError:
-        return None
-    modes = parse_orca_ir_spectrum(path, backend="text")
+def _ir_via_chemparseplot(parse, path):
+    modes = parse(path, backend="text")
     if not modes:
         return None
-    import pandas as pd
     vdat = pd.DataFrame(
         [
             {
@@ -675,16 +1549,8 @@ def _ir_via_chemparseplot(path):
     return vdat
 
 
-def _pop_via_chemparseplot(path, poptype):
-    try:
-        from chemparseplot.parse.orca.populations import parse_orca_populations
-    except ImportError:
-        return None
-    try:
-        rows = parse_orca_populations(path, kind=poptype)
-    except (ValueError, TypeError):
-        return None
-    import pandas as pd
+def _pop_via_chemparseplot(parse, path, poptype):
+    rows = parse(path, kind=poptype)
     data = []
     for r in rows:
         d = {"anum": r.atom_index, "atype": r.symbol, "pcharge": r.charge}
@@ -694,10 +1560,259 @@ def _pop_via_chemparseplot(path, poptype):
     if not data:
         return None
     popdat = pd.DataFrame(data)
+    # The layout of the regex decoders: atom numbers as text, one block of
+    # atoms per step, a new block starting whenever the numbering restarts
+    anum = popdat["anum"].to_numpy(dtype=np.int64)
+    popdat["step"] = np.cumsum(np.r_[True, np.diff(anum) <= 0])
+    popdat["anum"] = popdat["anum"].astype(str)
     popdat["population"] = poptype
     return popdat
 
 
+#: Exceptions of extractors run on an output without their section
+NO_RESULT = (ValueError, KeyError, IndexError, NotImplementedError)
+
+
+def _extract_batches(items, record=False, backends=None, missing_ok=False):
+    """Executor task: `_OrcaRun` extractors over a chunk of outputs
+
+    Args:
+        items (list): ``(path, calls, runinfo)`` triples, where ``calls`` is
+            a list of ``(extractor, args)``, all sharing a single read of the
+            output, and ``runinfo`` its run information (or None)
+        record (bool, optional): Also return a :obj:`ParseRecord` per call.
+            Defaults to False.
+        backends (dict, optional): Section to backend, see `_OrcaRun`
+        missing_ok (bool, optional): A call raising one of `NO_RESULT` gives
+            None (and no record) instead of failing the chunk. Defaults to
+            False.
+
+    Returns:
+        list: For every item, one columnar batch per call; with *record*,
+        the batches and the records of the item as a pair
+    """
+    out = []
+    for runf, calls, runinfo in items:
+        # Batches hold magnitudes anyway, so skip building pint columns
+        run = _OrcaRun(runf, units=False, backends=backends, runinfo=runinfo)
+        try:
+            batches, records = [], []
+            for extractor, args in calls:
+                try:
+                    result, rec = run.call(extractor, *args)
+                except NO_RESULT:
+                    if not missing_ok:
+                        raise
+                    batches.append(None)
+                    continue
+                batches.append(narrow_batch(to_batch(result), RUN_COLUMNS))
+                records.append(rec)
+            out.append((batches, records) if record else batches)
+        finally:
+            run.close()
+    return out
+
+
+def _backend_trial(runf, extractor, args, section, runinfo=None):
+    """Runs an extractor on one output with the regex decoders, then with the
+    grammar parser of *section*, and compares the results
+
+    Both runs read and index the output before the timed call, as the
+    collectors share that work between all the extractors of an output.
+
+    Returns:
+        :obj:`BackendTrial`: The timings, and whether the grammar answered
+        and agreed with the regex decoders
+    """
+    results = {}
+    for name in ("regex", "grammar"):
+        run = _OrcaRun(
+            runf, units=False, backends={section: name}, runinfo=runinfo
+        )
+        try:
+            run.index
+            results[name] = run.call(extractor, *args)
+        finally:
+            run.close()
+    (regex, regex_rec), (grammar, grammar_rec) = results["regex"], results["grammar"]
+    agree = grammar_rec.backend == "grammar" and _same_result(grammar, regex)
+    return BackendTrial(
+        section, str(runf), grammar_rec.seconds, regex_rec.seconds, agree
+    )
+
+
+def _same_result(first, second, rtol=1e-6):
+    """Whether two extractor results have the same columns, with the same
+    dtypes, holding the same values (converting units where they differ)"""
+    first, second = to_batch(first), to_batch(second)
+    if first["kind"] != second["kind"] or first["dtypes"] != second["dtypes"]:
+        return False
+    if set(first["columns"]) != set(second["columns"]):
+        return False
+    values = [name for name in first["columns"] if name not in RUN_COLUMNS]
+    if not values:
+        return False
+    for name in values:
+        one, other = first["columns"][name], second["columns"][name]
+        if one.dtype != other.dtype or len(one) != len(other):
+            return False
+        if one.dtype.kind in "biuf" and other.dtype.kind in "biuf":
+            units = first["units"].get(name), second["units"].get(name)
+            if all(units) and units[0] != units[1]:
+                one = one * factor(*units)
+            if not np.allclose(one, other, rtol=rtol, equal_nan=True):
+                return False
+        elif not np.array_equal(one.astype(str), other.astype(str)):
+            return False
+    return True
+
+
+#: Rows of the legacy tables: mode numbers may be followed by an imaginary flag
+_VIB_ROW = re.compile(
+    rb"^[ \t]*(\d+):[ \t]+(-?\d+\.\d+)[ \t]+cm\*\*-1([^\n]*imaginary)?", re.M
+)
+_VIB_COLUMNS = {"Mode": np.int64, "freq": np.float64, "imaginary": bool}
+_IR_COLUMNS = {
+    "Mode": np.int64,
+    "freq": np.float64,
+    "T2": np.float64,
+    "TX": np.float64,
+    "TY": np.float64,
+    "TZ": np.float64,
+}
+_VPT2_COLUMNS = {
+    "Mode": np.int64,
+    "harmonic_freq": np.float64,
+    "vpt2_freq": np.float64,
+    "freq_diff": np.float64,
+}
+_VPT2_END = re.compile(rb"^[^\n]*---", re.M)
+_POP_COLUMNS = {"anum": str, "atype": str, "pcharge": np.float64}
+_SPIN_POP_COLUMNS = dict(_POP_COLUMNS, pspin=np.float64)
+_POP_END = re.compile(rb"^(?:[ \t\r]*$|[^\n]*Sum)", re.M)
+
+
+Populations = namedtuple("Populations", "symbols charges spins")
+
+
+def _population_blocks(buf, index, poptype):
+    """Decoded rows of every block of one population type"""
+    parts = []
+    for pos in index.offsets[poptype]:
+        spin = "SPIN" in buf.line(pos)
+        columns = _SPIN_POP_COLUMNS if spin else _POP_COLUMNS
+        bounds = table_bounds(buf, pos, skip=1, stop=_POP_END)
+        parts.append(decode_table(buf.data, *bounds, columns, delete=b":"))
+    return parts
+
+
+def _populations(buf, index, poptype):
+    """`Populations` of one type from an indexed buffer; see `read_populations`"""
+    parts = _population_blocks(buf, index, poptype)
+    parts = [part for part in parts if part["anum"].size]
+    if not parts:
+        return Populations(
+            symbols=np.empty(0, dtype=str), charges=np.empty((0, 0)), spins=None
+        )
+    natoms = parts[0]["anum"].size
+    if any(part["anum"].size != natoms for part in parts):
+        raise (ValueError(f"{poptype} blocks of {buf.path} differ in size"))
+    spins = None
+    if any("pspin" in part for part in parts):
+        spins = np.stack(
+            [part.get("pspin", np.full(natoms, np.nan)) for part in parts]
+        )
+    return Populations(
+        symbols=parts[0]["atype"],
+        charges=np.stack([part["pcharge"] for part in parts]),
+        spins=spins,
+    )
+
+
+def read_populations(ofile, poptype=("Mulliken", "Loewdin")):
+    """Atomic charges (and spin populations) of every step of a run
+
+    All requested population types are located in a single pass over the
+    output, and each is decoded into arrays instead of one row per atom.
+
+    Args:
+        ofile (:obj:`Path`): The output file
+        poptype (:obj:`list` of :obj:`str`, optional): Population analyses.
+            Defaults to Mulliken and Loewdin.
+
+    Returns:
+        dict: Population type to :obj:`Populations`, with ``symbols``
+        (``(n_atoms,)`` str), ``charges`` (``(n_steps, n_atoms)`` float64)
+        and ``spins`` (same shape, or None for closed shell blocks); no
+        steps if the analysis is absent
+
+    Raises:
+        ValueError: If the blocks of one type have different atom counts
+    """
+    if isinstance(poptype, str):
+        poptype = [poptype]
+    unknown = [pt for pt in poptype if pt not in OUT_REGEX]
+    if unknown:
+        raise (NotImplementedError(f"{unknown} have not been implemented yet"))
+    with OutBuffer(ofile) as buf:
+        index = SectionIndex(buf, {key: SECTION_MARKERS[key] for key in poptype})
+        return {pt: _populations(buf, index, pt) for pt in poptype}
+
+
+def _population_arrays(paths, poptype):
+    """Executor task: `read_populations` of a chunk of outputs"""
+    return [read_populations(runf, poptype) for runf in paths]
+
+
+def _stack_populations(pops):
+    """`Populations` of several runs, padded to the longest run and the
+    largest molecule"""
+    nsteps = max((len(pop.charges) for pop in pops), default=0)
+    natoms = max((len(pop.symbols) for pop in pops), default=0)
+    symbols = np.full((len(pops), natoms), "", dtype=object)
+    charges = np.full((len(pops), nsteps, natoms), np.nan)
+    spins = np.full_like(charges, np.nan)
+    for num, pop in enumerate(pops):
+        steps, atoms = pop.charges.shape
+        symbols[num, :atoms] = pop.symbols
+        charges[num, :steps, :atoms] = pop.charges
+        if pop.spins is not None:
+            spins[num, :steps, :atoms] = pop.spins
+    has_spins = any(pop.spins is not None for pop in pops)
+    return Populations(
+        symbols=symbols.astype(str), charges=charges, spins=spins if has_spins else None
+    )
+
+
+def _stack_rows(parts, columns):
+    """Concatenates tables from `decode_table` column by column; columns
+    missing from a part are NaN"""
+    out = {}
+    for name, dtype in columns.items():
+        if dtype is None:
+            continue
+        arrays = []
+        for part in parts:
+            nrows = len(next(iter(part.values())))
+            arrays.append(part[name] if name in part else np.full(nrows, np.nan))
+        empty = np.empty(0, dtype=object if dtype is str else dtype)
+        out[name] = np.concatenate(arrays) if arrays else empty
+    return out
+
+
+def _match_axis(axis, xvals, atol):
+    """Position in *xvals* of every value of *axis*, the first one within
+    *atol*, or -1 where there is none"""
+    if not len(xvals):
+        return np.full(len(axis), -1, dtype=np.intp)
+    order = np.argsort(xvals, kind="stable")
+    ordered = xvals[order]
+    pos = np.searchsorted(ordered, axis - atol, side="left")
+    pos = np.minimum(pos, len(ordered) - 1)
+    hit = np.abs(ordered[pos] - axis) <= atol
+    return np.where(hit, order[pos], -1)
+
+
 class _OrcaRun:
     """Per-output adapter for multi-job experiment tables (``orcaExp``).
 
@@ -707,66 +1822,205 @@ class _OrcaRun:
     ``orcaExp`` assembles across a harness tree.
     """
 
-    def __init__(self, ofile):
+    def __init__(self, ofile, units=True, backends=None, runinfo=None):
         """Args:
             ofile: Path to one ORCA ``.out`` file.
+            units (bool, optional): Pint quantities and columns. Otherwise
+                `fin_sp_e` is a float in hartree and the tables hold float64
+                columns with their units in ``attrs["units"]`` (see
+                `wailord.units`). Defaults to True.
+            backends (dict, optional): Section to ``"grammar"``, ``"regex"``
+                or ``"auto"`` (see `wailord.io.backend`); only ``"regex"``
+                skips the chemparseplot parsers. Defaults to the
+                ``WAILORD_BACKEND`` modes (see `default_policy`).
+            runinfo (dict, optional): `RUN_COLUMNS` of the output, e.g. from
+                its generation record. Defaults to `getRunInfo` of its path.
+
+        Nothing is read until a field or extractor is used; the file is then
+        read once into a shared buffer and indexed in a single pass.
         """
-        self.eeval = None
         self.ofile = ofile
-        self.runinfo = getRunInfo(self.ofile.parent)
-        self.fin_sp_e = None
-        self.get_evals(self.ofile)
-        self.get_final_e()
+        self.units = units
+        self.backends = backends or default_policy().resolved()
+        self.runinfo = runinfo or getRunInfo(self.ofile.parent)
+        self._buf = None
+        self._index = None
+        self._eeval = None
+        self._fin_sp_e = None
+        self.bytes_read = 0  #: Bytes read (or mapped) from the output so far
+        self._backends = set()
+        self._fallbacks = []
 
     def __repr__(self):
         return f"{self.ofile}"
 
+    @property
+    def buf(self):
+        """Shared :obj:`OutBuffer` over the output, opened on first use"""
+        if self._buf is None:
+            self._buf = OutBuffer(self.ofile)
+            self.bytes_read += len(self._buf)
+        return self._buf
+
+    def call(self, extractor, *args):
+        """Runs one extractor and records how it went
+
+        Args:
+            extractor (str): Name of the extractor method
+            *args: Its arguments
+
+        Returns:
+            tuple: The extractor's result and its :obj:`ParseRecord`, with
+            the backends which answered joined by ``+``
+        """
+        self._backends, self._fallbacks = set(), []
+        read = self.bytes_read
+        start = time.perf_counter()
+        result = getattr(self, extractor)(*args)
+        seconds = time.perf_counter() - start
+        record = ParseRecord(
+            str(self.ofile),
+            extractor,
+            seconds,
+            self.bytes_read - read,
+            "+".join(sorted(self._backends)) or "regex",
+            "; ".join(self._fallbacks) or None,
+        )
+        return result, record
+
+    def _grammar(self, section, keys, convert, *args):
+        """Result of the chemparseplot parser of a *section*, turned into a
+        table by *convert*, or None when it fails, in which case the caller
+        falls back to the regex decoders and the failure is noted
+
+        The parser only sees the `section_text` of *keys*. It takes a path, so
+        the slices are written to a temporary file for it.
+        """
+        text = self.section_text(*keys).encode()
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                part = Path(tmp) / "orca.out"
+                part.write_bytes(text)
+                result = convert(grammar_parser(section), part, *args)
+        except Exception as exc:
+            self._fallbacks.append(f"{type(exc).__name__}: {exc}")
+            result = None
+        self.bytes_read += len(text)
+        return result
+
+    def _answered(self, backend):
+        self._backends.add(backend)
+
+    def _use_grammar(self, section):
+        """Whether a section goes to its chemparseplot parser, which must be
+        installed (checked once per process, see `grammar_parser`)"""
+        if grammar_parser(section) is None:
+            return False
+        return self.backends.get(section, "auto") != "regex"
+
+    @property
+    def index(self):
+        """:obj:`SectionIndex` of `SECTION_MARKERS`, built on first use"""
+        if self._index is None:
+            self._index = SectionIndex(self.buf, SECTION_MARKERS)
+        return self._index
+
+    @property
+    def eeval(self):
+        """Number of energy evaluations announced for a scan (or None)"""
+        if self._eeval is None:
+            self.get_evals(self.ofile)
+        return self._eeval
+
+    @property
+    def fin_sp_e(self):
+        """Final single point energy (hartree)"""
+        if self._fin_sp_e is None:
+            self.get_final_e()
+        return self._fin_sp_e
+
+    def trajectory(self):
+        """`Trajectory` of the run, decoded from the shared index"""
+        return _trajectory(self.buf, self.index)
+
+    def scan_grid(self):
+        """`ScanGrid` of the run, decoded from the shared index"""
+        return _scan_grid(self.buf, self.index)
+
+    def close(self):
+        """Drops the shared buffer and index"""
+        if self._buf is not None:
+            self._buf.close()
+        self._buf = None
+        self._index = None
+
+    def section_text(self, *keys):
+        """Text of every occurrence of some sections, in file order
+
+        Grammar parsers are handed these slices rather than the whole output.
+        """
+        bounds = sorted(
+            self.index.section(key, num)
+            for key in keys
+            for num in range(len(self.index.offsets.get(key, ())))
+        )
+        return "".join(self.buf.text(start, end) for start, end in bounds)
+
+    def _section_rows(self, key, columns, skip=0, stop=BLANK_LINE, delete=b""):
+        """Rows of the table under every occurrence of a section, decoded
+        with `decode_table` and stacked"""
+        parts = [
+            decode_table(
+                self.buf.data,
+                *table_bounds(self.buf, pos, skip, stop),
+                columns,
+                delete=delete,
+            )
+            for pos in self.index.offsets[key]
+        ]
+        return _stack_rows(parts, columns)
+
     def get_evals(self, ofile):
-        with open(self.ofile) as of:
-            flines = of.readlines()
-            for line in flines:
-                if OUT_REGEX["energy_evals"].search(line):
-                    self.eeval = int(line.split()[3])
+        offsets = self.index.offsets["energy_evals"]
+        if offsets:
+            self._eeval = int(self.buf.line(offsets[-1]).split()[3])
         return
 
     def get_final_e(self, dat=False):
-        with open(self.ofile) as of:
-            fInp = of.read()
-            try:
-                suite_e = _final_energy_via_chemparseplot(fInp)
-                if suite_e is not None:
-                    self.fin_sp_e = float(suite_e) * ureg.hartree
-                else:
-                    self.fin_sp_e = (
-                        float(
-                            OUT_REGEX["final_single_point_e"]
-                            .findall(fInp)[-1]
-                            .split()[-1]
-                        )
-                        * ureg.hartree
-                    )
-            except Exception as exc:
-                raise ValueError(
-                    f"Final single point energy not found for {self.ofile}"
-                ) from exc
+        try:
+            stats = {}
+            self._fin_sp_e, backend = _final_energy(
+                self.ofile, self._use_grammar("final_energy"), stats
+            )
+            self.bytes_read += stats.get("bytes", 0)
+            self._answered(backend)
+            if self.units:
+                self._fin_sp_e = self._fin_sp_e * ureg.hartree
+        except Exception as exc:
+            raise ValueError(
+                f"Final single point energy not found for {self.ofile}"
+            ) from exc
 
     def final_sp_e(self):
-        erow = self.runinfo
-        erow["final_sp_energy"] = self.fin_sp_e.m
-        erow["unit"] = self.fin_sp_e.u
+        erow = self.runinfo.copy()
+        erow["final_sp_energy"] = self.fin_sp_e.m if self.units else self.fin_sp_e
+        erow["unit"] = ureg.hartree if self.units else "hartree"
         return erow
 
     def mult_energy_surface(
         self,
         etype=["Actual Energy", "MDCI", "MDCI w/o Triples", "SCF Energy"],
         npoints=None,
+        atol=SURFACE_ATOL,
     ):
         """Multiple Energy surface dataframe generator
 
         This is a helper function to obtain a dataframe which contains multiple
-        energy surfaces. The implementation leverages the `reduce` function from
-        `functools` to merge a list of dataframes generated from the
-        `single_energy_surface` calls.
+        energy surfaces. Every surface block is decoded from the shared section
+        index into arrays, and the energy columns are placed side by side on
+        the common bond length axis. When the axes differ, only the bond
+        lengths found (within *atol*) in every surface are kept, with the
+        energies of their first match.
 
         Args:
             etype (str,optional): The type of calculated energy surface to
@@ -775,6 +2029,8 @@ class _OrcaRun:
             npoints (int,optional): The number of points over which a scan has
                 taken place. Defaults to the number of evaluations calculated in
                 the output file.
+            atol (float,optional): Largest difference between bond lengths
+                of the same scan point. Defaults to `SURFACE_ATOL`.
 
         Returns:
             pd.DataFrame: Returns a data frame of bond_length and energies
@@ -783,31 +2039,29 @@ class _OrcaRun:
             https://www.its.hku.hk/services/research/hpc/software/orca
 
         """
-        if isinstance(etype, str) or len(etype) == 1:
-            if isinstance(etype, list):
-                etype = etype[0]
-            single = self.single_energy_surface(
-                etype=etype
-            )  #: Short circuit if single type is requested
-            for key in self.runinfo.keys():
-                single[key] = self.runinfo[key]
-            return single
-        elist = []
+        if isinstance(etype, str):
+            etype = [etype]
+        axis = None
+        columns = {}
         for et in etype:
-            runsurf = self.single_energy_surface(etype=et)
-            elist.append(runsurf)
-        eDat_all = reduce(lambda df1, df2: pd.merge(df1, df2, on="bond_length"), elist)
+            xvals, yvals = self.surface_arrays(etype=et, npoints=npoints)
+            if axis is None or np.array_equal(xvals, axis):
+                axis = xvals
+            else:
+                pos = _match_axis(axis, xvals, atol)
+                keep = pos >= 0
+                axis = axis[keep]
+                columns = {key: col[keep] for key, col in columns.items()}
+                yvals = yvals[pos[keep]]
+            columns[et] = yvals
+        edat = pd.DataFrame({"bond_length": axis, **columns})
         for key in self.runinfo.keys():
-            eDat_all[key] = self.runinfo[key]
-        return eDat_all
+            edat[key] = self.runinfo[key]
+        return edat
 
     def single_energy_surface(self, etype="Actual Energy", npoints=None):
         """Single energy surface dataframe generator.
 
-        Prefer chemparseplot.api.extract_orca_geomscan_energy when the
-        Calculated Surface block is present; fall back to legacy regex tables
-        for MDCI variants that still need the older line-oriented path.
-
         Args:
             etype (str,optional): Surface type label.
             npoints (int,optional): Expected scan length. When set, must match
@@ -817,96 +2071,114 @@ class _OrcaRun:
         Returns:
             pd.DataFrame: bond_length + energy column named *etype*
         """
+        xvals, yvals = self.surface_arrays(etype=etype, npoints=npoints)
+        return pd.DataFrame({"bond_length": xvals, etype: yvals})
+
+    def surface_arrays(self, etype="Actual Energy", npoints=None):
+        """Scan coordinate and energies of one surface block
+
+        Prefer chemparseplot.api.extract_orca_geomscan_energy when the
+        Calculated Surface block is present; fall back to decoding the legacy
+        two column table for MDCI variants that still need it.
+
+        Args:
+            etype (str,optional): Surface type label.
+            npoints (int,optional): Expected scan length, see
+                `single_energy_surface`
+
+        Returns:
+            tuple: ``(bond_length, energy)`` float64 arrays
+        """
         # Suite path: chemparseplot owns geomscan parse (bohr / hartree).
-        try:
-            from chemparseplot.api import extract_orca_geomscan_energy
-
-            text = Path(self.ofile).read_text()
-            dist, energy = extract_orca_geomscan_energy(text, energy_type=etype)
-            n = len(getattr(dist, "magnitude", dist))
-            if n > 0:
-                if npoints is not None and n != npoints:
-                    raise ValueError(
-                        f"requested npoints={npoints} but {etype} surface has {n}"
-                    )
-                if hasattr(dist, "m_as"):
-                    xvals = dist.m_as("bohr")
-                    yvals = energy.m_as("hartree")
+        if self._use_grammar("surface"):
+            try:
+                if etype in self.index:
+                    text = self.section_text(etype)
+                elif etype in SECTION_MARKERS:
+                    raise LookupError(f"{etype} surface not in {self.ofile}")
                 else:
-                    xvals = dist.magnitude
-                    yvals = energy.magnitude
-                edat = pd.DataFrame({"bond_length": xvals, etype: yvals})
-                if not edat.empty:
-                    return edat
-        except ValueError:
-            raise
-        except Exception:
-            pass
+                    text = self.section_text(*SURFACE_SECTIONS)
+                dist, energy = grammar_parser("surface")(text, energy_type=etype)
+                n = len(getattr(dist, "magnitude", dist))
+                if n > 0:
+                    if npoints is not None and n != npoints:
+                        raise ValueError(
+                            f"requested npoints={npoints} but {etype} surface has {n}"
+                        )
+                    if hasattr(dist, "m_as"):
+                        xvals = dist.m_as("bohr")
+                        yvals = energy.m_as("hartree")
+                    else:
+                        xvals = dist.magnitude
+                        yvals = energy.magnitude
+                    self._answered("grammar")
+                    return (
+                        np.asarray(xvals, dtype=np.float64),
+                        np.asarray(yvals, dtype=np.float64),
+                    )
+            except ValueError:
+                raise
+            except Exception as exc:
+                self._fallbacks.append(f"{type(exc).__name__}: {exc}")
+        self._answered("regex")
 
         if etype not in OUT_REGEX:
             raise (NotImplementedError(f"{etype} has not been implemented yet"))
         if npoints is None:
             npoints = self.eeval
-        xaxis = []
-        yaxis = []
-        sregexp = OUT_REGEX[etype]
-        with open(self.ofile) as of:
-            flines = of.readlines()
-            for lnum, line in enumerate(flines):
-                if sregexp.search(line):
-                    offset = lnum + 1
-                    for i in range(npoints):
-                        try:
-                            x, y = flines[offset + i].split()
-                        except (IndexError, ValueError) as exc:
-                            raise ValueError(
-                                f"requested npoints={npoints} past end of "
-                                f"{etype} surface"
-                            ) from exc
-                        xaxis.append(x)
-                        yaxis.append(y)
-        edat = pd.DataFrame(
-            data=zip(xaxis, yaxis), columns=["bond_length", etype], dtype="float64"
-        )
-        if edat.empty:
+        if npoints is None:
+            raise (ValueError(f"No scan found in {self.ofile}"))
+        data = self.buf.data
+        blocks = []
+        for occurrence in range(len(self.index.offsets[etype])):
+            start, end = self.index.section(etype, occurrence)
+            start = data.find(b"\n", start, end) + 1
+            lines = data[start:end].split(b"\n", npoints)[:npoints]
+            tokens = b" ".join(lines).split()
+            if len(lines) < npoints or len(tokens) != 2 * npoints:
+                raise ValueError(
+                    f"requested npoints={npoints} past end of {etype} surface"
+                )
+            try:
+                blocks.append(np.array(tokens).astype(np.float64).reshape(-1, 2))
+            except ValueError as exc:
+                raise ValueError(
+                    f"requested npoints={npoints} past end of {etype} surface"
+                ) from exc
+        if not blocks:
             raise (
                 ValueError(f"{etype} surface not found for {self.runinfo['theory']}")
             )
-        return edat
+        table = np.concatenate(blocks)
+        return table[:, 0], table[:, 1]
 
     def vib_freq(self):
         """Get the vibrational frequencies, and fails if there are more than one
         imaginary frequency"""
-        suite = _vib_via_chemparseplot(self.ofile)
+        suite = None
+        if self._use_grammar("vib") and "Vibrational Frequency" in self.index:
+            suite = self._grammar(
+                "vib", ("Vibrational Frequency",), _vib_via_chemparseplot
+            )
         if suite is not None and not suite.empty:
-            return suite
-        sregexp = OUT_REGEX["Vibrational Frequency"]
-        vline = namedtuple("vline", "Mode freq imaginary")
-        accumulate = []
-        with open(self.ofile) as of:
-            flines = of.readlines()
-            for lnum, line in enumerate(flines):
-                if sregexp.search(line):
-                    offset = lnum + 5
-                    i = 0
-                    while flines[offset + i] != "\n":
-                        raw = flines[offset + i].split()
-                        if len(raw) == 3:
-                            v = vline(
-                                Mode=int(raw[0].replace(":", "")),
-                                freq=float(raw[1]),
-                                imaginary=False,
-                            )
-                        elif len(raw) == 5:
-                            v = vline(
-                                Mode=int(raw[0].replace(":", "")),
-                                freq=float(raw[1]),
-                                imaginary=True,
-                            )
-                        accumulate.append(v)
-                        i = i + 1
-        vdat = pd.DataFrame(accumulate)
-        vdat["freq"] = vdat["freq"].astype("pint[cm_1]")
+            self._answered("grammar")
+            return suite if self.units else strip_units(suite)
+        self._answered("regex")
+        data = self.buf.data
+        parts = []
+        for occurrence in range(len(self.index.offsets["Vibrational Frequency"])):
+            start, end = self.index.section("Vibrational Frequency", occurrence)
+            # Notes (e.g. the scaling factor) may precede the first mode
+            first = _VIB_ROW.search(data, start, end)
+            if first is None:
+                continue
+            stop = BLANK_LINE.search(data, first.start(), end)
+            stop = stop.start() if stop else end
+            parts.append(
+                decode_table(data, first.start(), stop, _VIB_COLUMNS, pattern=_VIB_ROW)
+            )
+        vdat = pd.DataFrame(_stack_rows(parts, _VIB_COLUMNS))
+        tag_units(vdat, {"freq": "cm_1"}, self.units)
         # TODO: Add experiment layer
         # TODO: Error if more than one imaginary
         # Check if greater 100 then it is not numerical
@@ -931,34 +2203,23 @@ class _OrcaRun:
 
     def vpt2_transitions(self):
         """Grabs the fundamental transition analysis from a VPT2 calculation"""
-        suite = _vpt2_via_chemparseplot(self.ofile)
+        suite = None
+        if self._use_grammar("vpt2") and "vpt2trans" in self.index:
+            suite = self._grammar("vpt2", ("vpt2trans",), _vpt2_via_chemparseplot)
         if suite is not None and not suite.empty:
+            self._answered("grammar")
             for key in self.runinfo.keys():
                 suite[key] = self.runinfo[key]
-            return suite
-        sregexp = OUT_REGEX["vpt2trans"]
-        vline = namedtuple("vline", "Mode harmonic_freq vpt2_freq freq_diff")
-        accumulate = []
-        with open(self.ofile) as of:
-            flines = of.readlines()
-            for lnum, line in enumerate(flines):
-                if sregexp.search(line):
-                    offset = lnum + 4
-                    i = 0
-                    while "---" not in flines[offset + i]:
-                        raw = flines[offset + i].split()
-                        v = vline(
-                            Mode=int(raw[0]),
-                            harmonic_freq=float(raw[1]),
-                            vpt2_freq=float(raw[2]),
-                            freq_diff=float(raw[3]),
-                        )
-                        accumulate.append(v)
-                        i = i + 1
-        vdat = pd.DataFrame(accumulate)
-        vdat["harmonic_freq"] = vdat["harmonic_freq"].astype("pint[cm_1]")
-        vdat["vpt2_freq"] = vdat["vpt2_freq"].astype("pint[cm_1]")
-        vdat["freq_diff"] = vdat["freq_diff"].astype("pint[cm_1]")
+            return suite if self.units else strip_units(suite)
+        self._answered("regex")
+        vdat = pd.DataFrame(
+            self._section_rows("vpt2trans", _VPT2_COLUMNS, skip=3, stop=_VPT2_END)
+        )
+        tag_units(
+            vdat,
+            {"harmonic_freq": "cm_1", "vpt2_freq": "cm_1", "freq_diff": "cm_1"},
+            self.units,
+        )
         if vdat.empty:
             raise (
                 ValueError(
@@ -973,36 +2234,19 @@ class _OrcaRun:
     def ir_spec(self):
         """Grabs the non-ZPE corrected IR Spectra and the dipole derivatives for
         intensities"""
-        suite = _ir_via_chemparseplot(self.ofile)
+        suite = None
+        if self._use_grammar("ir") and "irSpectrum" in self.index:
+            suite = self._grammar("ir", ("irSpectrum",), _ir_via_chemparseplot)
         if suite is not None and not suite.empty:
+            self._answered("grammar")
             for key in self.runinfo.keys():
                 suite[key] = self.runinfo[key]
-            return suite
-        sregexp = OUT_REGEX["irSpectrum"]
-        vline = namedtuple("vline", "Mode freq T2 TX TY TZ")
-        accumulate = []
-        with open(self.ofile) as of:
-            flines = of.readlines()
-            for lnum, line in enumerate(flines):
-                if sregexp.search(line):
-                    offset = lnum + 5
-                    i = 0
-                    while flines[offset + i] != "\n":
-                        raw = flines[offset + i].split()
-                        raw = [i for i in raw if i != ":" if i != "(" if i != ")"]
-                        v = vline(
-                            Mode=int(raw[0].replace(":", "")),
-                            freq=float(raw[1]),
-                            T2=float(raw[2]),
-                            TX=float(raw[3].replace("(", "")),
-                            TY=float(raw[4]),
-                            TZ=float(raw[5].replace(")", "")),
-                        )
-                        accumulate.append(v)
-                        i = i + 1
-        vdat = pd.DataFrame(accumulate)
-        vdat["T2"] = vdat["T2"].astype("pint[km/mol]")
-        vdat["freq"] = vdat["freq"].astype("pint[cm_1]")
+            return suite if self.units else strip_units(suite)
+        self._answered("regex")
+        vdat = pd.DataFrame(
+            self._section_rows("irSpectrum", _IR_COLUMNS, skip=4, delete=b":()")
+        )
+        tag_units(vdat, {"T2": "km/mol", "freq": "cm_1"}, self.units)
         if vdat.empty:
             raise (
                 ValueError(
@@ -1025,51 +2269,44 @@ class _OrcaRun:
             pd.DataFrame: Returns a data frame of the population analysis
 
         """
-        suite = _pop_via_chemparseplot(self.ofile, poptype)
+        suite = None
+        if self._use_grammar("pop") and poptype in self.index:
+            suite = self._grammar(
+                "pop", (poptype,), _pop_via_chemparseplot, poptype
+            )
         if suite is not None and not suite.empty:
+            self._answered("grammar")
             return suite
+        self._answered("regex")
         if poptype not in OUT_REGEX:
             raise (NotImplementedError(f"{poptype} has not been implemented yet"))
-        sregexp = OUT_REGEX[poptype]
-        chargeline = namedtuple("chargeline", "anum atype pcharge")
-        fulline = namedtuple("fulline", "anum atype pcharge pspin")
-        accumulate = []
-        with open(self.ofile) as of:
-            flines = of.readlines()
-            for lnum, line in enumerate(flines):
-                if sregexp.search(line):
-                    offset = lnum + 2
-                    i = 0
-                    while (
-                        "Sum" not in flines[offset + i]
-                        and "--" not in flines[offset + i + 1]
-                    ):
-                        raw = flines[offset + i].split()
-                        if "SPIN" in line:
-                            c = fulline(
-                                anum=raw[0],
-                                atype=raw[1],
-                                pcharge=float(raw[-2]),
-                                pspin=float(raw[-1]),
-                            )
-                        else:
-                            c = chargeline(
-                                anum=raw[0],
-                                atype=raw[1],
-                                pcharge=float(raw[-1]),
-                            )
-                        accumulate.append(c)
-                        i = i + 1
-        popdat = pd.DataFrame(accumulate)
-        step = popdat.anum.count() / popdat.anum.nunique()
-        popdat["step"] = np.asarray(
-            np.repeat(np.arange(1, step + 1), popdat.anum.nunique()), dtype=int
+        parts = _population_blocks(self.buf, self.index, poptype)
+        spin = any("pspin" in part for part in parts)
+        rows = _stack_rows(parts, _SPIN_POP_COLUMNS if spin else _POP_COLUMNS)
+        if not len(rows["anum"]):
+            raise (ValueError(f"{poptype} not found for {self.runinfo['theory']}"))
+        popdat = pd.DataFrame(rows)
+        # One block of atoms per step
+        popdat["step"] = np.repeat(
+            np.arange(1, len(parts) + 1), [len(part["anum"]) for part in parts]
         )
         popdat["population"] = poptype
-        if popdat.empty:
-            raise (ValueError(f"{poptype} not found for {self.runinfo['theory']}"))
         return popdat
 
+    def population_arrays(self, poptype=["Mulliken", "Loewdin"], /):
+        """Per-step charge and spin arrays, decoded from the shared index
+
+        Args:
+            poptype (:obj:`list` of :obj:`str`, optional): Population analyses.
+                Defaults to Mulliken and Loewdin.
+
+        Returns:
+            dict: Population type to :obj:`Populations`, see `read_populations`
+        """
+        if isinstance(poptype, str):
+            poptype = [poptype]
+        return {pt: _populations(self.buf, self.index, pt) for pt in poptype}
+
     def mult_population_analysis(self, poptype=["Mulliken", "Loewdin"], /):
         """Multiple population analysis dataframe generator
 
@@ -1083,18 +2320,9 @@ class _OrcaRun:
         Returns:
             pd.DataFrame: Returns a data frame of population analysis types
         """
-        if isinstance(poptype, str) or len(poptype) == 1:
-            if isinstance(poptype, list):
-                poptype = poptype[0]
-            single = self.single_population_surface(poptype)
-            for key in self.runinfo.keys():
-                single[key] = self.runinfo[key]
-            return single
-        poplist = []
-        for pt in poptype:
-            runsurf = self.single_population_analysis(pt)
-            poplist.append(runsurf)
-        popdat = reduce(lambda df1, df2: pd.concat([df1, df2]), poplist)
+        if isinstance(poptype, str):
+            poptype = [poptype]
+        popdat = pd.concat([self.single_population_analysis(pt) for pt in poptype])
         for key in self.runinfo.keys():
             popdat[key] = self.runinfo[key]
         return popdat
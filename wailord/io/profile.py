@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""Parse instrumentation for experiment tables.
+
+A :class:`ParseProfile` collects one :obj:`ParseRecord` per output and
+extractor call parsed by `wailord.io.orca.orcaExp`: the wall time, the bytes
+read, the backend which answered (``"grammar"`` for the chemparseplot parsers,
+``"regex"`` for the section index decoders) and the exception of a grammar
+parse which fell back to the regex path. Stage timings (``discover``,
+``collect``) are kept alongside, so slow outputs can be told apart from slow
+discovery or a slow filesystem.
+
+Profiles are opt-in, by any of:
+
+    * ``orcaExp(..., profile=True)``, then ``expt.profile``
+    * the ``WAILORD_PROFILE`` environment variable, which gives every
+      `orcaExp` a profile. Its value is a comma separated list: ``cprofile``
+      and ``tracemalloc`` also hook the collection calls, anything else (e.g.
+      ``1``) only records.
+    * the `profiling` context manager, which records every collection inside
+      it and can run cProfile and tracemalloc around the whole block
+
+The cProfile and tracemalloc hooks only see the calling process; use
+``executor="serial"`` (or ``"thread"``) to profile the parsing itself. The
+records are gathered from every executor.
+
+Example:
+    The slowest outputs and the grammar fallbacks of a collection::
+
+        with profiling(cprofile=True) as prof:
+            expt.get_ir_spec()
+        prof.frame().nlargest(10, "seconds")
+        prof.summary()
+        print(prof.stats_text(20))
+"""
+
+import collections
+import contextlib
+import cProfile
+import io
+import json
+import os
+import pstats
+import time
+import tracemalloc
+
+import pandas as pd
+
+#: Environment variable enabling profiles for every `orcaExp`
+ENV = "WAILORD_PROFILE"
+
+ParseRecord = collections.namedtuple(
+    "ParseRecord", "path extractor seconds bytes_read backend fallback"
+)
+
+#: Profiles of the `profiling` blocks being run
+_ACTIVE = []
+_PROFILING = []
+
+
+class ParseProfile:
+    """Records of parsed outputs and timings of collection stages
+
+    Args:
+        cprofile (bool, optional): Run cProfile within `hooks`. Defaults to
+            False.
+        memory (bool, optional): Trace allocations with tracemalloc within
+            `hooks`. Defaults to False.
+
+    Attributes:
+        records (list): :obj:`ParseRecord` of every parsed call
+        timings (:obj:`collections.Counter`): Stage name to seconds
+        stats (:obj:`pstats.Stats`): Accumulated cProfile statistics, or None
+        peak_memory (int): Largest traced allocation peak in bytes
+        snapshot (:obj:`tracemalloc.Snapshot`): Allocations at the end of the
+            last hooked call, or None
+    """
+
+    def __init__(self, cprofile=False, memory=False):
+        self.cprofile = cprofile
+        self.memory = memory
+        self.records = []
+        self.timings = collections.Counter()
+        self.stats = None
+        self.peak_memory = 0
+        self.snapshot = None
+
+    def __repr__(self):
+        return f"ParseProfile({len(self.records)} records, {dict(self.timings)})"
+
+    def add(self, records):
+        """Appends :obj:`ParseRecord` entries"""
+        self.records.extend(records)
+
+    @contextlib.contextmanager
+    def timed(self, stage):
+        """Adds the wall time of the block to ``timings[stage]``"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[stage] += time.perf_counter() - start
+
+    @contextlib.contextmanager
+    def hooks(self):
+        """Runs cProfile and tracemalloc around the block, as configured
+
+        A profiler which is already running (e.g. from an enclosing
+        `profiling` block) is left alone; so is tracemalloc, whose peak then
+        includes the allocations from before the block.
+        """
+        profiler = None
+        if self.cprofile and not _PROFILING:
+            profiler = cProfile.Profile()
+            _PROFILING.append(profiler)
+            profiler.enable()
+        started = False
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started = True
+        try:
+            yield self
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                _PROFILING.remove(profiler)
+                if self.stats is None:
+                    self.stats = pstats.Stats(profiler)
+                else:
+                    self.stats.add(profiler)
+            if self.memory and tracemalloc.is_tracing():
+                peak = tracemalloc.get_traced_memory()[1]
+                self.peak_memory = max(self.peak_memory, peak)
+                self.snapshot = tracemalloc.take_snapshot()
+                if started:
+                    tracemalloc.stop()
+
+    def frame(self):
+        """Records as a data frame, one row per output and extractor call"""
+        return pd.DataFrame(self.records, columns=list(ParseRecord._fields))
+
+    def summary(self):
+        """Per extractor and backend: calls, total, mean and largest seconds,
+        bytes read and grammar fallbacks"""
+        frame = self.frame()
+        frame["fell_back"] = frame["fallback"].notna()
+        return (
+            frame.groupby(["extractor", "backend"])
+            .agg(
+                calls=("seconds", "size"),
+                seconds=("seconds", "sum"),
+                mean_seconds=("seconds", "mean"),
+                max_seconds=("seconds", "max"),
+                bytes_read=("bytes_read", "sum"),
+                fallbacks=("fell_back", "sum"),
+            )
+            .reset_index()
+        )
+
+    def stats_text(self, limit=20, sort="cumulative"):
+        """Top of the cProfile statistics as text"""
+        if self.stats is None:
+            return ""
+        out = io.StringIO()
+        self.stats.stream = out
+        self.stats.sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+    def memory_top(self, limit=10):
+        """Source lines holding the most memory in the last `snapshot`"""
+        if self.snapshot is None:
+            return []
+        return [str(stat) for stat in self.snapshot.statistics("lineno")[:limit]]
+
+    def to_json(self, path=None):
+        """The records, stage timings and memory peak as JSON
+
+        Args:
+            path (:obj:`Path`, optional): Also write the document here
+
+        Returns:
+            str: The JSON document
+        """
+        document = json.dumps(
+            {
+                "timings": dict(self.timings),
+                "peak_memory": self.peak_memory,
+                "records": [record._asdict() for record in self.records],
+            },
+            indent=2,
+        )
+        if path is not None:
+            with open(path, "w") as out:
+                out.write(document)
+        return document
+
+
+def from_env():
+    """A :obj:`ParseProfile` configured by `ENV`, or None when it is unset"""
+    value = os.environ.get(ENV, "").strip().lower()
+    if value in ("", "0", "false", "no"):
+        return None
+    options = {option.strip() for option in value.split(",")}
+    return ParseProfile(cprofile="cprofile" in options, memory="tracemalloc" in options)
+
+
+def active(profile=None):
+    """*profile* (when given) and the profiles of enclosing `profiling` blocks"""
+    profiles = [] if profile is None else [profile]
+    return profiles + [prof for prof in _ACTIVE if prof is not profile]
+
+
+@contextlib.contextmanager
+def profiling(cprofile=False, memory=False):
+    """Records every experiment collection run inside the block
+
+    Args:
+        cprofile (bool, optional): Run cProfile over the block. Defaults to
+            False.
+        memory (bool, optional): Trace allocations over the block. Defaults to
+            False.
+
+    Yields:
+        :obj:`ParseProfile`: The records, filled in as the block runs
+    """
+    profile = ParseProfile(cprofile=cprofile, memory=memory)
+    _ACTIVE.append(profile)
+    try:
+        with profile.hooks():
+            yield profile
+    finally:
+        _ACTIVE.remove(profile)
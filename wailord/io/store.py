@@ -0,0 +1,444 @@
+# -*- coding: utf-8 -*-
+"""Single-file HDF5 store of a parsed experiment.
+
+Layout of the file::
+
+    /runs/<column>             run index: run_id, path, basis, calc, spin,
+                               theory, slug, size, mtime_ns, terminated and
+                               final_sp_energy (NaN where absent)
+    /tables/<name>/<column>    one group per `COLLECT_TABLES` table, rows of
+                               every run stacked, with a run_id column; run
+                               metadata lives only in /runs
+    /trajectory/coords         (total steps x atoms, 3) float64, angstrom
+    /trajectory/symbols        atoms of every run, stacked
+    /trajectory/energies       hartree, every step of every run, stacked
+    /trajectory/*_offsets      (n_runs + 1) offsets into the arrays above
+
+Columns are chunked and gzip compressed. Units, pandas dtypes and the call
+which produced a table are kept in attributes, so `ExperimentStore` can answer
+every ``orcaExp`` table method without touching the text outputs again. By
+default every table the outputs hold is stored.
+
+Requires ``h5py`` (``pip install wailord[store]``).
+
+Example:
+    Parse once, then work from the store::
+
+        expt.to_store(Path("exp.h5"))
+        with ExperimentStore(Path("exp.h5")) as stored:
+            stored.get_ir_spec()
+            stored.trajectory(0).coords
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import CategoricalDtype
+
+from wailord.io._executor import run_chunks
+from wailord.io._table import stack_facts
+from wailord.io.orca import (
+    COLLECT_TABLES,
+    Q_,
+    RUN_COLUMNS,
+    OutputState,
+    Populations,
+    Trajectory,
+    _call_key,
+    _final_energies,
+    _OrcaRun,
+    _stack_populations,
+    _table_calls,
+    orcaExp,
+    output_state,
+    ureg,
+)
+
+COMPRESSION = "gzip"
+_RUN_STATE = OutputState._fields
+
+
+def _h5py():
+    try:
+        import h5py
+    except ImportError as exc:
+        raise ImportError(
+            "Experiment stores need h5py, install wailord[store]"
+        ) from exc
+    return h5py
+
+
+def _encode_dtype(dtype):
+    if isinstance(dtype, CategoricalDtype):
+        return {
+            "kind": "category",
+            "categories": [str(cat) for cat in dtype.categories],
+            "ordered": bool(dtype.ordered),
+        }
+    return {"kind": "pandas", "name": str(dtype)}
+
+
+def _decode_dtype(spec):
+    if spec["kind"] == "category":
+        return CategoricalDtype(categories=spec["categories"], ordered=spec["ordered"])
+    return pd.api.types.pandas_dtype(spec["name"])
+
+
+def _write_column(h5py, group, name, arr):
+    """One column dataset; text (and missing text) is stored as strings with
+    a null mask"""
+    if arr.dtype.kind in "biuf":
+        group.create_dataset(
+            name, data=arr, chunks=True if len(arr) else None, compression=COMPRESSION
+        )
+        return
+    nulls = np.array([val is None or val is pd.NA or val != val for val in arr])
+    text = np.array(
+        ["" if null else str(val) for val, null in zip(arr, nulls)], dtype=object
+    )
+    dset = group.create_dataset(
+        name,
+        data=text,
+        dtype=h5py.string_dtype(),
+        chunks=True if len(arr) else None,
+        compression=COMPRESSION,
+    )
+    if nulls.any():
+        dset.attrs["nulls"] = np.flatnonzero(nulls)
+
+
+def _read_column(dset):
+    if dset.dtype.kind in "biuf":
+        return dset[()]
+    values = dset.asstr()[()].astype(object)
+    if "nulls" in dset.attrs:
+        values[dset.attrs["nulls"]] = None
+    return values
+
+
+def _trajectories(paths):
+    """Executor task: plain arrays of the trajectory of every output"""
+    out = []
+    for runf in paths:
+        run = _OrcaRun(runf)
+        try:
+            traj = run.trajectory()
+        finally:
+            run.close()
+        out.append((traj.symbols, traj.coords.magnitude, traj.energies.magnitude))
+    return out
+
+
+def _stored_populations(batch, poptype, nruns):
+    """`Populations` of one type for every run, from a stored ``pop`` fact
+    batch"""
+    cols, run_ids = batch["columns"], batch["run_id"]
+    empty = Populations(
+        symbols=np.empty(0, dtype=str), charges=np.empty((0, 0)), spins=None
+    )
+    pops = [empty] * nruns
+    rows = np.flatnonzero(cols["population"] == poptype)
+    for run_id in np.unique(run_ids[rows]):
+        sel = rows[run_ids[rows] == run_id]
+        shape = (len(np.unique(cols["step"][sel])), -1)
+        spins = None
+        if "pspin" in cols:
+            spins = cols["pspin"][sel].astype(np.float64).reshape(shape)
+            if np.isnan(spins).all():
+                spins = None
+        charges = cols["pcharge"][sel].astype(np.float64).reshape(shape)
+        pops[run_id] = Populations(
+            symbols=cols["atype"][sel[: charges.shape[1]]].astype(str),
+            charges=charges,
+            spins=spins,
+        )
+    return pops
+
+
+def _offsets(sizes):
+    return np.concatenate([[0], np.cumsum(sizes, dtype=np.int64)])
+
+
+def _held_tables(expt, **kwargs):
+    """The `COLLECT_TABLES` tables which every output of *expt* holds, their
+    calls and fact batches
+
+    All tables are collected in a single pass over the outputs; a table is
+    left out when some output has no result for it (see `NO_RESULT`).
+
+    Returns:
+        tuple: The table names, calls and fact batches held, and for every
+        table left out the outputs lacking it
+    """
+    tables, calls = _table_calls(list(COLLECT_TABLES), **kwargs)
+    held = ([], [], [])
+    lacking = {}
+    for name, call, batches in zip(
+        tables, calls, expt._collect(*calls, missing_ok=True)
+    ):
+        failed = [
+            runf for runf, batch in zip(expt.orclist, batches) if batch is None
+        ]
+        if failed:
+            lacking[name] = failed
+            continue
+        for found, value in zip(held, (name, call, stack_facts(batches))):
+            found.append(value)
+    return (*held, lacking)
+
+
+def write_store(expt, path, tables=None, trajectories=True, **kwargs):
+    """Writes an experiment to an HDF5 store, see `orcaExp.to_store`"""
+    h5py = _h5py()
+    paths = list(expt.orclist)
+    if tables is None:
+        tables, calls, collected, lacking = _held_tables(expt, **kwargs)
+    else:
+        tables, calls = _table_calls(tables, **kwargs)
+        collected, lacking = expt._fact_batches(*calls), {}
+    runs = {"run_id": np.arange(len(paths)), "path": [str(p) for p in paths]}
+    infos = expt.run_info(paths)
+    for key in infos[0] if infos else ():
+        runs[key] = [info[key] for info in infos]
+    states = [output_state(runf) for runf in paths]
+    for num, field in enumerate(_RUN_STATE):
+        runs[field] = np.array([state[num] for state in states])
+    runs["final_sp_energy"] = np.asarray(
+        run_chunks(
+            _final_energies,
+            paths,
+            workers=expt.workers,
+            executor=expt.executor,
+            chunksize=expt.chunksize,
+        ),
+        dtype=np.float64,
+    )
+    with h5py.File(path, "w") as h5:
+        h5.attrs["expfolder"] = str(expt.expfolder)
+        h5.attrs["inpconf"] = json.dumps(expt.inpconf, default=str)
+        h5.attrs["order_basis"] = json.dumps(list(expt.order_basis))
+        h5.attrs["order_theory"] = json.dumps(list(expt.order_theory))
+        run_ids = {runf: num for num, runf in enumerate(paths)}
+        h5.attrs["lacking"] = json.dumps(
+            {name: [run_ids[runf] for runf in runfs] for name, runfs in lacking.items()}
+        )
+        group = h5.create_group("runs")
+        for name, values in runs.items():
+            _write_column(h5py, group, name, np.asarray(values))
+        for name, call, batch in zip(tables, calls, collected):
+            group = h5.create_group(f"tables/{name}")
+            extractor, args = _call_key(*call)
+            group.attrs["extractor"] = extractor
+            group.attrs["args"] = args
+            group.attrs["columns"] = json.dumps(list(batch["columns"]))
+            group.attrs["units"] = json.dumps(batch["units"])
+            group.attrs["unit_objects"] = json.dumps(batch["unit_objects"])
+            group.attrs["run_columns"] = json.dumps(batch["run_columns"])
+            group.attrs["dtypes"] = json.dumps(
+                {col: _encode_dtype(dtype) for col, dtype in batch["dtypes"].items()}
+            )
+            for col, arr in batch["columns"].items():
+                _write_column(h5py, group, col, arr)
+            _write_column(h5py, group, "__run_id__", batch["run_id"])
+        if trajectories:
+            _write_trajectories(h5py, h5, expt, paths)
+    return Path(path)
+
+
+def _write_trajectories(h5py, h5, expt, paths):
+    trajs = run_chunks(
+        _trajectories,
+        paths,
+        workers=expt.workers,
+        executor=expt.executor,
+        chunksize=expt.chunksize,
+    )
+    group = h5.create_group("trajectory")
+    natoms = [len(symbols) for symbols, _, _ in trajs]
+    nsteps = [len(coords) for _, coords, _ in trajs]
+    coords = [coords.reshape(-1, 3) for _, coords, _ in trajs]
+    group.create_dataset(
+        "coords",
+        data=np.concatenate(coords) if coords else np.empty((0, 3)),
+        chunks=True,
+        compression=COMPRESSION,
+    )
+    group["coords"].attrs["units"] = "angstrom"
+    energies = [energies for _, _, energies in trajs]
+    _write_column(
+        h5py, group, "energies", np.concatenate(energies) if energies else np.empty(0)
+    )
+    group["energies"].attrs["units"] = "hartree"
+    symbols = [symbols for symbols, _, _ in trajs]
+    _write_column(
+        h5py,
+        group,
+        "symbols",
+        np.concatenate(symbols).astype(object) if symbols else np.empty(0, object),
+    )
+    group["atom_offsets"] = _offsets(natoms)
+    group["coord_offsets"] = _offsets(np.multiply(natoms, nsteps))
+    group["energy_offsets"] = _offsets([len(energies) for energies in energies])
+    group["n_steps"] = np.asarray(nsteps, dtype=np.int64)
+
+
+class ExperimentStore(orcaExp):
+    """Read-only experiment backed by an HDF5 store
+
+    Every ``orcaExp`` table method (``get_*``, `collect`, `to_parquet`, ...)
+    works for the tables which were stored, as do `final_energies`,
+    `run_info` and `get_population_arrays` (from the ``pop`` table); nothing
+    is read from the text outputs. A table which was not stored raises
+    :obj:`KeyError`.
+
+    Args:
+        path (:obj:`Path`): Store written by `orcaExp.to_store`
+        order_basis (:obj:`list`, optional): Defaults to the stored order
+        order_theory (:obj:`list`, optional): Defaults to the stored order
+        units (bool, optional): Pint columns, as for `orcaExp`. Defaults to
+            True.
+    """
+
+    def __init__(self, path, order_basis=None, order_theory=None, units=True):
+        self.path = Path(path)
+        self._h5 = _h5py().File(self.path, "r")
+        attrs = self._h5.attrs
+        super().__init__(
+            self.path,
+            order_basis=order_basis or json.loads(attrs["order_basis"]),
+            order_theory=order_theory or json.loads(attrs["order_theory"]),
+            units=units,
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Closes the store"""
+        if self._h5 is not None:
+            self._h5.close()
+            self._h5 = None
+
+    def handle_exp(self, efol):
+        self.expfolder = Path(self._h5.attrs["expfolder"])
+        self.inpconf = json.loads(self._h5.attrs["inpconf"])
+        self.orclist = [Path(runf) for runf in _read_column(self._h5["runs/path"])]
+
+    def iter_outputs(self):
+        yield from self.orclist
+
+    def refresh(self):
+        raise (NotImplementedError("Stores are read-only, write a new one"))
+
+    @property
+    def runs(self):
+        """The run index as a data frame"""
+        group = self._h5["runs"]
+        return pd.DataFrame({name: _read_column(group[name]) for name in group})[
+            list(group)
+        ].sort_values("run_id", ignore_index=True)
+
+    def run_info(self, paths=None):
+        """Stored run information of some (default all) outputs"""
+        group = self._h5["runs"]
+        columns = [_read_column(group[name]) for name in RUN_COLUMNS]
+        rows = {
+            runf: dict(zip(RUN_COLUMNS, values))
+            for runf, *values in zip(_read_column(group["path"]), *columns)
+        }
+        paths = self.orclist if paths is None else paths
+        return [rows[str(runf)] for runf in paths]
+
+    def final_energies(self):
+        """Stored final single point energies, as from
+        `orcaExp.final_energies`"""
+        group = self._h5["runs"]
+        if "final_sp_energy" not in group:
+            raise (KeyError(f"Final energies are not in {self.path}"))
+        fe = pd.DataFrame(self.run_info())
+        fe["final_sp_energy"] = _read_column(group["final_sp_energy"])
+        fe["unit"] = [ureg.hartree if self.units else "hartree"] * len(fe)
+        return self._order(fe, COLLECT_TABLES["energy"][1])
+
+    def get_population_arrays(self, poptype=["Mulliken", "Loewdin"], /):
+        """`orcaExp.get_population_arrays` from the stored ``pop`` table, which
+        must have been collected for the same population types"""
+        if isinstance(poptype, str):
+            poptype = [poptype]
+        _, (call,) = _table_calls(["pop"], poptype=poptype)
+        batch = self._stored_batch(*call)
+        runs = pd.DataFrame(self.run_info())
+        runs.insert(0, "run_id", np.arange(len(self.orclist)))
+        runs = self._order(runs)
+        order = runs["run_id"].to_numpy()
+        arrays = {}
+        for pt in poptype:
+            pops = _stored_populations(batch, pt, len(self.orclist))
+            arrays[pt] = _stack_populations([pops[num] for num in order])
+        return runs, arrays
+
+    @property
+    def tables(self):
+        """Names of the stored tables"""
+        return list(self._h5.get("tables", {}))
+
+    @property
+    def lacking(self):
+        """Tables left out of the store, to the run ids of the outputs which
+        had no result for them"""
+        return json.loads(self._h5.attrs.get("lacking", "{}"))
+
+    def _stored_batch(self, extractor, args):
+        key = _call_key(extractor, args)
+        for group in self._h5.get("tables", {}).values():
+            if (group.attrs["extractor"], group.attrs["args"]) == key:
+                break
+        else:
+            raise (KeyError(f"{extractor}{tuple(args)} is not in {self.path}"))
+        columns = json.loads(group.attrs["columns"])
+        dtypes = json.loads(group.attrs["dtypes"])
+        return {
+            "kind": "frame",
+            "units": json.loads(group.attrs["units"]),
+            "unit_objects": json.loads(group.attrs["unit_objects"]),
+            "dtypes": {col: _decode_dtype(spec) for col, spec in dtypes.items()},
+            "columns": {col: _read_column(group[col]) for col in columns},
+            "run_id": _read_column(group["__run_id__"]),
+            # Stores without the attribute hold the wide layout already
+            "run_columns": json.loads(group.attrs.get("run_columns", "[]")),
+        }
+
+    def _fact_batches(self, *calls):
+        """The stored fact table of every call"""
+        return [self._stored_batch(*call) for call in calls]
+
+    def trajectory(self, run_id):
+        """Stored `Trajectory` of one run
+
+        Args:
+            run_id (int): Position of the run in the run index
+
+        Returns:
+            :obj:`Trajectory`: As from `wailord.io.orca.read_trajectory`
+        """
+        group = self._h5["trajectory"]
+        atoms = group["atom_offsets"][run_id : run_id + 2]
+        crds = group["coord_offsets"][run_id : run_id + 2]
+        engs = group["energy_offsets"][run_id : run_id + 2]
+        natoms = atoms[1] - atoms[0]
+        coords = group["coords"][crds[0] : crds[1]].reshape(
+            int(group["n_steps"][run_id]), natoms, 3
+        )
+        symbols = np.asarray(group["symbols"].asstr()[atoms[0] : atoms[1]], dtype=str)
+        return Trajectory(
+            symbols=symbols,
+            coords=Q_(coords, group["coords"].attrs["units"]),
+            energies=Q_(
+                group["energies"][engs[0] : engs[1]], group["energies"].attrs["units"]
+            ),
+        )
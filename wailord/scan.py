@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""Gridded relaxed-scan surfaces.
+
+ORCA reports every point of a (possibly multi-dimensional) parameter scan as a
+``TRAJECTORY STEP`` with the value of each scanned coordinate. A `ScanGrid`
+places the final energy and geometry of every step on the regular grid spanned
+by those values, so the surface can be sliced, interpolated and searched for
+stationary points with array operations.
+
+Example:
+    Minima of a two-dimensional scan::
+
+        from wailord.io.orca import read_scan
+
+        grid = read_scan(Path("orca.out"))
+        grid.energy.shape  # (n_R, n_A)
+        grid.minima()
+"""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+
+#: Scan coordinates closer than this are the same grid point
+AXIS_ATOL = 1e-6
+
+
+def _axis(values, atol=AXIS_ATOL):
+    """Sorted distinct values of a coordinate, those within *atol* of their
+    neighbour counting as one, and the position on that axis of every value
+
+    Returns:
+        tuple: ``(axis, where)``, as from ``np.unique`` with
+        ``return_inverse``; each axis value is the smallest of its cluster
+    """
+    order = np.argsort(values, kind="stable")
+    ordered = values[order]
+    # A new axis value wherever consecutive coordinates are further apart
+    new = np.r_[True, np.diff(ordered) > atol]
+    where = np.empty(len(values), dtype=np.intp)
+    where[order] = np.cumsum(new) - 1
+    return ordered[new], where
+
+
+class ScanGrid:
+    """Energies and geometries of a parameter scan on its grid
+
+    Args:
+        dims (list): Names of the scanned coordinates, as printed by ORCA
+        values: ``(n_steps, n_dims)`` coordinate values of every step
+        energies: ``(n_steps,)`` final energy of every step
+        geometries: ``(n_steps, n_atoms, 3)`` final geometry of every step
+        symbols: ``(n_atoms,)`` element symbols
+        atol (float, optional): Coordinates closer than this (e.g. differing
+            by print noise) are the same grid point. Defaults to `AXIS_ATOL`.
+
+    Attributes:
+        coords (list): Sorted axis values, one array per dimension
+        energy (np.ndarray): Energies on the grid, NaN where no step landed
+        geometry (np.ndarray): ``grid shape + (n_atoms, 3)`` geometries
+    """
+
+    def __init__(self, dims, values, energies, geometries, symbols, atol=AXIS_ATOL):
+        values = np.asarray(values, dtype=np.float64).reshape(len(energies), -1)
+        geometries = np.asarray(getattr(geometries, "magnitude", geometries))
+        self.dims = list(dims)
+        self.symbols = np.asarray(symbols)
+        self.coords = []
+        index = []
+        for dim in range(values.shape[1]):
+            axis, where = _axis(values[:, dim], atol)
+            self.coords.append(axis)
+            index.append(where)
+        index = tuple(index)
+        shape = tuple(len(axis) for axis in self.coords)
+        self.energy = np.full(shape, np.nan)
+        self.energy[index] = np.asarray(getattr(energies, "magnitude", energies))
+        self.geometry = np.full(shape + geometries.shape[1:], np.nan)
+        self.geometry[index] = geometries
+
+    def __repr__(self):
+        axes = ", ".join(
+            f"{dim}: {len(axis)}" for dim, axis in zip(self.dims, self.coords)
+        )
+        return f"ScanGrid({axes})"
+
+    @property
+    def shape(self):
+        return self.energy.shape
+
+    def to_frame(self):
+        """Long data frame: one row per grid point, coordinates and energy"""
+        mesh = np.meshgrid(*self.coords, indexing="ij")
+        data = {dim: axis.ravel() for dim, axis in zip(self.dims, mesh)}
+        data["energy"] = self.energy.ravel()
+        return pd.DataFrame(data)
+
+    def interpolate(self, points):
+        """Multilinear interpolation of the energy
+
+        Args:
+            points: ``(m, n_dims)`` coordinates (or a single point) inside the
+                grid
+
+        Returns:
+            np.ndarray: ``(m,)`` energies, NaN outside the grid
+        """
+        points = np.atleast_2d(np.asarray(points, dtype=np.float64))
+        lower, frac = [], []
+        outside = np.zeros(len(points), dtype=bool)
+        for dim, axis in enumerate(self.coords):
+            pts = points[:, dim]
+            outside |= (pts < axis[0]) | (pts > axis[-1])
+            if len(axis) == 1:
+                lower.append(np.zeros(len(pts), dtype=np.intp))
+                frac.append(np.zeros(len(pts)))
+                continue
+            low = np.searchsorted(axis, pts, side="right") - 1
+            low = np.clip(low, 0, len(axis) - 2)
+            lower.append(low)
+            frac.append((pts - axis[low]) / (axis[low + 1] - axis[low]))
+        result = np.zeros(len(points))
+        for corner in itertools.product((0, 1), repeat=len(self.coords)):
+            weight = np.ones(len(points))
+            index = []
+            for dim, step in enumerate(corner):
+                top = len(self.coords[dim]) - 1
+                index.append(np.minimum(lower[dim] + step, top))
+                weight *= frac[dim] if step else 1.0 - frac[dim]
+            result += weight * self.energy[tuple(index)]
+        result[outside] = np.nan
+        return result
+
+    def _neighbour_tests(self):
+        """Per axis: is each interior point below / above both neighbours"""
+        below, above = [], []
+        for dim in range(self.energy.ndim):
+            pad = [(0, 0)] * self.energy.ndim
+            pad[dim] = (1, 1)
+            padded = np.pad(self.energy, pad, constant_values=np.nan)
+            prev = np.take(padded, range(0, self.shape[dim]), axis=dim)
+            nxt = np.take(padded, range(2, self.shape[dim] + 2), axis=dim)
+            # NaN neighbours (grid edges, missing steps) fail both tests
+            below.append((self.energy < prev) & (self.energy < nxt))
+            above.append((self.energy > prev) & (self.energy > nxt))
+        return np.array(below), np.array(above)
+
+    def _points(self, mask):
+        where = np.nonzero(mask)
+        data = {
+            dim: axis[idx] for dim, axis, idx in zip(self.dims, self.coords, where)
+        }
+        data["energy"] = self.energy[where]
+        frame = pd.DataFrame(data)
+        frame["index"] = list(zip(*where))
+        return frame.sort_values("energy", ignore_index=True)
+
+    def minima(self):
+        """Interior grid points lower than their neighbours along every axis
+
+        Returns:
+            pd.DataFrame: Coordinates, energy and grid index, lowest first
+        """
+        below, _ = self._neighbour_tests()
+        return self._points(below.all(axis=0))
+
+    def saddles(self):
+        """Interior grid points which are a maximum along exactly one axis and
+        a minimum along all others (transition state candidates; the maxima of
+        a one-dimensional scan)
+
+        Returns:
+            pd.DataFrame: Coordinates, energy and grid index, lowest first
+        """
+        below, above = self._neighbour_tests()
+        ndim = self.energy.ndim
+        mask = (above.sum(axis=0) == 1) & (below.sum(axis=0) == ndim - 1)
+        return self._points(mask)
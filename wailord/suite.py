@@ -15,8 +15,11 @@ Example::
 
 from __future__ import annotations
 
+import functools
 from typing import Any
 
+import numpy as np
+
 
 def load_suite_config():
     """Load merged rgpkgs suite config (``~/.config/rgpkgs`` + project TOML)."""
@@ -62,15 +65,33 @@ def ensure_import(module_name: str):
     return _ensure(module_name)
 
 
-def energy_to_kcal(value_eV: Any) -> Any:
-    """Convert energy from eV to kcal/mol using chemparseplot units API."""
+@functools.lru_cache(maxsize=None)
+def _ev_factor(unit: str) -> float:
+    """eV -> *unit* factor, resolved once through chemparseplot units API."""
     from chemparseplot.api import convert_energy_magnitude
 
-    return convert_energy_magnitude(value_eV, "kcal/mol", source_unit="eV")
+    return float(convert_energy_magnitude(1.0, unit, source_unit="eV"))
+
+
+def energy_to_kcal(value_eV: Any) -> Any:
+    """Convert energy from eV to kcal/mol using chemparseplot units API.
+
+    Plain scalars and arrays cost one multiply; no pint quantity is built.
+    """
+    if hasattr(value_eV, "units"):
+        from chemparseplot.api import convert_energy_magnitude
+
+        return convert_energy_magnitude(value_eV, "kcal/mol", source_unit="eV")
+    return np.asarray(value_eV, dtype=float) * _ev_factor("kcal/mol")
 
 
 def energy_to_kJ(value_eV: Any) -> Any:
-    """Convert energy from eV to kJ/mol using chemparseplot units API."""
-    from chemparseplot.api import convert_energy_magnitude
+    """Convert energy from eV to kJ/mol using chemparseplot units API.
+
+    Plain scalars and arrays cost one multiply; no pint quantity is built.
+    """
+    if hasattr(value_eV, "units"):
+        from chemparseplot.api import convert_energy_magnitude
 
-    return convert_energy_magnitude(value_eV, "kJ/mol", source_unit="eV")
+        return convert_energy_magnitude(value_eV, "kJ/mol", source_unit="eV")
+    return np.asarray(value_eV, dtype=float) * _ev_factor("kJ/mol")
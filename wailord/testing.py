@@ -0,0 +1,561 @@
+# -*- coding: utf-8 -*-
+"""Deterministic synthetic ORCA outputs and experiment trees, for tests and
+benchmarks.
+
+`render_output` writes the sections every wailord reader looks for, laid out
+as ORCA prints them: geometry optimisation cycles (coordinates, populations
+and final energies), relaxed surface scan steps with the calculated surfaces,
+vibrational frequencies, the IR spectrum and the VPT2 fundamentals. The same
+arguments and seed always give the same text.
+
+`write_experiment` lays out a wailord experiment tree
+(``slug/theory/spin/calc/basis/orca.out``) of any size. Only a few distinct
+outputs are rendered; every job directory hard links one of them, so trees of
+100k runs cost little disk and time to build. Like generated experiments, the
+trees carry a generation manifest.
+
+`write_generation_config` writes the other side: an ``orca.yml`` with its xyz
+files and job script, for `wailord.io.inp.inpGenerator` to expand, which
+`run_generation` does while counting its file system work (see `FsOps`).
+
+Example:
+    A 1000 run experiment::
+
+        from wailord.testing import write_experiment
+        from wailord.io.orca import orcaExp
+
+        root = write_experiment(Path("/tmp/bench"), runs=1000, atoms=12)
+        orcaExp(root, order_theory=list(THEORIES)).get_final_sp_energy()
+"""
+
+import collections
+import contextlib
+import functools
+import itertools
+import json
+import math
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from wailord.io.discover import (
+    GENERATION_MANIFEST,
+    JobRecord,
+    write_job_records,
+)
+from wailord.io.inp import inpGenerator
+from wailord.io.xyz import write_xyz
+
+THEORIES = ("HF", "MP2", "B3LYP")
+BASES = ("STO-3G", "6-31G", "6-311G**", "6-311++G**")
+ELEMENTS = ("C", "H", "O", "N", "H", "H")
+SURFACES = (
+    "'Actual Energy'",
+    "SCF energy",
+    "MDCI energy",
+    "MDCI energy minus triple correction",
+)
+RULE = "-" * 33
+
+#: Seeds for the generation matrix, extended with numbered names when more are
+#: asked for
+STYLES = ("HF", "MP2", "B3LYP", "PBE0", "QCISD(T)", "UHF", "CCSD", "TPSS")
+CALCULATIONS = ("SP", "OPT", "FREQ", "NUMFREQ")
+JOBSCRIPT = """\
+#!/usr/bin/env bash
+#SBATCH -J ORCA_CALCULATION
+#SBATCH -n 4
+$orcadir/orca orca.inp > orca.out
+"""
+
+#: `inpGenerator` methods timed on their own, nested calls included
+STAGES = ("read_yml", "parse_xyz", "gendir_qc", "writeinp", "putscript", "genharness")
+
+_WRITE_FLAGS = os.O_WRONLY | os.O_RDWR | os.O_CREAT | os.O_APPEND | os.O_TRUNC
+
+ORCA_YML = """\
+qc:
+  active: True
+  style: {theories}
+  calculations: ["{calc}"]
+  basis_sets:
+{bases}
+xyz: "xyz/"
+spin:
+  - "0 1"
+keywords:
+  - "FREQ"
+extra: Null
+jobscript: "basejob.sh"
+"""
+
+
+def _banner(*lines):
+    stars = "         " + "*" * 61 + "\n"
+    return stars + "".join(f"{line}\n" for line in lines) + stars
+
+
+def _block(title, rows):
+    dashes = "-" * len(title)
+    return f"{dashes}\n{title}\n{dashes}\n" + "".join(rows)
+
+
+def _geometry(symbols, coords):
+    rows = [
+        f"  {sym:<2s} {x:13.6f} {y:11.6f} {z:11.6f}\n"
+        for sym, (x, y, z) in zip(symbols, coords)
+    ]
+    header = f"{RULE}\nCARTESIAN COORDINATES (ANGSTROEM)\n{RULE}\n"
+    return header + "".join(rows) + "\n"
+
+
+def _populations(symbols, rng):
+    charges = rng.normal(0.0, 0.2, len(symbols))
+    charges -= charges.mean()
+    rows = [
+        f"{num:4d} {sym:<2s}:{q:12.6f}\n"
+        for num, (sym, q) in enumerate(zip(symbols, charges))
+    ]
+    mulliken = _block("MULLIKEN ATOMIC CHARGES", rows)
+    loewdin = _block("LOEWDIN ATOMIC CHARGES", rows)
+    return (
+        f"{mulliken}Sum of atomic charges:   -0.0000000\n\n"
+        "                     *******************************\n"
+        "                     * LOEWDIN POPULATION ANALYSIS *\n"
+        "                     *******************************\n\n"
+        f"{loewdin}\n"
+    )
+
+
+def _energy(value):
+    rule = "-------------------------   --------------------"
+    return f"{rule}\nFINAL SINGLE POINT ENERGY     {value:17.12f}\n{rule}\n\n"
+
+
+def _frequencies(modes, imaginary, rng):
+    freqs = np.sort(rng.uniform(200.0, 3800.0, modes))
+    freqs[:imaginary] = -rng.uniform(100.0, 900.0, imaginary)
+    rows = [f"{num:4d}: {0.0:12.2f} cm**-1\n" for num in range(6)]
+    for num, freq in enumerate(freqs, start=6):
+        flag = "   ***imaginary mode***" if freq < 0 else ""
+        rows.append(f"{num:4d}: {freq:12.2f} cm**-1{flag}\n")
+    vib = _block(
+        "VIBRATIONAL FREQUENCIES",
+        [
+            "\nScaling factor for frequencies =  1.000000000  (already applied!)\n\n",
+            *rows,
+            "\n\n------------\nNORMAL MODES\n------------\n\n",
+        ],
+    )
+    t2 = rng.uniform(0.0, 60.0, modes)
+    dipole = rng.normal(0.0, 3.0, (modes, 3))
+    ir = [
+        "\n Mode    freq (cm**-1)   T**2         TX         TY         TZ\n",
+        "-" * 67 + "\n",
+    ]
+    for num, (freq, inten, vec) in enumerate(zip(freqs, t2, dipole), start=6):
+        tx, ty, tz = vec
+        ir.append(
+            f"{num:4d}: {freq:12.2f} {inten:11.6f}  "
+            f"({tx:10.6f} {ty:10.6f} {tz:10.6f})\n"
+        )
+    ir.append("\nThe first frequency considered to be a vibration is 6\n")
+    ir.append(f"The total number of vibrations considered is {modes}\n\n\n")
+    return freqs, vib + _block("IR SPECTRUM", ir)
+
+
+def _vpt2(freqs, rng):
+    rule = " " + "-" * 45 + "\n"
+    shift = -rng.uniform(10.0, 200.0, len(freqs))
+    rows = [
+        f"{num:5d} {w:12.2f} {w + d:12.2f} {d:11.2f}\n"
+        for num, (w, d) in enumerate(zip(np.abs(freqs), shift), start=1)
+    ]
+    return (
+        " Fundamental transition\n"
+        + rule
+        + " Mode[i] w[i] [1/cm]  v[i] [1/cm]  Diff [1/cm]\n"
+        + rule
+        + "".join(rows)
+        + rule
+        + "\n\n"
+    )
+
+
+def render_output(
+    atoms=5,
+    steps=3,
+    scan_points=0,
+    modes=9,
+    populations=1,
+    imaginary=0,
+    vpt2=True,
+    basis="6-311G**",
+    seed=0,
+):
+    """Text of a synthetic ORCA output
+
+    Args:
+        atoms (int, optional): Atoms in the molecule. Defaults to 5.
+        steps (int, optional): Geometry optimisation cycles, per scan point
+            when scanning. Defaults to 3.
+        scan_points (int, optional): Points of a relaxed surface scan along one
+            bond, with the four calculated surfaces at the end. Defaults to 0
+            (no scan).
+        modes (int, optional): Vibrational modes in the frequency and IR
+            tables, 0 leaves out the frequency sections. Defaults to 9.
+        populations (int, optional): Mulliken and Loewdin analyses printed on
+            the last cycles of every optimisation. Defaults to 1.
+        imaginary (int, optional): Imaginary modes. Defaults to 0.
+        vpt2 (bool, optional): Print the VPT2 fundamentals (needs modes).
+            Defaults to True.
+        basis (str, optional): Basis set named in the output. Defaults to
+            ``"6-311G**"``.
+        seed (int, optional): Random seed. Defaults to 0.
+
+    Returns:
+        str: The output
+    """
+    rng = np.random.default_rng(seed)
+    symbols = [ELEMENTS[num % len(ELEMENTS)] for num in range(atoms)]
+    coords = rng.uniform(-1.5, 1.5, (atoms, 3)) * max(1.0, atoms ** (1 / 3))
+    energy = -40.0 * atoms / 5 - rng.uniform(0.0, 1.0)
+    out = [
+        _banner("                                 * O   R   C   A *"),
+        "\n----- Orbital basis set information -----\n",
+        f"Your calculation utilizes the basis: {basis}\n\n",
+        f"Number of atoms                         .... {atoms:5d}\n\n",
+    ]
+    points = np.linspace(0.8, 2.4, scan_points)
+    if scan_points:
+        out.append("There are 1 parameter(s) to be scanned\n")
+        out.append(
+            f"             R: range= {points[0]:12.8f} .. {points[-1]:12.8f}"
+            f"  steps= {scan_points:4d}\n"
+        )
+        out.append(f"There will be {scan_points:4d} energy evaluations\n\n")
+    surface = []
+    for pnum, point in enumerate(points if scan_points else [None], start=1):
+        if point is not None:
+            out.append(
+                _banner(
+                    f"{'':32s}TRAJECTORY STEP {pnum:3d}",
+                    f"{'':18s}R  : {point:12.8f}",
+                )
+            )
+            coords[1] = coords[0] + [point, 0.0, 0.0]
+        for cycle in range(1, steps + 1):
+            out.append(
+                _banner(f"{'':9s}*{'':16s}GEOMETRY OPTIMIZATION CYCLE {cycle:3d}")
+            )
+            coords = coords + rng.normal(0.0, 0.01 / cycle, coords.shape)
+            if point is not None:
+                coords[1] = coords[0] + [point, 0.0, 0.0]
+            out.append(_geometry(symbols, coords))
+            if cycle > steps - populations:
+                out.append(_populations(symbols, rng))
+            energy -= rng.uniform(0.0, 1e-3) / cycle
+            out.append(_energy(energy))
+        if point is not None:
+            surface.append((point, energy + 0.1 * (point - 1.1) ** 2))
+    for num, name in enumerate(SURFACES if scan_points else ()):
+        rows = [f"  {x:11.8f} {e - 0.01 * num:12.8f}\n" for x, e in surface]
+        out.append(
+            f"The Calculated Surface using the {name}\n" + "".join(rows) + "\n"
+        )
+    if modes:
+        freqs, text = _frequencies(modes, imaginary, rng)
+        out.append(text)
+        if vpt2:
+            out.append(_vpt2(freqs, rng))
+    out.append(
+        " " * 29 + "****ORCA TERMINATED NORMALLY****\n"
+        "TOTAL RUN TIME: 0 days 0 hours 0 minutes 15 seconds 994 msec\n"
+    )
+    return "".join(out)
+
+
+def write_output(path, **kwargs):
+    """Writes `render_output` to *path*
+
+    Returns:
+        :obj:`Path`: The output
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(render_output(**kwargs))
+    return path
+
+
+def _names(seeds, count, prefix):
+    extra = [f"{prefix}{num}" for num in range(count - len(seeds))]
+    return list(seeds[:count]) + extra
+
+
+def write_generation_config(
+    root,
+    xyz=4,
+    styles=2,
+    spins=1,
+    calculations=2,
+    basis_sets=2,
+    atoms=5,
+    seed=0,
+):
+    """Writes an input generation config with its xyz files and job script
+
+    The matrix expands to ``xyz * styles * spins * calculations *
+    basis_sets`` job directories.
+
+    Args:
+        root (:obj:`Path`): Directory for ``orca.yml``, ``basejob.sh`` and
+            ``xyz/``, created if needed
+        xyz (int, optional): Geometries. Defaults to 4.
+        styles (int, optional): Levels of theory. Defaults to 2.
+        spins (int, optional): Charge and multiplicity pairs. Defaults to 1.
+        calculations (int, optional): Calculation types. Defaults to 2.
+        basis_sets (int, optional): Basis sets. Defaults to 2.
+        atoms (int, optional): Atoms per geometry. Defaults to 5.
+        seed (int, optional): Random seed of the geometries. Defaults to 0.
+
+    Returns:
+        :obj:`Path`: The ``orca.yml``
+    """
+    root = Path(root)
+    xyzdir = root / "xyz"
+    xyzdir.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    symbols = [ELEMENTS[num % len(ELEMENTS)] for num in range(atoms)]
+    for num in range(xyz):
+        coords = rng.uniform(-2.0, 2.0, (atoms, 3)).round(6)
+        write_xyz(
+            xyzdir / f"mol{num:05d}.xyz",
+            symbols=symbols,
+            coordinates=[tuple(row) for row in coords],
+        )
+    (root / "basejob.sh").write_text(JOBSCRIPT)
+    config = {
+        "qc": {
+            "active": True,
+            "style": _names(STYLES, styles, "HF"),
+            "calculations": _names(CALCULATIONS, calculations, "SP"),
+            "basis_sets": _names(BASES, basis_sets, "def2-SVP-"),
+        },
+        "xyz": str(xyzdir),
+        # Single digit charges and multiplicities, as the spin folders hold
+        "spin": [f"{num // 9} {num % 9 + 1}" for num in range(spins)],
+        "keywords": ["TightSCF"],
+        "extra": None,
+        "jobscript": "basejob.sh",
+    }
+    conf = root / "orca.yml"
+    conf.write_text(json.dumps(config, indent=2))
+    return conf
+
+
+def _basis_dir(basis):
+    return basis.replace("+", "P").replace("*", "8")
+
+
+def write_experiment(
+    root,
+    runs=1000,
+    theories=THEORIES,
+    bases=BASES,
+    calc="OPT",
+    variants=4,
+    link=True,
+    **kwargs,
+):
+    """Writes a wailord experiment tree of synthetic outputs
+
+    Runs are spread over theories and bases, with as many molecules
+    (``slug``) as needed to reach *runs*.
+
+    Args:
+        root (:obj:`Path`): Experiment root, created if needed
+        runs (int, optional): Number of job directories. Defaults to 1000.
+        theories (list, optional): Levels of theory. Defaults to `THEORIES`.
+        bases (list, optional): Basis sets. Defaults to `BASES`.
+        calc (str, optional): Calculation folder. Defaults to ``"OPT"``.
+        variants (int, optional): Distinct outputs rendered per basis (with
+            different seeds). Defaults to 4.
+        link (bool, optional): Hard link the outputs instead of copying them.
+            Defaults to True.
+        **kwargs: Passed on to `render_output`
+
+    Returns:
+        :obj:`Path`: The root
+    """
+    root = Path(root)
+    pool = root / "pool"
+    pool.mkdir(parents=True, exist_ok=True)
+    bases_yml = "".join(f"    - {basis}\n" for basis in bases)
+    (root / "orca.yml").write_text(
+        ORCA_YML.format(
+            theories=json.dumps(list(theories)),
+            calc=calc,
+            bases=bases_yml,
+        )
+    )
+    seed = kwargs.pop("seed", 0)
+    sources = {}
+    for basis in bases:
+        for num in range(variants):
+            # Not an ``.out``, so discovery skips the pool
+            src = pool / f"{_basis_dir(basis)}-{num}.orca"
+            src.write_text(render_output(basis=basis, seed=seed + num, **kwargs))
+            sources[basis, num] = src
+    per_slug = len(theories) * len(bases)
+    width = max(4, len(str(math.ceil(runs / per_slug))))
+    jobs = itertools.product(range(math.ceil(runs / per_slug)), theories, bases)
+    records = []
+    for count, (snum, theory, basis) in enumerate(itertools.islice(jobs, runs)):
+        slug = f"M{snum:0{width}d}_synth"
+        jobdir = Path("bench", slug, theory, "spin_01", calc, _basis_dir(basis))
+        (root / jobdir).mkdir(parents=True, exist_ok=True)
+        src = sources[basis, count % variants]
+        ofile = root / jobdir / "orca.out"
+        ofile.unlink(missing_ok=True)
+        if link:
+            try:
+                os.link(src, ofile)
+            except OSError:
+                shutil.copyfile(src, ofile)
+        else:
+            shutil.copyfile(src, ofile)
+        records.append(
+            JobRecord(
+                theory,
+                "0 1",
+                calc,
+                basis,
+                None,
+                slug,
+                None,
+                jobdir.as_posix(),
+                f"{jobdir.as_posix()}/orca.out",
+            )
+        )
+    write_job_records(root / GENERATION_MANIFEST, records)
+    return root
+
+
+class FsOps:
+    """Counts file system operations of the current process while active
+
+    Python offers no way to remove an audit hook, so one hook is installed on
+    first use and does nothing unless a counter is active.
+
+    Attributes:
+        counts (:obj:`collections.Counter`): Audit event name to calls, with
+            ``open`` split into ``open`` and ``open_write``
+        written (set): Absolute paths opened for writing
+    """
+
+    _active = ()
+    _installed = False
+
+    def __init__(self):
+        self.counts = collections.Counter()
+        self.written = set()
+
+    @classmethod
+    def _hook(cls, event, args):
+        if not cls._active:
+            return
+        if event == "open":
+            path, mode, flags = args
+            if isinstance(mode, str):
+                write = any(char in mode for char in "wax+")
+            else:
+                write = bool(flags & _WRITE_FLAGS)
+            for ops in cls._active:
+                ops.counts["open"] += 1
+                if write and isinstance(path, (str, bytes, os.PathLike)):
+                    ops.counts["open_write"] += 1
+                    ops.written.add(os.path.abspath(os.fsdecode(path)))
+        elif event in ("os.mkdir", "shutil.copyfile", "os.rename", "os.remove"):
+            for ops in cls._active:
+                ops.counts[event] += 1
+
+    def __enter__(self):
+        if not FsOps._installed:
+            sys.addaudithook(FsOps._hook)
+            FsOps._installed = True
+        FsOps._active = (*FsOps._active, self)
+        return self
+
+    def __exit__(self, *exc):
+        FsOps._active = tuple(ops for ops in FsOps._active if ops is not self)
+
+    def bytes_written(self):
+        """Current size of every file written while active"""
+        return sum(os.path.getsize(path) for path in self.written if os.path.isfile(path))
+
+
+@contextlib.contextmanager
+def _stage_timer(gen, seconds):
+    """Times the `STAGES` methods of one generator into *seconds*"""
+
+    def timed(name, method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                seconds[name] += time.perf_counter() - start
+
+        return wrapper
+
+    for name in STAGES:
+        setattr(gen, name, timed(name, getattr(gen, name)))
+    try:
+        yield seconds
+    finally:
+        for name in STAGES:
+            delattr(gen, name)
+
+
+def run_generation(conf, workdir):
+    """Runs `inpGenerator.parse_yml` on *conf* inside *workdir*
+
+    Args:
+        conf (:obj:`Path`): The ``orca.yml``, with absolute or config relative
+            paths
+        workdir (:obj:`Path`): Where ``wailordFold`` and ``harness.sh`` go
+
+    Returns:
+        dict: ``seconds`` (wall time), ``stages`` (seconds by `STAGES` method,
+        nested calls included), ``files`` and ``bytes`` (distinct files
+        written and their final size), ``writes`` (opens for writing),
+        ``open``, ``mkdir`` and ``copy`` counts
+    """
+    prev = Path.cwd()
+    workdir = Path(workdir)
+    workdir.mkdir(parents=True, exist_ok=True)
+    os.chdir(workdir)
+    try:
+        with FsOps() as ops:
+            start = time.perf_counter()
+            gen = inpGenerator(conf)
+            with _stage_timer(gen, collections.Counter()) as stages:
+                gen.parse_yml()
+            seconds = time.perf_counter() - start
+    finally:
+        os.chdir(prev)
+    return {
+        "seconds": seconds,
+        "stages": dict(stages),
+        "files": len(ops.written),
+        "bytes": ops.bytes_written(),
+        "writes": ops.counts["open_write"],
+        "open": ops.counts["open"],
+        "mkdir": ops.counts["os.mkdir"],
+        "copy": ops.counts["shutil.copyfile"],
+    }
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""Unit conversions over whole arrays.
+
+Pint quantities are convenient, but for large tables the unit bookkeeping
+costs more than the parsing. Here a conversion factor is resolved through the
+pint registry once per pair of units and cached, after which every conversion
+is a single float64 multiply over the array.
+
+Unit-light tables (``orcaExp(..., units=False)`` and
+``_OrcaRun(..., units=False)``) hold plain float64 columns and record the unit
+of each in ``frame.attrs["units"]``; `column` reads such a column in any unit,
+and `attach_units` builds the pint columns when they are wanted.
+
+Example:
+    Reaction energies in kcal/mol without pint quantities::
+
+        from wailord import units
+
+        expt = orcaExp(Path("expt"), units=False)
+        energy = expt.get_final_sp_energy().final_sp_energy.to_numpy()
+        units.hartree_to_kcal_mol(energy - energy[0])
+"""
+
+import functools
+
+import numpy as np
+import pint
+import pint_pandas
+
+#: Molar energies as pint expressions, kept per particle so that they convert
+#: to and from hartree and eV
+ALIASES = {
+    "kcal/mol": "kcal / avogadro_number",
+    "kcal_mol": "kcal / avogadro_number",
+    "kJ/mol": "kJ / avogadro_number",
+    "kj/mol": "kJ / avogadro_number",
+    "cm-1": "cm_1",
+}
+
+
+def _registry():
+    return pint_pandas.PintType.ureg
+
+
+@functools.lru_cache(maxsize=None)
+def unit_name(unit):
+    """Name of a unit as pint prints it, e.g. in ``pint[...]`` dtypes"""
+    return str(_registry().Unit(ALIASES.get(unit, unit)))
+
+
+@functools.lru_cache(maxsize=None)
+def factor(source, target):
+    """Multiplier taking magnitudes in *source* units to *target* units
+
+    Spectroscopic conversions (wavenumbers, frequencies and energies) go
+    through pint's ``sp`` context.
+
+    Args:
+        source (str): Unit of the magnitudes, e.g. ``"hartree"`` or ``"cm_1"``
+        target (str): Wanted unit, e.g. ``"kcal/mol"`` or ``"Hz"``
+
+    Returns:
+        float: The conversion factor
+    """
+    one = _registry().Quantity(1.0, ALIASES.get(source, source))
+    target = ALIASES.get(target, target)
+    try:
+        return float(one.to(target).magnitude)
+    except pint.DimensionalityError:
+        return float(one.to(target, "sp").magnitude)
+
+
+def convert(values, source, target):
+    """Magnitudes in *source* units as float64 magnitudes in *target* units
+
+    Args:
+        values: Numbers or an array of any shape
+        source (str): Unit of *values*
+        target (str): Wanted unit
+
+    Returns:
+        np.ndarray: The converted magnitudes
+    """
+    return np.asarray(values, dtype=np.float64) * factor(source, target)
+
+
+def hartree_to_kcal_mol(values):
+    """Hartree magnitudes in kcal/mol"""
+    return convert(values, "hartree", "kcal/mol")
+
+
+def hartree_to_kj_mol(values):
+    """Hartree magnitudes in kJ/mol"""
+    return convert(values, "hartree", "kJ/mol")
+
+
+def hartree_to_ev(values):
+    """Hartree magnitudes in eV"""
+    return convert(values, "hartree", "eV")
+
+
+def wavenumber_to_hz(values):
+    """Wavenumber (cm⁻¹) magnitudes as frequencies in Hz"""
+    return convert(values, "cm_1", "Hz")
+
+
+def magnitude(values, unit):
+    """Float64 magnitudes of *values* in *unit*
+
+    Args:
+        values: A pint quantity, a pint series, or plain numbers which are
+            taken to be in *unit* already
+        unit (str): Wanted unit
+
+    Returns:
+        np.ndarray: The magnitudes
+    """
+    if isinstance(getattr(values, "dtype", None), pint_pandas.PintType):
+        source = str(values.dtype.units)
+        values = values.pint.magnitude
+    elif isinstance(values, pint.Quantity):
+        source = str(values.units)
+        values = values.magnitude
+    else:
+        return np.asarray(values, dtype=np.float64)
+    return convert(values, source, unit)
+
+
+def column(frame, name, unit):
+    """Magnitudes of one column of a table in *unit*, whether it holds pint
+    quantities or plain floats with units in ``frame.attrs["units"]``
+
+    Args:
+        frame (:obj:`pd.DataFrame`): The table
+        name (str): Column
+        unit (str): Wanted unit
+
+    Returns:
+        np.ndarray: The magnitudes
+    """
+    values = frame[name]
+    source = frame.attrs.get("units", {}).get(name)
+    if source is None or isinstance(values.dtype, pint_pandas.PintType):
+        return magnitude(values, unit)
+    return convert(values.to_numpy(), source, unit)
+
+
+def tag_units(frame, units, quantities=True):
+    """Gives columns of a table their units, in place
+
+    Args:
+        frame (:obj:`pd.DataFrame`): The table
+        units (dict): Column name to unit
+        quantities (bool, optional): Pint columns. Otherwise the columns stay
+            float64 and their units go to ``frame.attrs["units"]``. Defaults
+            to True.
+
+    Returns:
+        :obj:`pd.DataFrame`: The frame
+    """
+    for name, unit in units.items():
+        if quantities:
+            frame[name] = frame[name].astype(f"pint[{unit}]")
+        else:
+            frame[name] = frame[name].astype(np.float64)
+    if not quantities:
+        known = frame.attrs.setdefault("units", {})
+        known.update({name: unit_name(unit) for name, unit in units.items()})
+    return frame
+
+
+def strip_units(frame):
+    """Unit-light copy of a table: pint columns become float64 magnitudes,
+    their units are recorded in ``attrs["units"]``"""
+    frame = frame.copy()
+    units = {}
+    for name in frame.columns:
+        if isinstance(frame[name].dtype, pint_pandas.PintType):
+            units[name] = str(frame[name].dtype.units)
+            frame[name] = np.asarray(frame[name].pint.magnitude, dtype=np.float64)
+    frame.attrs.setdefault("units", {}).update(units)
+    return frame
+
+
+def attach_units(frame):
+    """Inverse of `strip_units`: the columns listed in ``attrs["units"]`` as
+    pint columns"""
+    frame = frame.copy()
+    for name, unit in frame.attrs.pop("units", {}).items():
+        if name in frame:
+            frame[name] = frame[name].astype(np.float64).astype(f"pint[{unit}]")
+    return frame